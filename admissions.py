@@ -0,0 +1,295 @@
+import ipaddress
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from datetime import datetime
+
+from journal import get_journal, registration_record
+from outbox import enqueue_welcome_email, notify_worker
+from storage import get_storage
+
+# Group commit: the writer takes up to GROUP_SIZE queued registrations and
+# waits at most GROUP_WINDOW seconds for more before committing them together
+GROUP_SIZE = 50
+GROUP_WINDOW = 0.005
+
+# Submissions allowed per client within RATE_WINDOW seconds
+SESSION_RATE_LIMIT = 5
+ADDRESS_RATE_LIMIT = 30
+RATE_WINDOW = 60
+
+# Request header holding the client address, set by a trusted proxy in front
+# of the app processes (e.g. X-Forwarded-For). Unset: the peer address of the
+# connection is used, unless it is a loopback proxy or unknown.
+CLIENT_ADDRESS_HEADER = os.environ.get("ENLIFT_CLIENT_ADDRESS_HEADER")
+
+# Fields every application needs to become a student row
+STUDENT_FIELDS = ["name", "email", "phone", "course", "board", "year", "age"]
+
+KNOWN_EMAILS_SIZE = 100000
+# Journal records that could not be written are retried this often
+JOURNAL_RETRY_INTERVAL = 5
+
+log = logging.getLogger(__name__)
+
+
+class DuplicateRegistration(Exception):
+    pass
+
+
+class RateLimited(Exception):
+    def __init__(self, retry_after):
+        super().__init__(f"Too many submissions, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+# Sliding-window limiter keyed by client (session id or address)
+class RateLimiter:
+    def __init__(self, limit, window=RATE_WINDOW):
+        self.limit = limit
+        self.window = window
+        self._hits = {}
+        self._lock = threading.Lock()
+
+    def check(self, key):
+        now = time.monotonic()
+        with self._lock:
+            hits = self._hits.setdefault(key, deque())
+            while hits and hits[0] <= now - self.window:
+                hits.popleft()
+            if len(hits) >= self.limit:
+                raise RateLimited(hits[0] + self.window - now)
+            hits.append(now)
+            if len(self._hits) > 10000:
+                self._prune(now)
+
+    def _prune(self, now):
+        for key in [key for key, hits in self._hits.items() if not hits or hits[-1] <= now - self.window]:
+            del self._hits[key]
+
+
+# Address to rate-limit a submission by, or None to skip the per-address
+# limit. Behind a proxy every connection comes from the proxy, and a local
+# run has no address at all; either would put all clients in one bucket.
+def client_address(headers, peer, header=CLIENT_ADDRESS_HEADER):
+    if header:
+        # The rightmost entry is the one our proxy added; earlier ones come from the client
+        forwarded = (headers.get(header) or "").split(",")[-1].strip()
+        return forwarded or None
+    try:
+        return None if peer is None or ipaddress.ip_address(peer).is_loopback else peer
+    except ValueError:
+        return None
+
+
+# Bounded LRU of emails known to be registered, so repeats never reach the
+# writer. Valid for one clear generation of the students table.
+class KnownEmails:
+    def __init__(self, size=KNOWN_EMAILS_SIZE):
+        self.size = size
+        self.generation = None
+        self._emails = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, email):
+        with self._lock:
+            if email in self._emails:
+                self._emails.move_to_end(email)
+                return True
+        return False
+
+    def add(self, email):
+        with self._lock:
+            self._emails[email] = True
+            self._emails.move_to_end(email)
+            if len(self._emails) > self.size:
+                self._emails.popitem(last=False)
+
+    # Everything is dropped once the table has been cleared, by any process
+    def sync(self, generation):
+        with self._lock:
+            if generation != self.generation:
+                self._emails.clear()
+                self.generation = generation
+
+
+class _Pending:
+    def __init__(self, receipt, student):
+        self.receipt = receipt
+        self.student = student
+
+
+# Admission write path: rate limit and existence check, then the application
+# is stored as a queued admission request and the caller gets its receipt at
+# once. A single writer thread settles queued requests in groups: each
+# student row, its welcome email and the request's final status commit
+# together, then the journal records follow. Requests still queued when the
+# process stopped are picked up again on start.
+class AdmissionService:
+    def __init__(self, storage, journal):
+        self.storage = storage
+        self.journal = journal
+        self.known = KnownEmails()
+        self.session_limiter = RateLimiter(SESSION_RATE_LIMIT)
+        self.address_limiter = RateLimiter(ADDRESS_RATE_LIMIT)
+        self.stats = {"submitted": 0, "registered": 0, "duplicates": 0, "rate_limited": 0, "failed": 0,
+                      "groups": 0, "journal_errors": 0, "journal_pending": 0}
+        self._queue = queue.Queue()
+        # Records of committed registrations not yet in the journal, oldest first
+        self._unjournaled = deque()
+        with storage.connection() as conn:
+            for receipt, student in storage.admissions.queued(conn):
+                self._queue.put(_Pending(receipt, student))
+        self._thread = threading.Thread(target=self._run, name="admission-writer", daemon=True)
+        self._thread.start()
+
+    def is_registered(self, email):
+        with self.storage.connection() as conn:
+            self.known.sync(self.storage.students.clear_generation(conn))
+            if email in self.known:
+                return True
+            found = self.storage.students.exists(conn, email)
+        if found:
+            self.known.add(email)
+        return found
+
+    # Accept one application and return its receipt for admission_status();
+    # raises RateLimited or DuplicateRegistration, or ValueError for an
+    # application without every STUDENT_FIELDS entry
+    def submit(self, student, session_key, address=None):
+        missing = [field for field in STUDENT_FIELDS if field not in student]
+        if missing:
+            raise ValueError(f"application is missing {', '.join(missing)}")
+        try:
+            self.session_limiter.check(session_key)
+            if address:
+                self.address_limiter.check(address)
+        except RateLimited:
+            self.stats["rate_limited"] += 1
+            raise
+        self.stats["submitted"] += 1
+
+        if self.is_registered(student["email"]):
+            self.stats["duplicates"] += 1
+            raise DuplicateRegistration(student["email"])
+
+        receipt = uuid.uuid4().hex
+        with self.storage.transaction() as conn:
+            self.storage.admissions.add(conn, receipt, student)
+        self._queue.put(_Pending(receipt, student))
+        return receipt
+
+    def _run(self):
+        while True:
+            try:
+                group = [self._queue.get(timeout=JOURNAL_RETRY_INTERVAL if self._unjournaled else None)]
+            except queue.Empty:
+                self._write_journal()
+                continue
+            deadline = time.monotonic() + GROUP_WINDOW
+            while len(group) < GROUP_SIZE:
+                try:
+                    group.append(self._queue.get(timeout=max(0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            self._commit(group)
+
+    def _commit(self, group):
+        try:
+            registered, settled = self._settle(group)
+        except Exception:
+            # One bad request must not fail the rest of its group: settle
+            # each on its own and fail only those that still raise
+            registered, settled = [], []
+            for pending in group:
+                try:
+                    alone = self._settle([pending])
+                except Exception as e:
+                    self._fail(pending, e)
+                    continue
+                registered += alone[0]
+                settled += alone[1]
+
+        self.stats["groups"] += 1
+        self.stats["registered"] += len(registered)
+        self.stats["duplicates"] += len(settled) - len(registered)
+        for pending in settled:
+            self.known.add(pending.student["email"])
+        if registered:
+            notify_worker()
+            self._unjournaled.extend(registration_record(pending.student) for pending in registered)
+        if self._unjournaled:
+            self._write_journal()
+
+    # One transaction for the group: (registered, settled) requests, settled
+    # being the registered ones and the duplicates
+    def _settle(self, group):
+        registered, settled = [], []
+        with self.storage.transaction() as conn:
+            for pending in group:
+                # Already settled, e.g. by another process after a restart
+                if not self.storage.admissions.claim(conn, pending.receipt):
+                    continue
+                student = pending.student
+                student["registration_date"] = datetime.now().isoformat(" ")
+                settled.append(pending)
+                if self.storage.students.add(conn, student) is None:
+                    self.storage.admissions.finish(conn, pending.receipt, "duplicate")
+                    continue
+                enqueue_welcome_email(self.storage, conn, student["email"], student["name"], student["course"])
+                self.storage.admissions.finish(conn, pending.receipt, "registered")
+                registered.append(pending)
+        return registered, settled
+
+    # The rows are already committed, so a journal that cannot be written
+    # (disk full, permissions) must not fail the registrations: the records
+    # stay queued, in order, and are retried until they are written
+    def _write_journal(self):
+        try:
+            while self._unjournaled:
+                self.journal.append(self._unjournaled[0])
+                self._unjournaled.popleft()
+            self.journal.sync()
+        except OSError as e:
+            self.stats["journal_errors"] += 1
+            log.warning("Registration journal write failed, %d record(s) waiting for retry: %s",
+                        len(self._unjournaled), e)
+        self.stats["journal_pending"] = len(self._unjournaled)
+
+    # The request could not be settled even on its own; it is reported failed
+    # so the applicant can submit again
+    def _fail(self, pending, error):
+        self.stats["failed"] += 1
+        try:
+            with self.storage.transaction() as conn:
+                if self.storage.admissions.claim(conn, pending.receipt):
+                    self.storage.admissions.finish(conn, pending.receipt, "failed", str(error))
+        except Exception:
+            # Still queued; settled on the next start
+            pass
+
+
+# Where a submitted application stands: a dict with status queued,
+# registered, duplicate or failed, or None for an unknown receipt. A plain
+# read, so app processes that write through writer.py can call it too.
+def admission_status(receipt):
+    storage = get_storage()
+    with storage.connection() as conn:
+        return storage.admissions.get(conn, receipt)
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_admission_service():
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = AdmissionService(get_storage(), get_journal())
+    return _service
@@ -1,13 +1,30 @@
 import streamlit as st
-import pandas as pd
 import json
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 from datetime import datetime
-import sqlite3
 import re
-from pathlib import Path
+import uuid
+
+from admissions import (
+    DuplicateRegistration, RateLimited, admission_status, client_address, get_admission_service
+)
+from assets import style_tag
+import content
+from catalog import SELECT_PLACEHOLDER, get_catalog
+from contacts import DEPARTMENTS
+from database import get_connection
+from export import EXPORT_FORMATS, deferred_export
+from maintenance import JOBS, job_states, start_scheduler
+from outbox import start_worker
+from profiling import (
+    clear_history, finish_run, history, name_run, profiled, record_frame, section, start_run
+)
+from queries import (
+    age_counts, course_counts, daily_counts, diff_student_edits,
+    registration_metrics, stat_keys, status_counts
+)
+from storage import get_storage
+from student_cache import filter_students, get_student_cache, students_page
+from writer import WRITER_SOCKET, write
 
 # Page configuration
 st.set_page_config(
@@ -17,231 +34,12 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-st.markdown("""
-<style>
-.main-header {
-    background: linear-gradient(135deg, #667eea, #764ba2);
-    padding: 3.5rem 2rem;
-    border-radius: 16px;
-    text-align: center;
-    color: white;
-    margin-bottom: 2rem;
-}
-.main-header h1 {
-    font-size: 3rem;
-    margin-bottom: 0.5rem;
-}
-.main-header h3 {
-    font-weight: 400;
-    opacity: 0.95;
-}
-.feature-box, .course-highlight, .achievement-card, .simple-card {
-    background: white;
-    padding: 1.5rem;
-    border-radius: 14px;
-    box-shadow: 0 8px 25px rgba(0,0,0,0.08);
-    transition: transform 0.3s ease, box-shadow 0.3s ease;
-    height: 100%;
-}
-.feature-box:hover,
-.course-highlight:hover,
-.achievement-card:hover {
-    transform: translateY(-6px);
-    box-shadow: 0 12px 30px rgba(0,0,0,0.12);
-}
-.feature-icon, .achievement-icon {
-    font-size: 2rem;
-    margin-bottom: 0.6rem;
-}
-.stat-box {
-    text-align: center;
-    padding: 1.2rem;
-}
-.stat-box h2 {
-    color: #667eea;
-    font-size: 2.2rem;
-    margin-bottom: 0.3rem;
-}
-.process-step {
-    background: #f8f9ff;
-    padding: 1.2rem;
-    border-left: 5px solid #667eea;
-    border-radius: 10px;
-    margin-bottom: 1rem;
-}
-.step-number {
-    font-size: 1.3rem;
-    font-weight: bold;
-    color: #667eea;
-}
-.cta-section {
-    background: linear-gradient(135deg, #667eea, #764ba2);
-    padding: 3rem 2rem;
-    border-radius: 18px;
-    text-align: center;
-    margin-top: 2rem;
-}
-</style>
-""", unsafe_allow_html=True)
-
-# Custom CSS for clean design
-st.markdown("""
-    <style>
-    /* Mobile responsiveness */
-    @media (max-width: 768px) {
-        .main > div {
-            padding-left: 10px !important;
-            padding-right: 10px !important;
-        }
-        .stButton > button {
-            width: 100%;
-        }
-        .stTextInput > div > div > input {
-            font-size: 16px !important;
-        }
-    }
-
-    /* Header */
-    .main-header {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 3rem 2rem;
-        border-radius: 15px;
-        color: black;
-        margin-bottom: 2rem;
-        text-align: center;
-    }
-
-    .main-header h1 {
-        font-size: 2.8rem;
-        margin-bottom: 1rem;
-    }
-
-    .main-header h3 {
-        font-size: 1.5rem;
-        margin-bottom: 1.5rem;
-        opacity: 0.9;
-    }
-
-    /* Feature Box */
-    .feature-box {
-        background: white;
-        border-radius: 10px;
-        padding: 1.5rem;
-        margin: 1rem 0;
-        box-shadow: 0 4px 12px rgba(0,0,0,0.08);
-        border: 1px solid #eaeaea;
-        text-align: center;
-        color: black;
-    }
-
-    .feature-icon {
-        font-size: 2.5rem;
-        margin-bottom: 1rem;
-        color: black;
-    }
-
-    /* Stat Box */
-    .stat-box {
-        background: #f8f9fa;
-        border-radius: 10px;
-        padding: 1px;
-        margin: 0.5rem;
-        text-align: center;
-        border: 1px solid #eaeaea;
-        color:black;
-    }
-
-    /* Course Highlight */
-    .course-highlight {
-        background: white;
-        border-radius: 10px;
-        padding: 2rem;
-        margin: 1rem 0;
-        border-left: 4px solid #667eea;
-        box-shadow: 0 4px 12px rgba(0,0,0,0.05);
-        color: black;
-    }
-
-    /* Success Message */
-    .success-message {
-        background-color: #d4edda;
-        color: #155724;
-        padding: 1rem;
-        border-radius: 5px;
-        border: 1px solid #c3e6cb;
-        margin: 1rem 0;
-        color:black;
-    }
-
-    /* Process Step */
-    .process-step {
-        background: #f8f9fa;
-        border-radius: 10px;
-        padding: 1.5rem;
-        margin: 1rem 0;
-        position: relative;
-        color:black;
-    }
-
-    .step-number {
-        display: inline-block;
-        background: #667eea;
-        color: white;
-        width: 30px;
-        height: 30px;
-        border-radius: 50%;
-        text-align: center;
-        line-height: 30px;
-        margin-right: 10px;
-        font-weight: bold;
-    }
-
-    /* CTA Section */
-    .cta-section {
-        background: linear-gradient(135deg, #43e97b 0%, #38f9d7 100%);
-        padding: 2.5rem;
-        border-radius: 15px;
-        color: white;
-        text-align: center;
-        margin: 2rem 0;
-    }
-
-    /* Achievement Card */
-    .achievement-card {
-        background: white;
-        border-radius: 10px;
-        padding: 1.5rem;
-        margin: 1rem;
-        text-align: center;
-        box-shadow: 0 4px 12px rgba(0,0,0,0.08);
-        border-top: 3px solid #667eea;
-    }
-
-    .achievement-icon {
-        font-size: 2.5rem;
-        margin-bottom: 1rem;
-        color: #667eea;
-    }
-
-    /* Contact Info */
-    .contact-info {
-        background: #f8f9fa;
-        border-radius: 10px;
-        padding: 1.5rem;
-        margin: 1rem 0;
-    }
-
-    /* Simple Card */
-    .simple-card {
-        background: white;
-        border-radius: 10px;
-        padding: 1.5rem;
-        margin: 1rem 0;
-        box-shadow: 0 4px 12px rgba(0,0,0,0.05);
-        border: 1px solid #eaeaea;
-    }
-    </style>
-""", unsafe_allow_html=True)
+# Per-rerun profile, finished at the end of main()
+start_run("app")
+
+# Shared stylesheet (static/enlift.css)
+with section("css"):
+    st.markdown(style_tag(), unsafe_allow_html=True)
 
 # Initialize session state for admin login
 if 'admin_logged_in' not in st.session_state:
@@ -252,78 +50,33 @@ if 'page' not in st.session_state:
     st.session_state.page = "Home"
 if 'course_selected' not in st.session_state:
     st.session_state.course_selected = ""
-
-
-# Database setup
-def init_database():
-    conn = sqlite3.connect('enlift_students.db')
-    c = conn.cursor()
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS students (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            email TEXT NOT NULL UNIQUE,
-            phone TEXT,
-            course TEXT,
-            board TEXT,
-            year INTEGER,
-            age INTEGER,
-            registration_date TIMESTAMP,
-            status TEXT DEFAULT 'pending'
-        )
-    ''')
-    conn.commit()
-    return conn
-
-
-# Email configuration
-def send_welcome_email(student_email, student_name, course):
-    try:
-        email_config = {
-            'smtp_server': 'smtp.gmail.com',
-            'smtp_port': 587,
-            'sender_email': 'admissions@enlift-institute.com',
-            'sender_password': ''
-        }
-
-        msg = MIMEMultipart()
-        msg['From'] = email_config['sender_email']
-        msg['To'] = student_email
-        msg['Subject'] = 'Welcome to EnLift-Institute!'
-
-        body = f"""
-        Dear {student_name},
-
-        Welcome to EnLift-Institute! 🎉
-
-        Thank you for registering for our {course} course.
-
-        Your registration has been received and is currently being processed.
-
-        Here's what happens next:
-        1. Our team will contact you within 24 hours
-        2. You'll receive course access details
-        3. Schedule your orientation session
-
-        If you have any questions, please contact us at:
-        📧 admissions@enlift-institute.com
-        📞 +91 9876543210
-
-        Best regards,
-        EnLift-Institute Team
-        """
-
-        msg.attach(MIMEText(body, 'plain'))
-
-        # For demo, save email content to file
-        Path("emails").mkdir(exist_ok=True)
-        with open(f'emails/{student_email}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.txt', 'w') as f:
-            f.write(f"To: {student_email}\nSubject: {msg['Subject']}\n\n{body}")
-
-        return True
-    except Exception as e:
-        # For demo purposes, we'll return True
-        return True
+if 'client_id' not in st.session_state:
+    st.session_state.client_id = uuid.uuid4().hex
+
+# Deep links from the static site, e.g. ?page=Admission&course=cbse-computer-science-11-12
+LINKABLE_PAGES = {
+    "Home": "🏠 Home",
+    "Courses": "📚 Courses",
+    "Admission": "🎯 Admission",
+    "About Us": "👥 About Us",
+    "Contact Us": "📞 Contact Us",
+    "Admin Login": "🔐 Admin Login"
+}
+if 'nav_choice' not in st.session_state and st.query_params.get("page") in LINKABLE_PAGES:
+    st.session_state.nav_choice = LINKABLE_PAGES[st.query_params["page"]]
+    linked_course = get_catalog().by_id.get(st.query_params.get("course"))
+    if linked_course:
+        st.session_state.course_selected = linked_course["label"]
+
+# Background delivery of queued emails, maintenance jobs and the admission
+# writer, started once per process; with a shared writer service (writer.py)
+# they run there instead. The admission writer starts here rather than on
+# the first submission, so applications still queued from before a restart
+# are settled even if nobody submits again.
+if WRITER_SOCKET is None:
+    get_admission_service()
+    start_worker()
+    start_scheduler()
 
 
 # Navigation
@@ -337,6 +90,8 @@ def navigation():
     # Add Admin page to menu if logged in
     if st.session_state.admin_logged_in:
         menu.append("🔐 Admin Dashboard")
+        menu.append("📬 Inbox")
+        menu.append("🩺 Diagnostics")
     else:
         # Add Admin Login option
         menu.append("🔐 Admin Login")
@@ -359,6 +114,10 @@ def navigation():
         st.session_state.page = "Admin Login"
     elif choice == "🔐 Admin Dashboard":
         st.session_state.page = "Admin Dashboard"
+    elif choice == "📬 Inbox":
+        st.session_state.page = "Inbox"
+    elif choice == "🩺 Diagnostics":
+        st.session_state.page = "Diagnostics"
 
     # Admin logout button (only when logged in)
     if st.session_state.admin_logged_in:
@@ -386,16 +145,7 @@ page = st.session_state.page
 # Simple Home Page
 def home_page():
     # Hero Section
-    st.markdown("""
-    <div class="main-header">
-        <h1> EnLift-Institute</h1>
-        <h3>Computer Science Made Clear, Practical & Exam-Ready</h3>
-        <p style="max-width: 820px; margin: 1rem auto; font-size: 1.15rem;">
-            Structured online Computer Science education for ICSE, CBSE, WBCSE and college students.
-            We focus on <strong>concept clarity, coding confidence, and real understanding</strong>.
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(content.hero_html(), unsafe_allow_html=True)
     if st.session_state.page == "Courses":
         courses_page()
 
@@ -417,104 +167,39 @@ def home_page():
 
     # Trust Stats
     stat_cols = st.columns(3)
-    stats = [("5+", "Years Teaching"), ("1000+", "Classes Taken"), ("100%", "Syllabus Coverage")]
-    for col, (num, text) in zip(stat_cols, stats):
+    for col, (num, text) in zip(stat_cols, content.TRUST_STATS):
         with col:
-            st.markdown(f"""
-            <div class="stat-box">
-                <h2>{num}</h2>
-                <p>{text}</p>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(content.stat_html(num, text), unsafe_allow_html=True)
 
     st.markdown("---")
 
     # Why Choose Us
     st.subheader("✨ Why Students Choose EnLift")
-    features = [
-        ("👨‍🏫", "Experienced Faculty", "Taught by a software engineer with deep academic clarity"),
-        ("🧠", "Concept-First Teaching", "We explain *why*, not just *what*"),
-        ("💻", "Live Coding Classes", "Students code along during class"),
-        ("📝", "Assignments & Tests", "Weekly assignments and monthly tests"),
-        ("📊", "Progress Tracking", "Personal feedback & improvement reports"),
-        ("🎯", "Board-Focused", "Strictly aligned with ICSE, CBSE & WBCSE")
-    ]
-
     cols = st.columns(3)
-    for i, f in enumerate(features):
+    for i, f in enumerate(content.FEATURES):
         with cols[i % 3]:
-            st.markdown(f"""
-            <div class="feature-box">
-                <div class="feature-icon">{f[0]}</div>
-                <h4>{f[1]}</h4>
-                <p>{f[2]}</p>
-            </div>
-            
-            """, unsafe_allow_html=True)
+            st.markdown(content.feature_html(*f), unsafe_allow_html=True)
 
     st.markdown("---")
 
     # Programs
     st.subheader("🎓 Programs Offered")
     pcols = st.columns(2)
-
-    with pcols[0]:
-        st.markdown("""
-        <div class="course-highlight">
-            <h4>🏫 School Programs (Class VIII – XII)</h4>
-            <p>ICSE • CBSE • WBCSE</p>
-            <ul>
-                <li>Computer Science / Computer Applications</li>
-                <li>Complete board syllabus coverage</li>
-                <li>Monthly exams + assignments</li>
-                <li>Strong programming foundation</li>
-            </ul>
-            <strong>Fees: ₹1,000 – ₹1,200 / month</strong>
-        </div>
-        """, unsafe_allow_html=True)
-
-    with pcols[1]:
-        st.markdown("""
-        <div class="course-highlight">
-            <h4>🎓 College Programs (B.Tech CSE / BCA)</h4>
-            <ul>
-                <li>Programming & DSA clarity</li>
-                <li>DBMS, OS, CN explained practically</li>
-                <li>Project & interview guidance</li>
-            </ul>
-            <strong>Fees: ₹1,200 / month</strong>
-        </div>
-        """, unsafe_allow_html=True)
+    for col, program in zip(pcols, content.PROGRAMS):
+        with col:
+            st.markdown(content.program_html(program), unsafe_allow_html=True)
 
     st.markdown("---")
 
     # Learning Flow
     st.subheader("📈 How Learning Happens")
-    steps = [
-        ("1", "Assessment", "Understand student level & goals"),
-        ("2", "Live Classes", "Interactive explanation + coding"),
-        ("3", "Assignments", "Weekly problem solving"),
-        ("4", "Monthly Tests", "Board-pattern evaluation"),
-        ("5", "Confidence", "Exam-ready + coding clarity")
-    ]
-
-    for s in steps:
-        st.markdown(f"""
-        <div class="process-step">
-            <span class="step-number">{s[0]}</span> <strong>{s[1]}</strong>
-            <p>{s[2]}</p>
-        </div>
-        """, unsafe_allow_html=True)
+    for s in content.LEARNING_STEPS:
+        st.markdown(content.step_html(*s), unsafe_allow_html=True)
 
     st.markdown("---")
 
     # Final CTA
-    st.markdown("""
-    <div class="cta-section">
-        <h3>Start Learning the Right Way</h3>
-        <p>Admissions open • Limited seats • Personal attention guaranteed</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(content.cta_html(), unsafe_allow_html=True)
 
     c1, c2 = st.columns(2)
     with c1:
@@ -536,6 +221,13 @@ def admin_login_page():
 
     st.warning("⚠️ Admin access is restricted to authorized personnel only.")
 
+    admin_login_form()
+
+
+# Admin login form; failed attempts rerun only this fragment
+@st.fragment
+@profiled("admin_login_form")
+def admin_login_form():
     with st.form("admin_login_form"):
         admin_username = st.text_input("Username")
         admin_password = st.text_input("Password", type="password")
@@ -571,339 +263,300 @@ def admin_dashboard_page():
 
     st.title("🔐 Admin Dashboard")
 
-    # Initialize database connection
-    conn = init_database()
-
     # Admin actions
-    col1, col2, col3 = st.columns(3)
+    col1, col2 = st.columns(2)
 
     with col1:
         if st.button("🔄 Refresh Data", use_container_width=True):
+            st.session_state.pop('dashboard_view', None)
             st.rerun()
 
     with col2:
-        if st.button("📥 Export to CSV", use_container_width=True):
-            try:
-                df = pd.read_sql_query("SELECT * FROM students", conn)
-                csv = df.to_csv(index=False)
-                st.download_button(
-                    label="Download CSV",
-                    data=csv,
-                    file_name=f"enlift_students_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                    mime="text/csv",
-                    use_container_width=True
-                )
-            except Exception as e:
-                st.error(f"Error exporting data: {e}")
-
-    with col3:
         if st.button("🗑️ Clear Old Data", use_container_width=True):
             with st.expander("⚠️ Confirm Deletion"):
                 st.warning("This will delete all student records. This action cannot be undone!")
                 confirm = st.text_input("Type 'DELETE' to confirm:")
                 if confirm == "DELETE":
                     try:
-                        cursor = conn.cursor()
-                        cursor.execute("DELETE FROM students")
-                        conn.commit()
-                        st.success("✅ All student records have been deleted.")
+                        # Deleted in small batches by the maintenance scheduler
+                        write("clear_students")
+                        st.success("✅ Student records are being deleted in the background.")
                         st.rerun()
                     except Exception as e:
                         st.error(f"Error clearing data: {e}")
 
     st.markdown("---")
 
-    # Load and display student data
+    dashboard_search()
+
     try:
-        df = pd.read_sql_query("SELECT * FROM students ORDER BY registration_date DESC", conn)
+        with section("metrics"), get_storage().connection() as conn:
+            metrics = registration_metrics(conn)
+    except Exception as e:
+        st.error(f"Error loading data: {e}")
+        return
 
-        if len(df) == 0:
-            st.info("📭 No student registrations found.")
-        else:
-            # Statistics
-            st.subheader("📊 Registration Statistics")
+    if metrics["total"] == 0:
+        st.info("📭 No student registrations found.")
+        return
 
-            stat_cols = st.columns(4)
-            with stat_cols[0]:
-                st.metric("Total Students", len(df))
-            with stat_cols[1]:
-                today_count = len(df[pd.to_datetime(df['registration_date']).dt.date == datetime.now().date()])
-                st.metric("Today's Registrations", today_count)
-            with stat_cols[2]:
-                st.metric("Active Courses", df['course'].nunique())
-            with stat_cols[3]:
-                pending_count = len(df[df['status'] == 'pending'])
-                st.metric("Pending Approvals", pending_count)
+    # Statistics
+    st.subheader("📊 Registration Statistics")
 
-            st.markdown("---")
+    stat_cols = st.columns(4)
+    with stat_cols[0]:
+        st.metric("Total Students", metrics["total"])
+    with stat_cols[1]:
+        st.metric("Today's Registrations", metrics["today"])
+    with stat_cols[2]:
+        st.metric("Active Courses", metrics["active_courses"])
+    with stat_cols[3]:
+        st.metric("Pending Approvals", metrics["pending"])
 
-            # Filters
-            st.subheader("🔍 Filter Registrations")
+    st.markdown("---")
 
-            filter_cols = st.columns(3)
+    dashboard_table()
+    dashboard_analytics()
 
-            with filter_cols[0]:
-                course_filter = st.multiselect(
-                    "Filter by Course",
-                    options=sorted(df['course'].unique()),
-                    default=[]
-                )
 
-            with filter_cols[1]:
-                status_filter = st.multiselect(
-                    "Filter by Status",
-                    options=sorted(df['status'].unique()),
-                    default=[]
-                )
+# Ranked prefix search over students and contact messages (search.py)
+@st.fragment
+@profiled("dashboard_search")
+def dashboard_search():
+    query = st.text_input("🔎 Search students and messages",
+                          placeholder="Name, email, phone or message text")
+    if not query.strip():
+        return
 
-            with filter_cols[2]:
-                date_filter = st.date_input(
-                    "Filter by Registration Date",
-                    value=None
-                )
+    try:
+        started = datetime.now()
+        storage = get_storage()
+        with storage.connection() as conn:
+            students = storage.search.students(conn, query)
+            contacts = storage.search.contacts(conn, query)
+        elapsed = (datetime.now() - started).total_seconds() * 1000
+    except Exception as e:
+        st.error(f"Search failed: {e}")
+        return
 
-            # Apply filters
-            filtered_df = df.copy()
+    st.caption(f"{len(students)} student(s) and {len(contacts)} message(s) in {elapsed:.0f} ms")
+    if not (students.attrs["ranked"] and contacts.attrs["ranked"]):
+        st.caption("Too many matches to rank; showing the newest. Add more letters or words to narrow it down.")
+    if len(students):
+        st.dataframe(students, use_container_width=True, hide_index=True)
+    if len(contacts):
+        st.dataframe(contacts, use_container_width=True, hide_index=True)
+    if not len(students) and not len(contacts):
+        st.info("No matches.")
 
-            if course_filter:
-                filtered_df = filtered_df[filtered_df['course'].isin(course_filter)]
+    st.markdown("---")
 
-            if status_filter:
-                filtered_df = filtered_df[filtered_df['status'].isin(status_filter)]
 
-            if date_filter:
-                filtered_df = filtered_df[pd.to_datetime(filtered_df['registration_date']).dt.date == date_filter]
+# Filters, export, paging and the editable grid; interactions here rerun only this fragment
+@st.fragment
+@profiled("dashboard_table")
+def dashboard_table():
+    try:
+        storage = get_storage()
+        with storage.connection() as conn:
+            courses = stat_keys(conn, "course")
+            statuses = stat_keys(conn, "status")
 
-            # Display filtered data
-            st.subheader(f"📋 Student Registrations ({len(filtered_df)} records)")
+        # Filters
+        st.subheader("🔍 Filter Registrations")
 
-            # Editable dataframe for status updates
-            edited_df = st.data_editor(
-                filtered_df,
-                column_config={
-                    "id": st.column_config.NumberColumn("ID", disabled=True),
-                    "name": st.column_config.TextColumn("Name", disabled=True),
-                    "email": st.column_config.TextColumn("Email", disabled=True),
-                    "phone": st.column_config.TextColumn("Phone"),
-                    "course": st.column_config.TextColumn("Course", disabled=True),
-                    "board": st.column_config.TextColumn("Board/Program"),
-                    "year": st.column_config.NumberColumn("Year/Grade"),
-                    "age": st.column_config.NumberColumn("Age"),
-                    "registration_date": st.column_config.DatetimeColumn("Registration Date", disabled=True),
-                    "status": st.column_config.SelectboxColumn(
-                        "Status",
-                        options=["pending", "approved", "rejected", "completed"],
-                        required=True
-                    )
-                },
-                use_container_width=True,
-                height=400
+        filter_cols = st.columns(3)
+
+        with filter_cols[0]:
+            course_filter = st.multiselect(
+                "Filter by Course",
+                options=courses,
+                default=[]
             )
 
-            # Save changes button
-            if st.button("💾 Save Changes", type="primary"):
-                try:
-                    # Update database with changes
-                    for index, row in edited_df.iterrows():
-                        cursor = conn.cursor()
-                        cursor.execute('''
-                            UPDATE students 
-                            SET phone=?, board=?, year=?, age=?, status=?
-                            WHERE id=?
-                        ''', (row['phone'], row['board'], row['year'], row['age'], row['status'], row['id']))
-                    conn.commit()
-                    st.success("✅ Changes saved successfully!")
+        with filter_cols[1]:
+            status_filter = st.multiselect(
+                "Filter by Status",
+                options=statuses,
+                default=[]
+            )
+
+        with filter_cols[2]:
+            date_filter = st.date_input(
+                "Filter by Registration Date",
+                value=None
+            )
+
+        # Filter the shared in-memory copy; only rows changed since it was
+        # last used are read from the database
+        with section("student_cache"):
+            students = get_student_cache().get(storage)
+        with section("filter"):
+            filtered = filter_students(students, course_filter, status_filter, date_filter)
+        filtered_count = len(filtered)
+
+        page_cols = st.columns([1, 1, 1, 1])
+        with page_cols[0]:
+            page_size = st.selectbox("Rows per page", [25, 50, 100, 250], index=1)
+        page_count = max(1, -(-filtered_count // page_size))
+        with page_cols[1]:
+            page_number = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1)
+
+        # Export the filtered rows; the file is streamed only when clicked
+        with page_cols[2]:
+            export_format = st.selectbox("Export format", list(EXPORT_FORMATS))
+        with page_cols[3]:
+            extension, mime = EXPORT_FORMATS[export_format]
+            st.download_button(
+                label="📥 Export",
+                data=deferred_export(export_format, course_filter, status_filter, date_filter),
+                file_name=f"enlift_students_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}",
+                mime=mime,
+                on_click="ignore",
+                use_container_width=True
+            )
+
+        # Keep the page as first loaded so saves can be diffed against it
+        view_key = (tuple(course_filter), tuple(status_filter), str(date_filter), page_number, page_size)
+        view = st.session_state.get('dashboard_view')
+        if view is None or view["key"] != view_key:
+            view = {
+                "key": view_key,
+                "data": students_page(filtered, page=page_number, page_size=page_size)
+            }
+            st.session_state.dashboard_view = view
+        page_df = view["data"]
+        record_frame("dashboard_page", page_df)
+
+        # Display filtered data
+        st.subheader(f"📋 Student Registrations ({filtered_count} records)")
+        st.caption(f"Page {page_number} of {page_count}")
+
+        # Editable dataframe for status updates
+        edited_df = st.data_editor(
+            page_df,
+            column_config={
+                "id": st.column_config.NumberColumn("ID", disabled=True),
+                "name": st.column_config.TextColumn("Name", disabled=True),
+                "email": st.column_config.TextColumn("Email", disabled=True),
+                "phone": st.column_config.TextColumn("Phone"),
+                "course": st.column_config.TextColumn("Course", disabled=True),
+                "board": st.column_config.TextColumn("Board/Program"),
+                "year": st.column_config.NumberColumn("Year/Grade"),
+                "age": st.column_config.NumberColumn("Age"),
+                "registration_date": st.column_config.DatetimeColumn("Registration Date", disabled=True),
+                "status": st.column_config.SelectboxColumn(
+                    "Status",
+                    options=["pending", "approved", "rejected", "completed"],
+                    required=True
+                ),
+                "row_version": None
+            },
+            use_container_width=True,
+            height=400
+        )
+
+        # Save changes button
+        if st.button("💾 Save Changes", type="primary"):
+            try:
+                # Write only the rows that were actually edited
+                with section("save"):
+                    changes = diff_student_edits(page_df, edited_df)
+                    saved, conflicts = write("save_edits", changes=changes)
+                if conflicts:
+                    st.session_state.pop('dashboard_view', None)
+                    st.warning(
+                        f"⚠️ Student(s) {', '.join(map(str, conflicts))} were changed by another admin. "
+                        "Nothing was saved; refresh to see the latest data and reapply your edits."
+                    )
+                elif saved == 0:
+                    st.info("No changes to save.")
+                else:
+                    st.session_state.pop('dashboard_view', None)
+                    st.success(f"✅ {saved} change(s) saved successfully!")
+                    # Full rerun so the metric tiles and charts pick up the change
                     st.rerun()
-                except Exception as e:
-                    st.error(f"Error saving changes: {e}")
+            except Exception as e:
+                st.error(f"Error saving changes: {e}")
 
-            # Detailed view expander
-            with st.expander("📊 Detailed Analytics"):
-                col1, col2 = st.columns(2)
+    except Exception as e:
+        st.error(f"Error loading data: {e}")
 
-                with col1:
-                    st.markdown("**Course Distribution**")
-                    course_counts = df['course'].value_counts()
-                    st.bar_chart(course_counts)
 
-                with col2:
-                    st.markdown("**Status Distribution**")
-                    status_counts = df['status'].value_counts()
-                    st.bar_chart(status_counts)
+# Detailed view expander, kept out of the table fragment's reruns
+@st.fragment
+@profiled("dashboard_analytics")
+def dashboard_analytics():
+    with st.expander("📊 Detailed Analytics"):
+        with get_storage().connection() as conn:
+            col1, col2 = st.columns(2)
 
-                col3, col4 = st.columns(2)
+            with col1:
+                st.markdown("**Course Distribution**")
+                st.bar_chart(course_counts(conn))
 
-                with col3:
-                    st.markdown("**Registration Trend (Last 7 Days)**")
-                    df['reg_date'] = pd.to_datetime(df['registration_date']).dt.date
-                    last_7_days = df[df['reg_date'] >= (datetime.now().date() - pd.Timedelta(days=7))]
-                    daily_counts = last_7_days.groupby('reg_date').size()
-                    st.line_chart(daily_counts)
+            with col2:
+                st.markdown("**Status Distribution**")
+                st.bar_chart(status_counts(conn))
 
-                with col4:
-                    st.markdown("**Age Distribution**")
-                    age_counts = df['age'].value_counts().sort_index()
-                    st.bar_chart(age_counts)
+            col3, col4 = st.columns(2)
 
-    except Exception as e:
-        st.error(f"Error loading data: {e}")
+            with col3:
+                st.markdown("**Registration Trend (Last 7 Days)**")
+                st.line_chart(daily_counts(conn, days=7))
 
-    finally:
-        conn.close()
+            with col4:
+                st.markdown("**Age Distribution**")
+                st.bar_chart(age_counts(conn))
 
 
 # Courses Page
 def courses_page():
     st.title("📚 Our Courses")
-    st.markdown(
-        "Well-structured **Computer Science programs** aligned with the **Indian education system**, "
-        "focused on **board syllabus mastery, strong programming skills, regular assessments, and exam readiness**."
-    )
+    st.markdown(content.COURSES_INTRO)
 
     # School Courses
     st.subheader("🎒 School Programs (Classes VIII – XII)")
-    st.markdown(
-        "Courses strictly follow **ICSE, CBSE, and WBCSE Computer Science / Computer Applications syllabi**, "
-        "with regular **assignments, monthly tests, and coding practice**."
-    )
+    st.markdown(content.SCHOOL_INTRO)
 
-    school_tabs = st.tabs(["ICSE", "CBSE", "WBCSE"])
-
-    school_courses = {
-        "ICSE": [
-            (
-                "Computer Science / Applications",
-                "Class VIII – X",
-                "Complete coverage of the ICSE syllabus with strong emphasis on **Java programming**, "
-                "algorithmic thinking, and database concepts. Students receive **regular programming assignments**, "
-                "**theory worksheets**, and **monthly tests** strictly based on ICSE exam patterns to ensure "
-                "concept clarity and consistent academic improvement.",
-                "₹1,000/ month"
-            ),
-            (
-                "Computer Science",
-                "Class XI – XII",
-                "In-depth preparation for ICSE Class 11 & 12 Computer Science, covering **Python programming**, "
-                "OOP concepts, and data structures. The course includes **weekly coding assignments**, "
-                "**practical-oriented exercises**, and **monthly evaluations** aligned with board examinations.",
-                "₹1,000 / month"
-            )
-        ],
-        "CBSE": [
-            (
-                "Computer Science / Applications",
-                "Class XI – XII",
-                "Structured as per the latest CBSE IP curriculum with focus on **Python, SQL, and data handling**. "
-                "Students work on **practical assignments**, **data-based problems**, and appear for "
-                "**monthly tests** designed according to the CBSE marking scheme.",
-                "₹1,000 / month"
-            ),
-            (
-                "Computer Science",
-                "Class XI – XII",
-                "Comprehensive CBSE Computer Science program covering **C++ / Python**, algorithms, "
-                "and problem-solving techniques. Includes **regular programming assignments**, "
-                "**theory practice**, and **monthly board-pattern tests** for exam confidence.",
-                "₹1,000 / month"
-            )
-        ],
-        "WBCSE": [
-            (
-                "Computer Science",
-                "Class IX – X",
-                "Aligned with the WBCSE syllabus, this course builds strong fundamentals in programming logic "
-                "and computer science concepts. Students receive **regular homework**, "
-                "**coding practice**, and **monthly tests** to track academic progress.",
-                "₹1,000 / month"
-            ),
-            (
-                "Computer Application",
-                "Class XI – XII",
-                "Designed strictly as per the WBCSE Computer Application syllabus, focusing on "
-                "**programming concepts, theory clarity, and exam-oriented preparation**. "
-                "Includes **topic-wise assignments**, **practical exercises**, and **monthly assessments**.",
-                "₹1,000 / month"
-            )
-        ]
-    }
+    catalog = get_catalog()
+    school_tabs = st.tabs(catalog.boards)
 
-    for idx, board in enumerate(["ICSE", "CBSE", "WBCSE"]):
+    for idx, board in enumerate(catalog.boards):
         with school_tabs[idx]:
-            for course_name, grade, description, fee in school_courses[board]:
+            for course in catalog.by_board[board]:
                 with st.container():
                     col1, col2 = st.columns([3, 1])
                     with col1:
-                        st.markdown(f"### {course_name}")
-                        st.markdown(f"**Applicable Class:** {grade}")
-                        st.markdown(f"📝 {description}")
+                        st.markdown(f"### {course['name']}")
+                        st.markdown(f"**Applicable Class:** {course['grade']}")
+                        st.markdown(f"📝 {course['description']}")
                     with col2:
-                        st.markdown(f"### {fee}")
-                        if st.button("Enroll Now", key=f"{board}_{course_name}"):
-                            st.session_state.course_selected = f"{board} - {course_name}"
+                        st.markdown(f"### {course['fee']}")
+                        if st.button("Enroll Now", key=course["id"]):
+                            st.session_state.course_selected = course["label"]
                             go_to_page("Admission")
                     st.markdown("---")
 
     # College Courses
     st.subheader("🎓 College Programs")
 
-    college_tabs = st.tabs(["B.Tech (CSE)", "BCA"])
-
-    college_courses = {
-        "B.Tech (CSE)": [
-            (
-                "1st Year",
-                "Strong Programming & Math Foundation",
-                "Focus on **C, C++, Python**, and engineering fundamentals to strengthen core concepts.",
-                "₹1,200 / month"
-            ),
-            (
-                "2nd Year",
-                "Core Computer Science Subjects",
-                "Detailed coverage of **Data Structures, Algorithms, Java/Python**, with problem-solving focus.",
-                "₹1,200 / month"
-            ),
-            (
-                "3rd Year",
-                "Advanced CS & Interview Readiness",
-                "Covers **DBMS, Operating Systems, Computer Networks**, and placement-oriented preparation.",
-                "₹1,200 / month"
-            )
-        ],
-        "BCA": [
-            (
-                "1st Year",
-                "Computer Fundamentals & Programming",
-                "Strong foundation in **C programming** and computer fundamentals.",
-                "₹1,200 / month"
-            ),
-            (
-                "2nd Year",
-                "Web & Application Development",
-                "Covers **HTML, CSS, JavaScript**, and backend basics.",
-                "₹1,200 / month"
-            ),
-            (
-                "3rd Year",
-                "Projects & Career Preparation",
-                "Focus on **final-year projects** and interview preparation.",
-                "₹1,200 / month"
-            )
-        ]
-    }
+    programs = [program["name"] for program in catalog.programs]
+    college_tabs = st.tabs(programs)
 
-    for idx, program in enumerate(["B.Tech (CSE)", "BCA"]):
+    for idx, program in enumerate(programs):
         with college_tabs[idx]:
-            for year, title, topics, fee in college_courses[program]:
+            for course in catalog.by_program[program]:
                 with st.container():
                     col1, col2 = st.columns([3, 1])
                     with col1:
-                        st.markdown(f"### {program} – {year}")
-                        st.markdown(f"**{title}**")
-                        st.markdown(f"📚 {topics}")
+                        st.markdown(f"### {program} – {course['name']}")
+                        st.markdown(f"**{course['title']}**")
+                        st.markdown(f"📚 {course['description']}")
                     with col2:
-                        st.markdown(f"### {fee}")
-                        if st.button("Enroll Now", key=f"{program}_{year}"):
-                            st.session_state.course_selected = f"{program} - {year}"
+                        st.markdown(f"### {course['fee']}")
+                        if st.button("Enroll Now", key=course["id"]):
+                            st.session_state.course_selected = course["label"]
                             go_to_page("Admission")
                     st.markdown("---")
 
@@ -919,9 +572,25 @@ def admission_page():
             st.session_state.course_selected = ""
             st.rerun()
 
-    # Initialize database connection
-    conn = init_database()
+    # A submitted application replaces the form until it is settled
+    admission = st.session_state.get('admission')
+    if admission is None:
+        admission_form()
+    elif admission["status"] == "queued":
+        admission_progress()
+    elif admission["status"] == "registered":
+        admission_welcome(admission)
+    else:
+        del st.session_state.admission
+        st.error("This email is already registered!" if admission["status"] == "duplicate"
+                 else f"An error occurred: {admission['error']}")
+        admission_form()
+
 
+# Admission form; validation errors rerun only this fragment
+@st.fragment
+@profiled("admission_form")
+def admission_form():
     with st.form("admission_form"):
         st.subheader("Personal Information")
 
@@ -934,43 +603,21 @@ def admission_page():
             age = st.number_input("Age*", min_value=8, max_value=30, value=16)
 
         with col2:
-            # Course Selection
-            course_options = [
-                "Select Course",
-                "ICSE - Computer Applications (9-10)",
-                "ICSE - Computer Science (11-12)",
-                "CBSE - Informatics Practices (11-12)",
-                "CBSE - Computer Science (11-12)",
-                "WBCSE - Computer Science (9-10)",
-                "WBCSE - Computer Application (11-12)",
-                "B.Tech CSE - 1st Year",
-                "B.Tech CSE - 2nd Year",
-                "B.Tech CSE - 3rd Year",
-                "BCA - 1st Year",
-                "BCA - 2nd Year",
-                "BCA - 3rd Year"
-            ]
-
-            # Pre-select course if it was chosen from courses page
-            default_index = 0
-            if st.session_state.course_selected:
-                for idx, option in enumerate(course_options):
-                    if st.session_state.course_selected in option:
-                        default_index = idx
-                        break
-
-            course = st.selectbox("Select Course*", course_options, index=default_index)
+            # Course Selection (pre-selected if chosen from the courses page)
+            catalog = get_catalog()
+            course = st.selectbox("Select Course*", catalog.course_options,
+                                  index=catalog.option_index(st.session_state.course_selected))
 
             # Board/Program selection
             education_type = st.radio("Education Level*",
                                       ["School (8-12)", "College (B.Tech/BCA)"])
 
             if education_type == "School (8-12)":
-                board = st.selectbox("Board*", ["ICSE", "CBSE", "WBCSE"])
-                year = st.selectbox("Grade*", [8, 9, 10, 11, 12])
+                board = st.selectbox("Board*", catalog.boards)
+                year = st.selectbox("Grade*", catalog.grades)
             else:
-                board = st.selectbox("Program*", ["B.Tech (Computer Science)", "BCA"])
-                year = st.selectbox("Year*", [1, 2, 3])
+                board = st.selectbox("Program*", catalog.program_form_names())
+                year = st.selectbox("Year*", catalog.program_years())
 
         st.subheader("Additional Information")
         previous_exp = st.text_area("Previous Computer Science Experience (if any)")
@@ -983,22 +630,16 @@ def admission_page():
 
         if submitted:
             # Validation
-            if not all([name,email, phone, course != "Select Course", agree]):
+            if not all([name,email, phone, course != SELECT_PLACEHOLDER, agree]):
                 st.error("Please fill all mandatory fields (*)")
             elif not re.match(r"[^@]+@[^@]+\.[^@]+", email):
                 st.error("Please enter a valid email address")
             else:
                 try:
-                    # Save to database
-                    cursor = conn.cursor()
-                    cursor.execute('''
-                        INSERT INTO students (name, email, phone, course, board, year, age, registration_date)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (name, email, phone, course, board, year, age, datetime.now()))
-                    conn.commit()
-
-                    # Save to JSON backup
-                    student_data = {
+                    # Stored as a queued admission request and answered with a receipt;
+                    # the student row, welcome email and journal record follow in the
+                    # background. Duplicates are rejected before queueing.
+                    receipt = write("register", student={
                         "name": name,
                         "email": email,
                         "phone": phone,
@@ -1006,85 +647,82 @@ def admission_page():
                         "board": board,
                         "year": year,
                         "age": age,
-                        "registration_date": datetime.now().isoformat(),
                         "previous_experience": previous_exp,
                         "expectations": expectations
-                    }
-
-                    # Create emails directory if not exists
-                    Path("emails").mkdir(exist_ok=True)
-
-                    # Save to JSON file
-                    Path("students").mkdir(exist_ok=True)
-                    with open(f"students/{email.replace('@', '_')}.json", "w") as f:
-                        json.dump(student_data, f, indent=2)
-
-                    # Send welcome email
-                    if send_welcome_email(email, name, course):
-                        st.success("✅ Registration Successful!")
-                        st.markdown("""
-                        <div class="success-message">
-                        <h3>🎉 Welcome to EnLift-Institute!</h3>
-                        <p>Your registration has been successfully submitted.</p>
-                        <p>A confirmation email has been sent to <strong>{email}</strong></p>
-                        <p>Our admission team will contact you within 24 hours.</p>
-                        </div>
-                        """.format(email=email), unsafe_allow_html=True)
-
-                        # Show next steps
-                        with st.expander("📋 Next Steps"):
-                            st.markdown("""
-                            1. **Check your email** for confirmation
-                            2. **Complete fee payment** (link in email)
-                            3. **Attend orientation** (schedule will be shared)
-                            4. **Access learning portal** (credentials will be provided)
-                            """)
+                    }, session_key=st.session_state.client_id,
+                       address=client_address(st.context.headers, st.context.ip_address))
+                    st.session_state.admission = {"receipt": receipt, "status": "queued", "email": email}
 
                     # Reset form and course selection
                     st.session_state.course_selected = ""
                     st.rerun()
 
-                except sqlite3.IntegrityError:
+                except DuplicateRegistration:
                     st.error("This email is already registered!")
+                except RateLimited as e:
+                    st.error(f"Too many submissions. Please try again in {e.retry_after:.0f} seconds.")
                 except Exception as e:
                     st.error(f"An error occurred: {str(e)}")
 
-    conn.close()
+
+# How often the admission page checks a pending application's receipt
+RECEIPT_POLL_SECONDS = 1
+
+
+# Polls the receipt until the admission writer has settled the application
+@st.fragment(run_every=RECEIPT_POLL_SECONDS)
+@profiled("admission_progress")
+def admission_progress():
+    admission = st.session_state.admission
+    state = admission_status(admission["receipt"])
+    if state is not None and state["status"] == "queued":
+        st.info(f"⏳ Submitting your application… Reference **{admission['receipt'][:8].upper()}**")
+        return
+    admission.update(state or {"status": "failed", "error": "unknown receipt"})
+    # Full rerun: the page shows the outcome and this fragment stops polling
+    st.rerun()
+
+
+def admission_welcome(admission):
+    st.success("✅ Registration Successful!")
+    st.markdown("""
+    <div class="success-message">
+    <h3>🎉 Welcome to EnLift-Institute!</h3>
+    <p>Your registration has been successfully submitted.</p>
+    <p>A confirmation email is on its way to <strong>{email}</strong></p>
+    <p>Our admission team will contact you within 24 hours.</p>
+    </div>
+    """.format(email=admission["email"]), unsafe_allow_html=True)
+
+    # Show next steps
+    with st.expander("📋 Next Steps"):
+        st.markdown("""
+        1. **Check your email** for confirmation
+        2. **Complete fee payment** (link in email)
+        3. **Attend orientation** (schedule will be shared)
+        4. **Access learning portal** (credentials will be provided)
+        """)
+
+    if st.button("📝 Submit another application"):
+        del st.session_state.admission
+        st.rerun()
 
 
 # About Us Page
 def about_us_page():
     st.title("👥 About EnLift-Institute")
 
-    st.markdown("""
-    ## Our Mission
-    To democratize quality computer science education and empower students 
-    with cutting-edge technical skills for the digital age.
-    """)
+    st.markdown(content.MISSION)
 
     col1, col2 = st.columns(2)
 
     with col1:
         st.subheader("📜 Our Story")
-        st.markdown("""
-        Founded in 2022, EnLift-Institute started with a simple vision: 
-        to make quality computer science education accessible to every student 
-        regardless of their geographical location.
-
-        Today, we've successfully trained **500+ students** across India 
-        and continue to expand our reach with innovative teaching methodologies.
-        """)
+        st.markdown(content.STORY)
 
     with col2:
         st.subheader("🎯 Our Values")
-        values = [
-            ("🔬", "Excellence", "Quality education with practical approach"),
-            ("🤝", "Integrity", "Transparent and ethical practices"),
-            ("🚀", "Innovation", "Adapting to latest technologies"),
-            ("❤️", "Student-Centric", "Personalized learning paths")
-        ]
-
-        for icon, title, desc in values:
+        for icon, title, desc in content.VALUES:
             st.markdown(f"**{icon} {title}**")
             st.markdown(f"<small>{desc}</small>", unsafe_allow_html=True)
             st.markdown("")
@@ -1098,80 +736,254 @@ def contact_us_page():
 
     with col1:
         st.subheader("📍 Our Address")
-        st.markdown("""
-        **EnLift-Institute**  
-        4no Padmapukur Par, 
-        West Bengal, 743222
-        India
-        """)
+        st.markdown(content.ADDRESS)
 
         st.subheader("📱 Contact Information")
-        st.markdown("""
-        **Phone:** +91-7584988846  
-        **Email:** enlift.provides@gmail.com  
-        """)
+        st.markdown(content.CONTACT_INFO)
 
         st.subheader("🕒 Office Hours")
-        st.markdown("""
-        **Monday - Friday:** 9:00 AM - 7:00 PM  
-        **Saturday:** 9:00 AM - 2:00 PM  
-        **Sunday:** Closed
-        """)
+        st.markdown(content.OFFICE_HOURS)
 
     with col2:
         st.subheader("✉️ Send us a Message")
 
-        with st.form("contact_form"):
-            contact_name = st.text_input("Your Name*")
-            contact_email = st.text_input("Your Email*")
-            contact_phone = st.text_input("Phone Number")
+        contact_form()
 
-            department = st.selectbox(
-                "Department",
-                ["General Inquiry", "Admissions", "Technical Support",
-                 "Fee Related", "Career Opportunities"]
-            )
 
-            message = st.text_area("Your Message*", height=150)
+# Contact form; submitting it reruns only this fragment
+@st.fragment
+@profiled("contact_form")
+def contact_form():
+    with st.form("contact_form"):
+        contact_name = st.text_input("Your Name*")
+        contact_email = st.text_input("Your Email*")
+        contact_phone = st.text_input("Phone Number")
 
-            contact_submit = st.form_submit_button("Send Message", type="primary")
+        department = st.selectbox("Department", DEPARTMENTS)
 
-            if contact_submit:
-                if not all([contact_name, contact_email, message]):
-                    st.error("Please fill all mandatory fields (*)")
-                else:
-                    # Save contact message
-                    contact_data = {
-                        "name": contact_name,
-                        "email": contact_email,
-                        "phone": contact_phone,
-                        "department": department,
-                        "message": message,
-                        "timestamp": datetime.now().isoformat()
-                    }
-
-                    # Create contacts directory
-                    Path("contacts").mkdir(exist_ok=True)
-
-                    with open(
-                            f"contacts/{contact_email.replace('@', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-                            "w") as f:
-                        json.dump(contact_data, f, indent=2)
+        message = st.text_area("Your Message*", height=150)
 
+        contact_submit = st.form_submit_button("Send Message", type="primary")
+
+        if contact_submit:
+            if not all([contact_name, contact_email, message]):
+                st.error("Please fill all mandatory fields (*)")
+            else:
+                # Save contact message
+                contact_data = {
+                    "name": contact_name,
+                    "email": contact_email,
+                    "phone": contact_phone,
+                    "department": department,
+                    "message": message,
+                    "timestamp": datetime.now().isoformat()
+                }
+
+                try:
+                    write("add_contact", contact=contact_data)
                     st.success("✅ Message sent successfully! We'll respond within 24 hours.")
+                except Exception as e:
+                    st.error(f"An error occurred: {str(e)}")
 
 
-# Main App
-def main():
-    # Create necessary directories
-    Path("students").mkdir(exist_ok=True)
-    Path("emails").mkdir(exist_ok=True)
-    Path("contacts").mkdir(exist_ok=True)
+# Inbox Page (admin only): contact-form messages, newest first
+def inbox_page():
+    if not st.session_state.admin_logged_in:
+        st.error("🔒 Access Denied. Please login as admin.")
+        return
 
-    # Sidebar navigation
-    current_page = navigation()
+    st.title("📬 Inbox")
+    inbox_messages()
+
+
+@st.fragment
+@profiled("inbox_messages")
+def inbox_messages():
+    try:
+        storage = get_storage()
+        with storage.connection() as conn:
+            filter_cols = st.columns([2, 1, 1, 1])
+            with filter_cols[0]:
+                departments = st.multiselect("Department", DEPARTMENTS, default=[])
+            with filter_cols[1]:
+                show = st.selectbox("Show", ["Unhandled", "Handled", "All"])
+            handled = {"Unhandled": False, "Handled": True, "All": None}[show]
 
-    # Display selected page
+            total = storage.contacts.count(conn, departments, handled)
+            with filter_cols[2]:
+                page_size = st.selectbox("Messages per page", [25, 50, 100], index=0)
+            page_count = max(1, -(-total // page_size))
+            with filter_cols[3]:
+                page_number = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1)
+
+            st.caption(f"{total} message(s) · page {page_number} of {page_count}")
+            if total == 0:
+                st.info("📭 No messages.")
+                return
+
+            with section("fetch_page"):
+                messages = storage.contacts.page(conn, departments, handled, page_number, page_size)
+            record_frame("inbox_page", messages)
+
+            editor_key = f"inbox_{departments}_{show}_{page_number}_{page_size}"
+            edited = st.data_editor(
+                messages,
+                column_config={
+                    "id": st.column_config.NumberColumn("ID", disabled=True),
+                    "created_at": st.column_config.TextColumn("Received", disabled=True),
+                    "name": st.column_config.TextColumn("Name", disabled=True),
+                    "email": st.column_config.TextColumn("Email", disabled=True),
+                    "phone": st.column_config.TextColumn("Phone", disabled=True),
+                    "department": st.column_config.TextColumn("Department", disabled=True),
+                    "message": st.column_config.TextColumn("Message", disabled=True, width="large"),
+                    "handled": st.column_config.CheckboxColumn("Handled")
+                },
+                use_container_width=True,
+                hide_index=True,
+                key=editor_key
+            )
+
+            if st.button("💾 Save", type="primary"):
+                changed = edited[edited["handled"] != messages["handled"]]
+                done = changed[changed["handled"]]["id"].tolist()
+                undone = changed[~changed["handled"]]["id"].tolist()
+                write("mark_handled", done=done, undone=undone)
+                # Drop the grid's pending edits so it redraws from the saved rows
+                st.session_state.pop(editor_key, None)
+                st.rerun(scope="fragment")
+    except Exception as e:
+        st.error(f"Error loading messages: {e}")
+
+
+# Background maintenance jobs (maintenance.py): last run of each, plus a manual trigger
+@st.fragment
+@profiled("maintenance_panel")
+def maintenance_panel():
+    st.subheader("🧰 Maintenance Jobs")
+    try:
+        # Job state is kept in the local SQLite file whichever storage is used
+        with get_connection() as conn:
+            states = job_states(conn)
+    except Exception as e:
+        st.error(f"Error loading maintenance state: {e}")
+        return
+    st.dataframe(states, use_container_width=True, hide_index=True)
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        job = st.selectbox("Job", [name for name, (interval, _) in JOBS.items() if interval is not None],
+                           label_visibility="collapsed")
+    with col2:
+        if st.button("▶️ Run Now", use_container_width=True):
+            write("run_job", name=job)
+            st.success(f"✅ {job} will run in the background shortly.")
+
+
+# Diagnostics Page (admin only): recent rerun profiles from profiling.py
+def diagnostics_page():
+    if not st.session_state.admin_logged_in:
+        st.error("🔒 Access Denied. Please login as admin.")
+        return
+
+    st.title("🩺 Diagnostics")
+    maintenance_panel()
+
+    cache = get_student_cache()
+    st.caption(
+        f"Dashboard data cache: version {cache.version}, "
+        f"{len(cache.frame) if cache.frame is not None else 0} rows in memory; "
+        f"{cache.stats['hits']} hits, {cache.stats['deltas']} delta refreshes "
+        f"({cache.stats['delta_rows']} rows), {cache.stats['reloads']} full loads."
+    )
+
+    # The admission writer runs in this process unless there is a writer
+    # service, whose log carries the same journal warnings
+    if WRITER_SOCKET is None:
+        admissions = get_admission_service().stats
+        st.caption(
+            f"Admissions: {admissions['registered']} registered, {admissions['duplicates']} duplicates, "
+            f"{admissions['rate_limited']} rate limited, {admissions['failed']} failed in "
+            f"{admissions['groups']} group commits; {admissions['journal_errors']} journal write errors."
+        )
+        if admissions["journal_pending"]:
+            st.warning(
+                f"⚠️ {admissions['journal_pending']} registration(s) are saved but not yet in the journal; "
+                "writing it keeps failing and is retried. Check free disk space and permissions of the "
+                "journal directory."
+            )
+
+    st.caption(
+        "Timings for recent reruns in this server process. "
+        "Set ENLIFT_PROFILE_LOG to also append every run to a JSONL file."
+    )
+
+    runs = [run for run in history() if run["duration_ms"] is not None]
+    if not runs:
+        st.info("No runs recorded yet.")
+        return
+
+    # Per page/fragment summary
+    by_name = {}
+    for run in runs:
+        by_name.setdefault(run["run"], []).append(run)
+    summary = []
+    for name, items in sorted(by_name.items()):
+        durations = sorted(run["duration_ms"] for run in items)
+        summary.append({
+            "run": name,
+            "count": len(items),
+            "p50_ms": durations[len(durations) // 2],
+            "max_ms": durations[-1],
+            "avg_sql": round(sum(run["sql_statements"] for run in items) / len(items), 1),
+            "avg_rows": round(sum(run["rows_fetched"] for run in items) / len(items), 1)
+        })
+    st.subheader("📈 Runs by Page")
+    st.dataframe(summary, use_container_width=True, hide_index=True)
+
+    # Slowest sections across all recorded runs
+    sections = {}
+    for run in runs:
+        for item in run["sections"]:
+            total = sections.setdefault(item["name"], {"section": item["name"], "calls": 0, "total_ms": 0.0})
+            total["calls"] += 1
+            total["total_ms"] = round(total["total_ms"] + item["ms"], 2)
+    st.subheader("⏱️ Hot Sections")
+    st.dataframe(sorted(sections.values(), key=lambda item: -item["total_ms"])[:20],
+                 use_container_width=True, hide_index=True)
+
+    st.subheader("🕒 Recent Runs")
+    st.dataframe([{
+        "run": run["run"],
+        "started_at": run["started_at"],
+        "duration_ms": run["duration_ms"],
+        "sql": run["sql_statements"],
+        "rows": run["rows_fetched"]
+    } for run in reversed(runs[-50:])], use_container_width=True, hide_index=True)
+
+    last = runs[-1]
+    with st.expander(f"Last run: {last['run']} ({last['duration_ms']} ms)"):
+        st.dataframe(last["sections"], use_container_width=True, hide_index=True)
+        if last["frames"]:
+            st.markdown("**DataFrames**")
+            st.dataframe(last["frames"], use_container_width=True, hide_index=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            label="📥 Download runs (JSONL)",
+            data="\n".join(json.dumps(run) for run in runs),
+            file_name=f"enlift_profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl",
+            mime="application/x-ndjson",
+            use_container_width=True
+        )
+    with col2:
+        if st.button("🧹 Clear History", use_container_width=True):
+            clear_history()
+            st.rerun()
+
+
+# Display selected page
+def render_page(current_page):
     if current_page == "Home":
         home_page()
     elif current_page == "Courses":
@@ -1186,17 +998,20 @@ def main():
         admin_login_page()
     elif current_page == "Admin Dashboard":
         admin_dashboard_page()
+    elif current_page == "Inbox":
+        inbox_page()
+    elif current_page == "Diagnostics":
+        diagnostics_page()
+
 
-    # Footer
+# Footer
+def footer():
     st.markdown("---")
     footer_cols = st.columns([2, 1, 1, 1])
 
     with footer_cols[0]:
-        st.markdown("### EnLift-Institute")
-        st.markdown("""
-        Transforming computer science education through 
-        innovative online coaching since 2022.
-        """)
+        st.markdown(f"### {content.SITE_NAME}")
+        st.markdown(content.FOOTER_ABOUT)
 
     with footer_cols[1]:
         st.markdown("**Quick Links**")
@@ -1209,18 +1024,33 @@ def main():
 
     with footer_cols[2]:
         st.markdown("**Resources**")
-        st.markdown("Study Materials")
-        st.markdown("Placement Portal")
-        st.markdown("FAQ")
+        for item in content.FOOTER_RESOURCES:
+            st.markdown(item)
 
     with footer_cols[3]:
         st.markdown("**Legal**")
-        st.markdown("Privacy Policy")
-        st.markdown("Terms of Service")
-        st.markdown("Refund Policy")
+        for item in content.FOOTER_LEGAL:
+            st.markdown(item)
 
     st.markdown("---")
-    st.markdown("© 2024 EnLift-Institute. All rights reserved.")
+    st.markdown(content.COPYRIGHT)
+
+
+# Main App
+def main():
+    try:
+        # Sidebar navigation
+        with section("navigation"):
+            current_page = navigation()
+        name_run(current_page)
+
+        with section(f"page:{current_page}"):
+            render_page(current_page)
+
+        with section("footer"):
+            footer()
+    finally:
+        finish_run()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,29 @@
+import re
+import threading
+from pathlib import Path
+
+STATIC_DIR = Path(__file__).with_name("static")
+STYLESHEET_PATH = STATIC_DIR / "enlift.css"
+
+
+def minify_css(text):
+    text = re.sub(r"/\*.*?\*/", "", text, flags=re.S)
+    text = re.sub(r"\s+", " ", text)
+    text = re.sub(r"\s*([{}:;,>])\s*", r"\1", text)
+    return text.replace(";}", "}").strip()
+
+
+# Streamlit's static handler serves .css as text/plain with nosniff, which
+# browsers refuse as a stylesheet, so the sheet is inlined: read and minified
+# once per process, then sent as a single small <style> element per rerun.
+_style_tag = None
+_style_lock = threading.Lock()
+
+
+def style_tag():
+    global _style_tag
+    if _style_tag is None:
+        with _style_lock:
+            if _style_tag is None:
+                _style_tag = f"<style>{minify_css(STYLESHEET_PATH.read_text(encoding='utf-8'))}</style>"
+    return _style_tag
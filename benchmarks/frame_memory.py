@@ -0,0 +1,139 @@
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = REPO_ROOT / "benchmarks" / "results"
+
+
+def median_ms(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return round(statistics.median(samples) * 1000, 2)
+
+
+# The dashboard frame as it was before compact_students: object strings and
+# int64/float64, with the date filter comparing ISO text
+def plain_filter(frame, courses=None, statuses=None, date=None):
+    import pandas as pd
+    from queries import day_bounds
+
+    mask = pd.Series(True, index=frame.index)
+    if courses:
+        mask &= frame["course"].isin(courses)
+    if statuses:
+        mask &= frame["status"].isin(statuses)
+    if date:
+        start, end = day_bounds(date)
+        mask &= (frame["registration_date"] >= start) & (frame["registration_date"] < end)
+    return frame[mask]
+
+
+def run_benchmark(args):
+    workdir = Path(tempfile.mkdtemp(prefix="enlift-frame-"))
+    if not args.db:
+        os.environ["ENLIFT_DB_PATH"] = str(workdir / "bench.db")
+    os.environ["ENLIFT_JOURNAL_DIR"] = str(workdir / "journal")
+    sys.path.insert(0, str(REPO_ROOT))
+
+    import database
+    from student_cache import compact_students, filter_students, read_students
+    from synthetic_data import generate_students, insert_students
+
+    pool = database.get_pool()
+    with pool.connection() as conn:
+        if not args.db:
+            insert_students(conn, generate_students(args.rows, seed=args.seed))
+        started = time.perf_counter()
+        plain = read_students(conn)
+        read_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    compact = compact_students(plain)
+    compact_seconds = time.perf_counter() - started
+
+    courses = list(plain["course"].value_counts().index[:2])
+    status = plain["status"].value_counts().index[0]
+    day = datetime.fromisoformat(plain["registration_date"].iloc[len(plain) // 2]).date()
+    cases = {
+        "two_courses": {"courses": courses},
+        "status": {"statuses": [status]},
+        "day": {"date": day},
+        "course_status_day": {"courses": courses, "statuses": [status], "date": day},
+    }
+
+    filters = {}
+    for name, kwargs in cases.items():
+        filters[name] = {
+            "rows": len(filter_students(compact, **kwargs)),
+            "plain_ms": median_ms(lambda: plain_filter(plain, **kwargs), args.repeat),
+            "compact_ms": median_ms(lambda: filter_students(compact, **kwargs), args.repeat),
+        }
+        if len(plain_filter(plain, **kwargs)) != filters[name]["rows"]:
+            raise AssertionError(f"{name}: plain and compact filters disagree")
+
+    sort_columns = ["registration_date", "id"]
+    results = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "rows": len(plain),
+        "load": {"read_sql_s": round(read_seconds, 3), "compact_s": round(compact_seconds, 3)},
+        "memory_mb": {
+            "plain": round(plain.memory_usage(deep=True).sum() / 2 ** 20, 1),
+            "compact": round(compact.memory_usage(deep=True).sum() / 2 ** 20, 1),
+        },
+        "columns_mb": {
+            column: [round(plain[column].memory_usage(deep=True, index=False) / 2 ** 20, 2),
+                     round(compact[column].memory_usage(deep=True, index=False) / 2 ** 20, 2)]
+            for column in plain.columns
+        },
+        "filters": filters,
+        "sort": {
+            "plain_ms": median_ms(lambda: plain.sort_values(sort_columns, ascending=False), args.repeat),
+            "compact_ms": median_ms(lambda: compact.sort_values(sort_columns, ascending=False), args.repeat),
+        },
+    }
+
+    shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def report(results):
+    memory = results["memory_mb"]
+    print(f"{results['rows']} students: {memory['plain']} MB plain, {memory['compact']} MB compact "
+          f"({memory['compact'] / memory['plain']:.0%})")
+    print(f"{'column':<20}{'plain MB':>12}{'compact MB':>12}")
+    for column, (before, after) in results["columns_mb"].items():
+        print(f"{column:<20}{before:>12}{after:>12}")
+    print(f"{'filter':<20}{'rows':>10}{'plain ms':>12}{'compact ms':>12}")
+    for name, item in list(results["filters"].items()) + [("sort", {"rows": "", **results["sort"]})]:
+        print(f"{name:<20}{item['rows']:>10}{item['plain_ms']:>12}{item['compact_ms']:>12}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Memory and filter speed of the plain vs compact student frame")
+    parser.add_argument("--rows", type=int, default=200000, help="students seeded into a temporary database")
+    parser.add_argument("--db", action="store_true", help="measure the database at ENLIFT_DB_PATH instead")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<timestamp>.json)")
+    args = parser.parse_args()
+
+    results = run_benchmark(args)
+    report(results)
+    output = args.output
+    if output is None:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        output = RESULTS_DIR / f"frame_memory_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}")
@@ -0,0 +1,287 @@
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+APP_PATH = str(REPO_ROOT / "app.py")
+RESULTS_DIR = REPO_ROOT / "benchmarks" / "results"
+# How often a student session reruns while its application is queued
+SETTLE_POLL_SECONDS = 0.05
+
+
+# Per-session latency samples and error counts
+class Recorder:
+    def __init__(self):
+        self.samples = {}
+        self.errors = {}
+
+    def timed_run(self, name, at, timeout):
+        started = time.perf_counter()
+        at.run(timeout=timeout)
+        self.samples.setdefault(name, []).append(time.perf_counter() - started)
+        if at.exception:
+            self.error(name, at.exception[0].message)
+        return at
+
+    def error(self, name, message):
+        key = f"{name}: {message[:80]}"
+        self.errors[key] = self.errors.get(key, 0) + 1
+
+    def merge(self, other):
+        for name, values in other["samples"].items():
+            self.samples.setdefault(name, []).extend(values)
+        for key, count in other["errors"].items():
+            self.errors[key] = self.errors.get(key, 0) + count
+
+
+# AppTest keeps global runtime state, so every simulated session runs in its
+# own process. That also means each session has its own connection pool and
+# the sessions contend for SQLite's write lock across processes.
+def run_session(kind, worker, iterations, pages, timeout):
+    sys.path.insert(0, str(REPO_ROOT))
+    import database
+
+    recorder = Recorder()
+    try:
+        if kind == "student":
+            student_session(recorder, worker, iterations, timeout)
+        else:
+            admin_session(recorder, iterations, pages, timeout)
+    except Exception as e:
+        recorder.error(kind, f"session aborted: {e}")
+
+    return {
+        "samples": recorder.samples,
+        "errors": recorder.errors,
+        "pool": dict(database.get_pool().stats),
+        "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarise(values):
+    return {
+        "count": len(values),
+        "mean_ms": round(sum(values) / len(values) * 1000, 2),
+        "p50_ms": round(percentile(values, 50) * 1000, 2),
+        "p90_ms": round(percentile(values, 90) * 1000, 2),
+        "p99_ms": round(percentile(values, 99) * 1000, 2),
+        "max_ms": round(max(values) * 1000, 2),
+    }
+
+
+# One simulated student: open the app, go to Admission, submit the form and
+# wait for the application to be settled
+def student_session(recorder, worker, iterations, timeout):
+    from streamlit.testing.v1 import AppTest
+
+    for i in range(iterations):
+        at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        recorder.timed_run("home", at, timeout)
+        at.sidebar.radio(key="nav_choice").set_value("🎯 Admission")
+        recorder.timed_run("admission_page", at, timeout)
+
+        at.text_input[0].input(f"Bench Student {worker}-{i}")
+        at.text_input[1].input(f"bench{worker}_{i}_{time.time_ns()}@example.com")
+        at.text_input[2].input("9876543210")
+        at.selectbox[0].select_index(1 + (worker + i) % (len(at.selectbox[0].options) - 1))
+        at.checkbox[0].check()
+        next(b for b in at.button if b.label == "Submit Application").click()
+        recorder.timed_run("admission_submit", at, timeout)
+        for error in at.error:
+            recorder.error("admission_submit", error.value)
+        settle_admission(recorder, at, timeout)
+
+
+# The submit only queues the application and answers with a receipt. Rerun,
+# as the page's polling fragment would, until the admission writer has
+# settled it; admission_settle is the time from receipt to outcome.
+def settle_admission(recorder, at, timeout):
+    if "admission" not in at.session_state:
+        # Rejected before queueing, recorded with the submit
+        return
+    started = time.perf_counter()
+    while at.session_state["admission"]["status"] == "queued":
+        if time.perf_counter() - started > timeout:
+            recorder.error("admission_settle", "still queued at timeout")
+            return
+        time.sleep(SETTLE_POLL_SECONDS)
+        at.run(timeout=timeout)
+        if at.exception:
+            recorder.error("admission_settle", at.exception[0].message)
+            return
+        # Duplicate and failed outcomes clear the receipt and show an error
+        if "admission" not in at.session_state:
+            recorder.samples.setdefault("admission_settle", []).append(time.perf_counter() - started)
+            for error in at.error:
+                recorder.error("admission_settle", error.value)
+            return
+    recorder.samples.setdefault("admission_settle", []).append(time.perf_counter() - started)
+
+
+# One simulated admin: open the dashboard, page through it, apply a filter
+def admin_session(recorder, iterations, pages, timeout):
+    from streamlit.testing.v1 import AppTest
+
+    for _ in range(iterations):
+        at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        at.session_state.admin_logged_in = True
+        at.run(timeout=timeout)
+        at.sidebar.radio(key="nav_choice").set_value("🔐 Admin Dashboard")
+        recorder.timed_run("dashboard_load", at, timeout)
+
+        page_input = next((n for n in at.number_input if n.label == "Page"), None)
+        if page_input is None:
+            recorder.error("dashboard_load", "no student table rendered")
+            continue
+        for page in range(2, min(pages, int(page_input.max or 1)) + 1):
+            page_input.set_value(page)
+            recorder.timed_run("dashboard_page", at, timeout)
+            page_input = next(n for n in at.number_input if n.label == "Page")
+
+        status_filter = next(m for m in at.multiselect if m.label == "Filter by Status")
+        if status_filter.options:
+            status_filter.select(status_filter.options[0])
+            recorder.timed_run("dashboard_filter", at, timeout)
+        for error in at.error:
+            recorder.error("dashboard", error.value)
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                                       text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(args):
+    workdir = Path(tempfile.mkdtemp(prefix="enlift-bench-"))
+    os.environ["ENLIFT_DB_PATH"] = str(workdir / "bench.db")
+    os.environ["ENLIFT_JOURNAL_DIR"] = str(workdir / "journal")
+    os.chdir(workdir)
+    sys.path.insert(0, str(REPO_ROOT))
+
+    import database
+    from synthetic_data import generate_students, insert_students
+
+    pool = database.get_pool()
+    started = time.perf_counter()
+    with pool.connection() as conn:
+        insert_students(conn, generate_students(args.rows, seed=args.seed))
+    seed_seconds = time.perf_counter() - started
+
+    sessions = [("student", n) for n in range(args.students)] + [("admin", n) for n in range(args.admins)]
+    recorder = Recorder()
+    pool_stats = {"acquired": 0, "waited": 0, "wait_seconds": 0.0}
+    session_rss = []
+
+    started = time.perf_counter()
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=len(sessions), mp_context=context) as executor:
+        futures = [
+            executor.submit(run_session, kind, worker, args.iterations, args.pages, args.timeout)
+            for kind, worker in sessions
+        ]
+        for future in futures:
+            result = future.result()
+            recorder.merge(result)
+            for key in pool_stats:
+                pool_stats[key] += result["pool"][key]
+            session_rss.append(result["max_rss_kb"])
+    wall = time.perf_counter() - started
+
+    with pool.connection() as conn:
+        stored = conn.execute("SELECT COUNT(*) FROM students").fetchone()[0]
+        unsettled = conn.execute("SELECT COUNT(*) FROM admission_requests WHERE status = 'queued'").fetchone()[0]
+
+    reruns = sum(len(values) for values in recorder.samples.values())
+    submissions = len(recorder.samples.get("admission_submit", []))
+    results = {
+        "revision": git_revision(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "config": {
+            "students": args.students, "admins": args.admins, "rows": args.rows,
+            "iterations": args.iterations, "pages": args.pages, "seed": args.seed,
+        },
+        "seed_seconds": round(seed_seconds, 3),
+        "wall_seconds": round(wall, 3),
+        "throughput": {
+            "reruns_per_second": round(reruns / wall, 2),
+            "submissions_per_second": round(submissions / wall, 2),
+        },
+        "latency": {name: summarise(values) for name, values in sorted(recorder.samples.items())},
+        "database": {
+            "rows_after": stored,
+            "admissions_unsettled": unsettled,
+            "pool_acquired": pool_stats["acquired"],
+            "pool_waits": pool_stats["waited"],
+            "pool_wait_ms": round(pool_stats["wait_seconds"] * 1000, 2),
+            "locked_errors": sum(count for key, count in recorder.errors.items() if "locked" in key),
+        },
+        "memory": {
+            "session_max_rss_mb": round(max(session_rss) / 1024, 1),
+            "session_mean_rss_mb": round(sum(session_rss) / len(session_rss) / 1024, 1),
+        },
+        "errors": recorder.errors,
+    }
+
+    if not args.keep:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+# Print per-step latency changes against an earlier results file
+def compare(previous, current):
+    print(f"{'step':<20}{'p50 before':>12}{'p50 after':>12}{'p90 before':>12}{'p90 after':>12}")
+    for name, stats in current["latency"].items():
+        old = previous.get("latency", {}).get(name)
+        if old is None:
+            continue
+        print(f"{name:<20}{old['p50_ms']:>12}{stats['p50_ms']:>12}{old['p90_ms']:>12}{stats['p90_ms']:>12}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent admission/dashboard load test for app.py")
+    parser.add_argument("--students", type=int, default=4, help="concurrent student sessions")
+    parser.add_argument("--admins", type=int, default=2, help="concurrent admin sessions")
+    parser.add_argument("--rows", type=int, default=10000, help="students seeded before the run")
+    parser.add_argument("--iterations", type=int, default=3, help="flows per session")
+    parser.add_argument("--pages", type=int, default=5, help="dashboard pages visited per admin flow")
+    parser.add_argument("--seed", type=int, default=42, help="random seed for the generated students")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    parser.add_argument("--keep", action="store_true", help="keep the temporary working directory")
+    args = parser.parse_args()
+
+    output = Path(args.output).resolve() if args.output else None
+    baseline = json.loads(Path(args.compare).read_text()) if args.compare else None
+
+    results = run_benchmark(args)
+
+    if output is None:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        output = RESULTS_DIR / f"load_test_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    output.write_text(json.dumps(results, indent=2))
+    print(json.dumps(results["latency"], indent=2))
+    print(f"Results written to {output}")
+    if baseline:
+        compare(baseline, results)
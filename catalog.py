@@ -0,0 +1,65 @@
+import json
+import threading
+from pathlib import Path
+
+CATALOG_PATH = Path(__file__).with_name("courses.json")
+SELECT_PLACEHOLDER = "Select Course"
+
+
+# Course catalog loaded once from courses.json and indexed for lookups
+class Catalog:
+    def __init__(self, data):
+        school = data["school"]
+        college = data["college"]
+
+        self.boards = list(school["boards"])
+        self.grades = list(school["grades"])
+        self.programs = list(college["programs"])
+        self.school_courses = [dict(course, level="school") for course in school["courses"]]
+        self.college_courses = [dict(course, level="college") for course in college["courses"]]
+        self.courses = self.school_courses + self.college_courses
+
+        self.by_id = {course["id"]: course for course in self.courses}
+        self.by_label = {course["label"]: course for course in self.courses}
+
+        self.by_board = {board: [] for board in self.boards}
+        self.by_grade = {grade: [] for grade in self.grades}
+        for course in self.school_courses:
+            self.by_board[course["board"]].append(course)
+            for grade in course["grades"]:
+                self.by_grade.setdefault(grade, []).append(course)
+
+        self.by_program = {program["name"]: [] for program in self.programs}
+        for course in self.college_courses:
+            self.by_program[course["program"]].append(course)
+
+        # Admission selectbox options and their positions
+        self.course_options = [SELECT_PLACEHOLDER] + [course["label"] for course in self.courses]
+        self._option_index = {label: idx for idx, label in enumerate(self.course_options)}
+
+    def option_index(self, label):
+        return self._option_index.get(label, 0)
+
+    def program_form_names(self):
+        return [program["form_name"] for program in self.programs]
+
+    def program_years(self):
+        return sorted({year for program in self.programs for year in program["years"]})
+
+
+def load_catalog(path=CATALOG_PATH):
+    with open(path, encoding="utf-8") as f:
+        return Catalog(json.load(f))
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog():
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = load_catalog()
+    return _catalog
@@ -0,0 +1,149 @@
+import argparse
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+CONTACTS_DIR = "contacts"
+DEPARTMENTS = ["General Inquiry", "Admissions", "Technical Support", "Fee Related", "Career Opportunities"]
+INBOX_COLUMNS = ["id", "created_at", "name", "email", "phone", "department", "message", "handled"]
+
+
+def _created_at(timestamp):
+    # Same sortable text form as students.registration_date
+    return (timestamp or datetime.now().isoformat()).replace("T", " ")
+
+
+def contact_row(contact, source_path=None):
+    return (contact.get("name") or "", contact.get("email") or "", contact.get("phone"),
+            contact.get("department"), contact.get("message") or "",
+            _created_at(contact.get("timestamp")), source_path)
+
+
+# Bulk insert into SQLite in one transaction
+def insert_contacts(conn, contacts, batch_size=5000):
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        inserted = _insert_contacts(conn, contacts, batch_size)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return inserted
+
+
+# Messages whose source file was imported before are skipped
+def _insert_contacts(conn, contacts, batch_size=5000):
+    inserted = 0
+    batch = []
+    for contact in contacts:
+        batch.append(contact_row(contact, contact.get("source_path")))
+        if len(batch) >= batch_size:
+            inserted += _insert_batch(conn, batch)
+    return inserted + _insert_batch(conn, batch)
+
+
+def _insert_batch(conn, batch):
+    if not batch:
+        return 0
+    cursor = conn.executemany('''
+        INSERT INTO contacts (name, email, phone, department, message, created_at, source_path)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (source_path) DO NOTHING
+    ''', batch)
+    batch.clear()
+    return cursor.rowcount
+
+
+def _read_contact_files(directory):
+    for path in sorted(Path(directory).glob("*.json")):
+        try:
+            with open(path) as f:
+                contact = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            continue
+        contact["source_path"] = str(path)
+        yield contact
+
+
+# Bulk import of the old contacts/*.json files into the storage backend
+# (storage.py); a file is only imported once
+def import_contact_files(storage, directory=CONTACTS_DIR):
+    with storage.transaction() as conn:
+        return _insert_contacts(conn, _read_contact_files(directory))
+
+
+def build_where(departments=None, handled=None):
+    clauses, params = [], []
+    if departments:
+        clauses.append(f"department IN ({', '.join('?' * len(departments))})")
+        params.extend(departments)
+    return _add_handled(clauses, params, handled)
+
+
+def _add_handled(clauses, params, handled):
+    if handled is not None:
+        clauses.append("handled = ?")
+        params.append(int(handled))
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    return where, params
+
+
+def count_contacts(conn, departments=None, handled=None):
+    where, params = build_where(departments, handled)
+    return conn.execute(f"SELECT COUNT(*) FROM contacts {where}", params).fetchone()[0]
+
+
+# Ids of one page, newest first, read from covering indexes only. Several
+# departments are merged from one ordered index range each instead of
+# sorting every matching row.
+def _page_ids(departments, handled, limit, offset):
+    if departments and len(departments) > 1:
+        parts, params = [], []
+        for department in departments:
+            where, branch_params = _add_handled(["department = ?"], [department], handled)
+            parts.append(f'''
+                SELECT * FROM (
+                    SELECT id, created_at FROM contacts {where}
+                    ORDER BY created_at DESC, id DESC LIMIT ?
+                ) AS branch''')
+            params += branch_params + [offset + limit]
+        sql = " UNION ALL ".join(parts)
+    else:
+        where, params = build_where(departments, handled)
+        sql = f"SELECT id, created_at FROM contacts {where}"
+    return (f"SELECT id FROM ({sql} ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?) AS page",
+            params + [limit, offset])
+
+
+# Paging skips index entries rather than whole rows, so deep pages stay cheap
+def fetch_contacts_page(conn, departments=None, handled=None, page=1, page_size=25):
+    offset = (max(page, 1) - 1) * page_size
+    ids_sql, params = _page_ids(departments, handled, page_size, offset)
+    rows = conn.execute(f'''
+        SELECT {', '.join(INBOX_COLUMNS)} FROM contacts
+        WHERE id IN ({ids_sql})
+        ORDER BY created_at DESC, id DESC
+    ''', params).fetchall()
+    inbox = pd.DataFrame.from_records(rows, columns=INBOX_COLUMNS)
+    inbox["handled"] = inbox["handled"].astype(bool)
+    return inbox
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import and inspect EnLift contact messages")
+    parser.add_argument("--import-files", metavar="DIR", nargs="?", const=CONTACTS_DIR,
+                        help=f"import JSON message files (default: {CONTACTS_DIR}/)")
+    args = parser.parse_args()
+
+    from storage import get_storage
+
+    storage = get_storage()
+    if args.import_files:
+        started = time.perf_counter()
+        imported = import_contact_files(storage, args.import_files)
+        print(f"Imported {imported} messages from {args.import_files} in {time.perf_counter() - started:.2f}s")
+    with storage.connection() as conn:
+        print(f"{count_contacts(conn)} messages, {count_contacts(conn, handled=False)} unhandled")
@@ -0,0 +1,179 @@
+# Marketing page content, shared by app.py and the static snapshots in prerender.py.
+# Markdown strings are rendered by st.markdown in the app and by prerender.markdown_html.
+
+SITE_NAME = "EnLift-Institute"
+
+HERO = {
+    "title": "EnLift-Institute",
+    "tagline": "Computer Science Made Clear, Practical & Exam-Ready",
+    "intro": (
+        "Structured online Computer Science education for ICSE, CBSE, WBCSE and college students. "
+        "We focus on <strong>concept clarity, coding confidence, and real understanding</strong>."
+    ),
+}
+
+TRUST_STATS = [("5+", "Years Teaching"), ("1000+", "Classes Taken"), ("100%", "Syllabus Coverage")]
+
+FEATURES = [
+    ("👨‍🏫", "Experienced Faculty", "Taught by a software engineer with deep academic clarity"),
+    ("🧠", "Concept-First Teaching", "We explain *why*, not just *what*"),
+    ("💻", "Live Coding Classes", "Students code along during class"),
+    ("📝", "Assignments & Tests", "Weekly assignments and monthly tests"),
+    ("📊", "Progress Tracking", "Personal feedback & improvement reports"),
+    ("🎯", "Board-Focused", "Strictly aligned with ICSE, CBSE & WBCSE")
+]
+
+PROGRAMS = [
+    {
+        "title": "🏫 School Programs (Class VIII – XII)",
+        "subtitle": "ICSE • CBSE • WBCSE",
+        "points": [
+            "Computer Science / Computer Applications",
+            "Complete board syllabus coverage",
+            "Monthly exams + assignments",
+            "Strong programming foundation"
+        ],
+        "fees": "Fees: ₹1,000 – ₹1,200 / month"
+    },
+    {
+        "title": "🎓 College Programs (B.Tech CSE / BCA)",
+        "subtitle": None,
+        "points": [
+            "Programming & DSA clarity",
+            "DBMS, OS, CN explained practically",
+            "Project & interview guidance"
+        ],
+        "fees": "Fees: ₹1,200 / month"
+    }
+]
+
+LEARNING_STEPS = [
+    ("1", "Assessment", "Understand student level & goals"),
+    ("2", "Live Classes", "Interactive explanation + coding"),
+    ("3", "Assignments", "Weekly problem solving"),
+    ("4", "Monthly Tests", "Board-pattern evaluation"),
+    ("5", "Confidence", "Exam-ready + coding clarity")
+]
+
+FINAL_CTA = {
+    "title": "Start Learning the Right Way",
+    "text": "Admissions open • Limited seats • Personal attention guaranteed"
+}
+
+COURSES_INTRO = (
+    "Well-structured **Computer Science programs** aligned with the **Indian education system**, "
+    "focused on **board syllabus mastery, strong programming skills, regular assessments, and exam readiness**."
+)
+
+SCHOOL_INTRO = (
+    "Courses strictly follow **ICSE, CBSE, and WBCSE Computer Science / Computer Applications syllabi**, "
+    "with regular **assignments, monthly tests, and coding practice**."
+)
+
+MISSION = """
+## Our Mission
+To democratize quality computer science education and empower students
+with cutting-edge technical skills for the digital age.
+"""
+
+STORY = """
+Founded in 2022, EnLift-Institute started with a simple vision:
+to make quality computer science education accessible to every student
+regardless of their geographical location.
+
+Today, we've successfully trained **500+ students** across India
+and continue to expand our reach with innovative teaching methodologies.
+"""
+
+VALUES = [
+    ("🔬", "Excellence", "Quality education with practical approach"),
+    ("🤝", "Integrity", "Transparent and ethical practices"),
+    ("🚀", "Innovation", "Adapting to latest technologies"),
+    ("❤️", "Student-Centric", "Personalized learning paths")
+]
+
+# Two trailing spaces are markdown line breaks
+ADDRESS = (
+    "**EnLift-Institute**  \n"
+    "4no Padmapukur Par,\n"
+    "West Bengal, 743222\n"
+    "India"
+)
+
+CONTACT_INFO = (
+    "**Phone:** +91-7584988846  \n"
+    "**Email:** enlift.provides@gmail.com"
+)
+
+OFFICE_HOURS = (
+    "**Monday - Friday:** 9:00 AM - 7:00 PM  \n"
+    "**Saturday:** 9:00 AM - 2:00 PM  \n"
+    "**Sunday:** Closed"
+)
+
+FOOTER_ABOUT = """
+Transforming computer science education through
+innovative online coaching since 2022.
+"""
+FOOTER_RESOURCES = ["Study Materials", "Placement Portal", "FAQ"]
+FOOTER_LEGAL = ["Privacy Policy", "Terms of Service", "Refund Policy"]
+COPYRIGHT = "© 2024 EnLift-Institute. All rights reserved."
+
+
+# HTML blocks used as-is by both the app (st.markdown) and the snapshots
+def hero_html():
+    return f"""
+    <div class="main-header">
+        <h1> {HERO['title']}</h1>
+        <h3>{HERO['tagline']}</h3>
+        <p style="max-width: 820px; margin: 1rem auto; font-size: 1.15rem;">
+            {HERO['intro']}
+        </p>
+    </div>
+    """
+
+
+def stat_html(num, text):
+    return f"""
+    <div class="stat-box">
+        <h2>{num}</h2>
+        <p>{text}</p>
+    </div>
+    """
+
+
+def feature_html(icon, title, text):
+    return f"""
+    <div class="feature-box">
+        <div class="feature-icon">{icon}</div>
+        <h4>{title}</h4>
+        <p>{text}</p>
+    </div>
+    """
+
+
+def program_html(program):
+    lines = ['<div class="course-highlight">', f"<h4>{program['title']}</h4>"]
+    if program["subtitle"]:
+        lines.append(f"<p>{program['subtitle']}</p>")
+    lines.append("<ul>" + "".join(f"<li>{point}</li>" for point in program["points"]) + "</ul>")
+    lines += [f"<strong>{program['fees']}</strong>", "</div>"]
+    return "\n".join(lines)
+
+
+def step_html(number, title, text):
+    return f"""
+    <div class="process-step">
+        <span class="step-number">{number}</span> <strong>{title}</strong>
+        <p>{text}</p>
+    </div>
+    """
+
+
+def cta_html():
+    return f"""
+    <div class="cta-section">
+        <h3>{FINAL_CTA['title']}</h3>
+        <p>{FINAL_CTA['text']}</p>
+    </div>
+    """
@@ -0,0 +1,444 @@
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from profiling import connection_factory
+
+DB_PATH = os.environ.get("ENLIFT_DB_PATH", "enlift_students.db")
+
+# Pragmas applied to every pooled connection
+CONNECTION_PRAGMAS = [
+    # Only takes effect while the file is still empty, so it has to come
+    # before journal_mode; existing databases keep their mode until a VACUUM
+    "PRAGMA auto_vacuum=INCREMENTAL",
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA cache_size=-16000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA foreign_keys=ON",
+]
+
+# Recompute student_stats from scratch (also used by maintenance jobs)
+STATS_REBUILD = [
+    "DELETE FROM student_stats",
+    '''
+    INSERT INTO student_stats (dimension, key, count)
+    SELECT 'course', IFNULL(course, ''), COUNT(*) FROM students GROUP BY 2
+    UNION ALL
+    SELECT 'status', IFNULL(status, ''), COUNT(*) FROM students GROUP BY 2
+    UNION ALL
+    SELECT 'age', IFNULL(age, ''), COUNT(*) FROM students GROUP BY 2
+    UNION ALL
+    SELECT 'day', IFNULL(substr(registration_date, 1, 10), ''), COUNT(*) FROM students GROUP BY 2
+    ''',
+]
+
+# Ordered schema migrations: (version, description, statements).
+# Append new steps at the end; never edit a step that has shipped.
+MIGRATIONS = [
+    (1, "initial schema", [
+        '''
+        CREATE TABLE IF NOT EXISTS students (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            email TEXT NOT NULL UNIQUE,
+            phone TEXT,
+            course TEXT,
+            board TEXT,
+            year INTEGER,
+            age INTEGER,
+            registration_date TIMESTAMP,
+            status TEXT DEFAULT 'pending'
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            recipient TEXT NOT NULL,
+            subject TEXT NOT NULL,
+            body TEXT NOT NULL,
+            status TEXT DEFAULT 'queued',
+            attempts INTEGER DEFAULT 0,
+            last_error TEXT,
+            created_at TIMESTAMP,
+            next_attempt_at TIMESTAMP,
+            sent_at TIMESTAMP
+        )
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (status, next_attempt_at)",
+    ]),
+    (2, "normalise registration_date to sortable ISO text", [
+        # 'YYYY-MM-DD HH:MM:SS.ffffff' compares correctly as text, so day
+        # and week filters become range scans
+        '''
+        UPDATE students SET registration_date = replace(registration_date, 'T', ' ')
+        WHERE registration_date LIKE '%T%'
+        ''',
+    ]),
+    (3, "dashboard indexes", [
+        "CREATE INDEX IF NOT EXISTS idx_students_registration_date ON students (registration_date)",
+        "CREATE INDEX IF NOT EXISTS idx_students_course_date ON students (course, registration_date)",
+        "CREATE INDEX IF NOT EXISTS idx_students_status_date ON students (status, registration_date)",
+        "ANALYZE students",
+    ]),
+    (4, "row version for optimistic concurrency on dashboard edits", [
+        "ALTER TABLE students ADD COLUMN row_version INTEGER NOT NULL DEFAULT 0",
+    ]),
+    (5, "trigger-maintained registration statistics", [
+        '''
+        CREATE TABLE IF NOT EXISTS student_stats (
+            dimension TEXT NOT NULL,
+            key,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (dimension, key)
+        ) WITHOUT ROWID
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS students_stats_insert AFTER INSERT ON students
+        BEGIN
+            INSERT INTO student_stats (dimension, key, count) VALUES
+                ('course', IFNULL(NEW.course, ''), 1),
+                ('status', IFNULL(NEW.status, ''), 1),
+                ('age', IFNULL(NEW.age, ''), 1),
+                ('day', IFNULL(substr(NEW.registration_date, 1, 10), ''), 1)
+            ON CONFLICT (dimension, key) DO UPDATE SET count = count + 1;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS students_stats_delete AFTER DELETE ON students
+        BEGIN
+            UPDATE student_stats SET count = count - 1
+            WHERE (dimension = 'course' AND key = IFNULL(OLD.course, ''))
+               OR (dimension = 'status' AND key = IFNULL(OLD.status, ''))
+               OR (dimension = 'age' AND key = IFNULL(OLD.age, ''))
+               OR (dimension = 'day' AND key = IFNULL(substr(OLD.registration_date, 1, 10), ''));
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS students_stats_update
+        AFTER UPDATE OF course, status, age, registration_date ON students
+        BEGIN
+            UPDATE student_stats SET count = count - 1
+            WHERE (dimension = 'course' AND key = IFNULL(OLD.course, ''))
+               OR (dimension = 'status' AND key = IFNULL(OLD.status, ''))
+               OR (dimension = 'age' AND key = IFNULL(OLD.age, ''))
+               OR (dimension = 'day' AND key = IFNULL(substr(OLD.registration_date, 1, 10), ''));
+            INSERT INTO student_stats (dimension, key, count) VALUES
+                ('course', IFNULL(NEW.course, ''), 1),
+                ('status', IFNULL(NEW.status, ''), 1),
+                ('age', IFNULL(NEW.age, ''), 1),
+                ('day', IFNULL(substr(NEW.registration_date, 1, 10), ''), 1)
+            ON CONFLICT (dimension, key) DO UPDATE SET count = count + 1;
+        END
+        ''',
+    ] + STATS_REBUILD),
+    (6, "full-text search over students and contact messages", [
+        # External-content index over the identity columns of students, kept
+        # current by triggers; course and board already have exact filters
+        '''
+        CREATE VIRTUAL TABLE IF NOT EXISTS students_fts USING fts5(
+            name, email, phone,
+            content='students', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS students_fts_insert AFTER INSERT ON students
+        BEGIN
+            INSERT INTO students_fts (rowid, name, email, phone)
+            VALUES (NEW.id, NEW.name, NEW.email, NEW.phone);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS students_fts_delete AFTER DELETE ON students
+        BEGIN
+            INSERT INTO students_fts (students_fts, rowid, name, email, phone)
+            VALUES ('delete', OLD.id, OLD.name, OLD.email, OLD.phone);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS students_fts_update
+        AFTER UPDATE OF name, email, phone ON students
+        BEGIN
+            INSERT INTO students_fts (students_fts, rowid, name, email, phone)
+            VALUES ('delete', OLD.id, OLD.name, OLD.email, OLD.phone);
+            INSERT INTO students_fts (rowid, name, email, phone)
+            VALUES (NEW.id, NEW.name, NEW.email, NEW.phone);
+        END
+        ''',
+        "INSERT INTO students_fts (students_fts) VALUES ('rebuild')",
+        # Contact messages still live in contacts/*.json; the index keeps
+        # its own copy of the text plus the file it came from
+        '''
+        CREATE VIRTUAL TABLE IF NOT EXISTS contacts_fts USING fts5(
+            name, email, phone, department, message, timestamp UNINDEXED, path UNINDEXED,
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+        ''',
+    ]),
+    (7, "contact messages table", [
+        '''
+        CREATE TABLE IF NOT EXISTS contacts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            email TEXT NOT NULL,
+            phone TEXT,
+            department TEXT,
+            message TEXT NOT NULL,
+            created_at TIMESTAMP NOT NULL,
+            handled INTEGER NOT NULL DEFAULT 0,
+            handled_at TIMESTAMP,
+            source_path TEXT UNIQUE
+        )
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_contacts_created ON contacts (created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_contacts_department_created ON contacts (department, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_contacts_handled_created ON contacts (handled, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_contacts_department_handled_created "
+        "ON contacts (department, handled, created_at)",
+        # Carry over messages indexed from contacts/*.json, then rebuild the
+        # search index as an external-content index over the new table
+        '''
+        INSERT OR IGNORE INTO contacts (name, email, phone, department, message, created_at, source_path)
+        SELECT IFNULL(name, ''), IFNULL(email, ''), phone, department, IFNULL(message, ''),
+               replace(IFNULL(timestamp, datetime('now', 'localtime')), 'T', ' '), path
+        FROM contacts_fts ORDER BY rowid
+        ''',
+        "DROP TABLE contacts_fts",
+        '''
+        CREATE VIRTUAL TABLE contacts_fts USING fts5(
+            name, email, phone, department, message,
+            content='contacts', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS contacts_fts_insert AFTER INSERT ON contacts
+        BEGIN
+            INSERT INTO contacts_fts (rowid, name, email, phone, department, message)
+            VALUES (NEW.id, NEW.name, NEW.email, NEW.phone, NEW.department, NEW.message);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS contacts_fts_delete AFTER DELETE ON contacts
+        BEGIN
+            INSERT INTO contacts_fts (contacts_fts, rowid, name, email, phone, department, message)
+            VALUES ('delete', OLD.id, OLD.name, OLD.email, OLD.phone, OLD.department, OLD.message);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS contacts_fts_update
+        AFTER UPDATE OF name, email, phone, department, message ON contacts
+        BEGIN
+            INSERT INTO contacts_fts (contacts_fts, rowid, name, email, phone, department, message)
+            VALUES ('delete', OLD.id, OLD.name, OLD.email, OLD.phone, OLD.department, OLD.message);
+            INSERT INTO contacts_fts (rowid, name, email, phone, department, message)
+            VALUES (NEW.id, NEW.name, NEW.email, NEW.phone, NEW.department, NEW.message);
+        END
+        ''',
+        "INSERT INTO contacts_fts (contacts_fts) VALUES ('rebuild')",
+    ]),
+    (8, "maintenance job state", [
+        # One row per scheduled job; kept across restarts so intervals hold
+        '''
+        CREATE TABLE IF NOT EXISTS maintenance_jobs (
+            name TEXT PRIMARY KEY,
+            started_at TIMESTAMP,
+            finished_at TIMESTAMP,
+            status TEXT,
+            duration_ms REAL,
+            result TEXT,
+            error TEXT,
+            requested_at TIMESTAMP,
+            request TEXT
+        )
+        ''',
+    ]),
+    (9, "student change log for the dashboard cache", [
+        # Every write to students appends the row id; the AUTOINCREMENT id
+        # is the data version, so caches fetch only what changed since theirs
+        '''
+        CREATE TABLE IF NOT EXISTS student_changes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id INTEGER NOT NULL
+        )
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS students_changes_insert AFTER INSERT ON students
+        BEGIN
+            INSERT INTO student_changes (student_id) VALUES (NEW.id);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS students_changes_update AFTER UPDATE ON students
+        BEGIN
+            INSERT INTO student_changes (student_id) VALUES (NEW.id);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS students_changes_delete AFTER DELETE ON students
+        BEGIN
+            INSERT INTO student_changes (student_id) VALUES (OLD.id);
+        END
+        ''',
+    ]),
+    (10, "durable admission requests", [
+        # Accepted applications, answered with their receipt before the student
+        # row is written; status moves from queued to registered, duplicate or failed
+        '''
+        CREATE TABLE IF NOT EXISTS admission_requests (
+            receipt TEXT PRIMARY KEY,
+            email TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'queued',
+            error TEXT,
+            created_at TIMESTAMP NOT NULL,
+            finished_at TIMESTAMP
+        )
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_admission_requests_status ON admission_requests (status, created_at)",
+    ]),
+    (11, "student clear generation", [
+        # Bumped each time the students table is cleared, so every process
+        # drops the emails it remembers as registered
+        '''
+        CREATE TABLE IF NOT EXISTS student_clears (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            generation INTEGER NOT NULL
+        )
+        ''',
+        "INSERT INTO student_clears (id, generation) VALUES (1, 0) ON CONFLICT (id) DO NOTHING",
+    ]),
+]
+
+
+def schema_version(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at TIMESTAMP
+        )
+    ''')
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+
+# Apply every pending migration, each in its own write transaction
+def migrate(conn):
+    applied = []
+    for version, description, statements in MIGRATIONS:
+        if version <= schema_version(conn):
+            continue
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have applied it while we waited for the lock
+            if version > schema_version(conn):
+                for statement in statements:
+                    conn.execute(statement)
+                conn.execute(
+                    "INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)",
+                    (version, description, datetime.now().isoformat(" ")))
+                applied.append(version)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return applied
+
+
+# Schema bootstrap, run once per process by the pool
+def init_database(conn):
+    return migrate(conn)
+
+
+# Connection pool shared by all Streamlit script threads
+class ConnectionPool:
+    def __init__(self, path=DB_PATH, size=5):
+        self.path = path
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        # Contention counters, read by the benchmarks
+        self.stats = {"acquired": 0, "waited": 0, "wait_seconds": 0.0}
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False, factory=connection_factory())
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def acquire(self):
+        self.stats["acquired"] += 1
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                try:
+                    return self._connect()
+                except Exception:
+                    self._created -= 1
+                    raise
+        # Pool exhausted: wait for another thread to give a connection back
+        started = time.perf_counter()
+        conn = self._idle.get()
+        self.stats["waited"] += 1
+        self.stats["wait_seconds"] += time.perf_counter() - started
+        return conn
+
+    def release(self, conn):
+        # Never hand out a connection with a half-finished transaction
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        with self._lock:
+            while True:
+                try:
+                    self._idle.get_nowait().close()
+                except queue.Empty:
+                    break
+            self._created = 0
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                pool = ConnectionPool()
+                with pool.connection() as conn:
+                    init_database(conn)
+                _pool = pool
+    return _pool
+
+
+# Borrow a pooled connection: `with get_connection() as conn: ...`
+def get_connection():
+    return get_pool().connection()
+
+
+if __name__ == "__main__":
+    with get_connection() as conn:
+        print(f"{DB_PATH}: schema version {schema_version(conn)}")
@@ -0,0 +1,106 @@
+import argparse
+import csv
+import gzip
+import io
+import tempfile
+
+import pandas as pd
+
+from queries import STUDENT_COLUMNS, build_where
+from storage import get_storage
+
+EXPORT_COLUMNS = [column for column in STUDENT_COLUMNS if column != "row_version"]
+CHUNK_SIZE = 5000
+
+# label -> (file extension, mime type)
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "CSV (gzip)": ("csv.gz", "application/gzip"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+
+# Stream matching rows from the cursor, CHUNK_SIZE at a time
+def iter_student_chunks(conn, courses=None, statuses=None, date=None, chunk_size=CHUNK_SIZE):
+    where, params = build_where(courses, statuses, date)
+    cursor = conn.execute(f"SELECT {', '.join(EXPORT_COLUMNS)} FROM students {where} ORDER BY id", params)
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        yield rows
+
+
+def write_csv(out, chunks, compress=False):
+    stream = gzip.GzipFile(fileobj=out, mode="wb") if compress else out
+    text = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+    writer = csv.writer(text)
+    writer.writerow(EXPORT_COLUMNS)
+    for rows in chunks:
+        writer.writerows(rows)
+    text.flush()
+    text.detach()
+    if compress:
+        stream.close()
+
+
+def write_parquet(out, chunks):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("id", pa.int64()),
+        ("name", pa.string()),
+        ("email", pa.string()),
+        ("phone", pa.string()),
+        ("course", pa.string()),
+        ("board", pa.string()),
+        ("year", pa.int64()),
+        ("age", pa.int64()),
+        ("registration_date", pa.timestamp("us")),
+        ("status", pa.string()),
+    ])
+    with pq.ParquetWriter(out, schema, compression="snappy") as writer:
+        for rows in chunks:
+            df = pd.DataFrame.from_records(rows, columns=EXPORT_COLUMNS)
+            df["registration_date"] = pd.to_datetime(df["registration_date"], format="ISO8601")
+            writer.write_table(pa.Table.from_pandas(df, schema=schema, preserve_index=False))
+
+
+# Write the export to an anonymous temp file and return it rewound
+def export_students(conn, fmt="CSV", courses=None, statuses=None, date=None, out=None):
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    out = out or tempfile.TemporaryFile()
+    chunks = iter_student_chunks(conn, courses, statuses, date)
+    if fmt == "Parquet":
+        write_parquet(out, chunks)
+    else:
+        write_csv(out, chunks, compress=fmt == "CSV (gzip)")
+    out.seek(0)
+    return out
+
+
+# Callable for st.download_button: the export only runs when clicked. It
+# returns bytes, since Streamlit reads the whole download into memory anyway
+# and does not accept temp file objects; the temp file bounds memory while
+# the export is written.
+def deferred_export(fmt="CSV", courses=None, statuses=None, date=None):
+    def run():
+        with get_storage().connection() as conn, export_students(conn, fmt, courses, statuses, date) as out:
+            return out.read()
+    return run
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export EnLift student registrations")
+    parser.add_argument("output")
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="CSV")
+    parser.add_argument("--course", action="append")
+    parser.add_argument("--status", action="append")
+    args = parser.parse_args()
+
+    with get_storage().connection() as conn, open(args.output, "wb") as f:
+        export_students(conn, args.format, args.course, args.status, out=f)
+    print(f"Exported students to {args.output}")
@@ -0,0 +1,204 @@
+import argparse
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+JOURNAL_DIR = os.environ.get("ENLIFT_JOURNAL_DIR", "journal")
+SEGMENT_BYTES = 16 * 1024 * 1024
+FSYNC_INTERVAL = 1.0
+FSYNC_BATCH = 100
+
+SEGMENT_PATTERN = "registrations-*.jsonl"
+
+
+def _segment_name(number):
+    return f"registrations-{number:06d}.jsonl"
+
+
+def list_segments(directory=JOURNAL_DIR):
+    return sorted(Path(directory).glob(SEGMENT_PATTERN))
+
+
+# Append-only registration journal.
+# Each record is one JSON line. Lines are flushed to the OS on every append
+# and fsync'd in batches (every FSYNC_BATCH records or FSYNC_INTERVAL seconds),
+# and the active segment is rotated once it grows past SEGMENT_BYTES.
+class Journal:
+    def __init__(self, directory=JOURNAL_DIR, segment_bytes=SEGMENT_BYTES,
+                 fsync_interval=FSYNC_INTERVAL, fsync_batch=FSYNC_BATCH):
+        self.directory = Path(directory)
+        self.segment_bytes = segment_bytes
+        self.fsync_interval = fsync_interval
+        self.fsync_batch = fsync_batch
+        self._lock = threading.Lock()
+        self._unsynced = 0
+        self._closed = threading.Event()
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        segments = list_segments(self.directory)
+        self._segment = int(segments[-1].stem.rsplit("-", 1)[1]) if segments else 1
+        self._file = open(self.directory / _segment_name(self._segment), "ab")
+
+        self._syncer = threading.Thread(target=self._sync_loop, name="journal-fsync", daemon=True)
+        self._syncer.start()
+
+    def append(self, record):
+        line = (json.dumps(record, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+        with self._lock:
+            if self._file.tell() + len(line) > self.segment_bytes and self._file.tell() > 0:
+                self._rotate()
+            self._file.write(line)
+            self._file.flush()
+            self._unsynced += 1
+            if self._unsynced >= self.fsync_batch:
+                self._fsync()
+
+    def _fsync(self):
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def _rotate(self):
+        self._fsync()
+        self._file.close()
+        self._segment += 1
+        self._file = open(self.directory / _segment_name(self._segment), "ab")
+
+    def _sync_loop(self):
+        while not self._closed.wait(self.fsync_interval):
+            self.sync()
+
+    def sync(self):
+        with self._lock:
+            if self._unsynced and not self._file.closed:
+                self._fsync()
+
+    def close(self):
+        self._closed.set()
+        with self._lock:
+            if not self._file.closed:
+                self._fsync()
+                self._file.close()
+
+
+_journal = None
+_journal_lock = threading.Lock()
+
+
+def get_journal():
+    global _journal
+    if _journal is None:
+        with _journal_lock:
+            if _journal is None:
+                _journal = Journal()
+    return _journal
+
+
+# Record builders used by the write paths
+def registration_record(student):
+    return {"op": "register", "ts": time.time(), "student": student}
+
+
+def update_record(email, values):
+    return {"op": "update", "ts": time.time(), "email": email, "values": values}
+
+
+def clear_record():
+    return {"op": "clear", "ts": time.time()}
+
+
+def read_records(directory=JOURNAL_DIR):
+    for segment in list_segments(directory):
+        with open(segment, "rb") as f:
+            for line in f:
+                # A torn final line from a crash mid-append is skipped
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+
+REGISTER_COLUMNS = ["name", "email", "phone", "course", "board", "year", "age", "registration_date"]
+UPDATABLE_COLUMNS = {"phone", "board", "year", "age", "status"}
+
+
+# Rebuild the students table of the storage backend (storage.py) from the
+# journal in a single transaction
+def replay(storage, directory=JOURNAL_DIR, batch_size=5000):
+    insert_sql = f'''
+        INSERT INTO students ({', '.join(REGISTER_COLUMNS)})
+        VALUES ({', '.join('?' * len(REGISTER_COLUMNS))})
+        ON CONFLICT (email) DO NOTHING
+    '''
+    pending = []
+    counts = {"register": 0, "update": 0, "clear": 0}
+
+    with storage.transaction() as conn:
+        def flush():
+            if pending:
+                conn.executemany(insert_sql, pending)
+                pending.clear()
+
+        conn.execute("DELETE FROM students")
+        # Emails remembered as registered may be gone now
+        storage.students.mark_cleared(conn)
+        for record in read_records(directory):
+            op = record.get("op")
+            if op == "register":
+                student = record["student"]
+                student["registration_date"] = str(student.get("registration_date", "")).replace("T", " ")
+                pending.append([student.get(column) for column in REGISTER_COLUMNS])
+                if len(pending) >= batch_size:
+                    flush()
+            elif op == "update":
+                flush()
+                values = {k: v for k, v in record["values"].items() if k in UPDATABLE_COLUMNS}
+                if values:
+                    conn.execute(
+                        f"UPDATE students SET {', '.join(f'{k}=?' for k in values)} WHERE email=?",
+                        list(values.values()) + [record["email"]])
+            elif op == "clear":
+                pending.clear()
+                conn.execute("DELETE FROM students")
+            else:
+                continue
+            counts[op] += 1
+        flush()
+    return counts
+
+
+# One-off import of the old per-student JSON backups into the journal
+def import_legacy_backups(journal, directory="students"):
+    imported = 0
+    for path in sorted(Path(directory).glob("*.json")):
+        with open(path) as f:
+            student = json.load(f)
+        if student.get("email"):
+            journal.append(registration_record(student))
+            imported += 1
+    journal.sync()
+    return imported
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="EnLift registration journal tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("replay", help="rebuild the students table from the journal")
+    commands.add_parser("import-legacy", help="append students/*.json backups to the journal")
+    commands.add_parser("info", help="list journal segments")
+    args = parser.parse_args()
+
+    if args.command == "replay":
+        from storage import get_storage
+
+        started = time.perf_counter()
+        counts = replay(get_storage())
+        print(f"Replayed {counts} in {time.perf_counter() - started:.2f}s")
+    elif args.command == "import-legacy":
+        journal = get_journal()
+        print(f"Imported {import_legacy_backups(journal)} backup files")
+        journal.close()
+    else:
+        for segment in list_segments():
+            print(f"{segment.name}\t{segment.stat().st_size} bytes")
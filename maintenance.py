@@ -0,0 +1,373 @@
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+import zipfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from contacts import CONTACTS_DIR, import_contact_files
+from database import get_pool
+from storage import get_storage
+
+EMAILS_DIR = "emails"
+ARCHIVE_DIR = os.environ.get("ENLIFT_ARCHIVE_DIR", "archive")
+
+HOUR = 3600
+DAY = 24 * HOUR
+STARTUP_DELAY = 30
+POLL_INTERVAL = 60
+# A job still marked running after this long is assumed to have died with its process
+LEASE_TIMEOUT = 2 * HOUR
+
+DELETE_BATCH = 500
+BATCH_PAUSE = 0.05
+VACUUM_STEP_PAGES = 256
+VACUUM_MIN_FREE_PAGES = 1024
+ANALYSIS_LIMIT = 1000
+ARCHIVE_AFTER_DAYS = 30
+ARCHIVE_BATCH = 1000
+
+OUTBOX_SENT_RETENTION_DAYS = 30
+OUTBOX_FAILED_RETENTION_DAYS = 90
+HANDLED_CONTACT_RETENTION_DAYS = 365
+# Receipts are only polled while the applicant waits on the admission page
+SETTLED_ADMISSION_RETENTION_DAYS = 7
+# Dashboard caches further behind than this reload in full (student_cache.py)
+STUDENT_CHANGES_KEEP = 100000
+
+
+def _now():
+    return datetime.now().isoformat(" ")
+
+
+def _days_ago(days):
+    return (datetime.now() - timedelta(days=days)).isoformat(" ")
+
+
+# Short write transactions with a pause in between, so admissions and
+# dashboard edits never wait long for the write lock
+def _delete_in_batches(storage, stop, table, where, params, key="id"):
+    deleted = 0
+    with storage.connection() as conn:
+        while not stop.is_set():
+            cursor = conn.execute(
+                f"DELETE FROM {table} WHERE {key} IN (SELECT {key} FROM {table} {where} LIMIT ?)",
+                params + [DELETE_BATCH])
+            conn.commit()
+            deleted += cursor.rowcount
+            if cursor.rowcount < DELETE_BATCH:
+                break
+            stop.wait(BATCH_PAUSE)
+    return deleted
+
+
+# Jobs: job(storage, stop, **request) -> result dict shown on the Diagnostics
+# page. They work on the storage backend (storage.py); only the job state
+# below lives in the local SQLite file.
+def prune_retention(storage, stop):
+    with storage.connection() as conn:
+        last_change = conn.execute("SELECT COALESCE(MAX(id), 0) FROM student_changes").fetchone()[0]
+    return {
+        "outbox_sent": _delete_in_batches(storage, stop, "outbox", "WHERE status = 'sent' AND sent_at < ?",
+                                          [_days_ago(OUTBOX_SENT_RETENTION_DAYS)]),
+        "outbox_failed": _delete_in_batches(storage, stop, "outbox", "WHERE status = 'failed' AND created_at < ?",
+                                            [_days_ago(OUTBOX_FAILED_RETENTION_DAYS)]),
+        "contacts_handled": _delete_in_batches(storage, stop, "contacts", "WHERE handled = 1 AND created_at < ?",
+                                               [_days_ago(HANDLED_CONTACT_RETENTION_DAYS)]),
+        "student_changes": _delete_in_batches(storage, stop, "student_changes", "WHERE id <= ?",
+                                              [last_change - STUDENT_CHANGES_KEEP]),
+        "admission_requests": _delete_in_batches(
+            storage, stop, "admission_requests",
+            "WHERE status IN ('registered', 'duplicate', 'failed') AND created_at < ?",
+            [_days_ago(SETTLED_ADMISSION_RETENTION_DAYS)], key="receipt"),
+    }
+
+
+# "Clear Old Data" from the dashboard: every student up to the newest id at request time
+def clear_students(storage, stop, up_to_id):
+    deleted = _delete_in_batches(storage, stop, "students", "WHERE id <= ?", [up_to_id])
+    if not stop.is_set():
+        # Only now are the cleared emails free to register again; every
+        # admission service drops its known emails on the next check
+        with storage.transaction() as conn:
+            storage.students.mark_cleared(conn)
+    return {"students": deleted}
+
+
+def refresh_stats(storage, stop):
+    storage.rebuild_stats()
+    with storage.connection() as conn:
+        return {"stat_rows": conn.execute("SELECT COUNT(*) FROM student_stats").fetchone()[0]}
+
+
+# optimize and incremental_vacuum tune the SQLite file; PostgreSQL has autovacuum
+POSTGRES_SKIPPED = {"skipped": "PostgreSQL storage: autovacuum analyzes and vacuums"}
+
+
+def optimize(storage, stop):
+    if storage.name != "sqlite":
+        return POSTGRES_SKIPPED
+    with storage.connection() as conn:
+        # executescript steps each pragma to completion; execute() stops after one row
+        if sqlite3.sqlite_version_info >= (3, 46, 0):
+            conn.executescript(f"PRAGMA analysis_limit={ANALYSIS_LIMIT}; PRAGMA optimize=0x10002; "
+                               "PRAGMA analysis_limit=0;")
+        else:
+            # Older optimize only considers tables this connection has queried
+            conn.executescript(f"PRAGMA analysis_limit={ANALYSIS_LIMIT}; ANALYZE; PRAGMA analysis_limit=0;")
+    return {"sqlite": sqlite3.sqlite_version}
+
+
+def incremental_vacuum(storage, stop):
+    if storage.name != "sqlite":
+        return POSTGRES_SKIPPED
+    with storage.connection() as conn:
+        free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            return {"free_pages": free, "skipped": "auto_vacuum is not incremental; "
+                                                   "run python maintenance.py --enable-incremental-vacuum"}
+        released = 0
+        while free >= VACUUM_MIN_FREE_PAGES and not stop.is_set():
+            conn.executescript(f"PRAGMA incremental_vacuum({VACUUM_STEP_PAGES});")
+            remaining = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            if remaining >= free:
+                break
+            released += free - remaining
+            free = remaining
+            stop.wait(BATCH_PAUSE)
+    return {"released_pages": released, "free_pages": free}
+
+
+# Move files older than the cutoff into one zip per month, then remove them.
+# A file already in the archive (a run interrupted before the unlink) is not added twice.
+def archive_files(directory, pattern, prefix, cutoff, stop, archive_dir=ARCHIVE_DIR):
+    old = [path for path in sorted(Path(directory).glob(pattern)) if path.stat().st_mtime < cutoff]
+    by_month = {}
+    for path in old[:ARCHIVE_BATCH]:
+        month = datetime.fromtimestamp(path.stat().st_mtime).strftime("%Y-%m")
+        by_month.setdefault(month, []).append(path)
+
+    archived = 0
+    for month, paths in sorted(by_month.items()):
+        if stop.is_set():
+            break
+        Path(archive_dir).mkdir(parents=True, exist_ok=True)
+        archive = Path(archive_dir) / f"{prefix}-{month}.zip"
+        with zipfile.ZipFile(archive, "a", compression=zipfile.ZIP_DEFLATED) as zf:
+            names = set(zf.namelist())
+            for path in paths:
+                if path.name not in names:
+                    zf.write(path, path.name)
+        with open(archive, "rb") as f:
+            os.fsync(f.fileno())
+        for path in paths:
+            path.unlink(missing_ok=True)
+        archived += len(paths)
+    return archived
+
+
+def compact_archives(storage, stop):
+    cutoff = time.time() - ARCHIVE_AFTER_DAYS * DAY
+    # Legacy message files are imported (idempotently) before any of them is archived
+    imported = 0
+    if Path(CONTACTS_DIR).is_dir():
+        imported = import_contact_files(storage, CONTACTS_DIR)
+    return {
+        "contacts_imported": imported,
+        "emails_archived": archive_files(EMAILS_DIR, "*.txt", "emails", cutoff, stop),
+        "contacts_archived": archive_files(CONTACTS_DIR, "*.json", "contacts", cutoff, stop),
+    }
+
+
+# name: (interval in seconds, or None for jobs that only run on request, job)
+# Run in this order, so the vacuum picks up pages freed by pruning
+JOBS = {
+    "prune_retention": (HOUR, prune_retention),
+    "clear_students": (None, clear_students),
+    "compact_archives": (DAY, compact_archives),
+    "refresh_stats": (DAY, refresh_stats),
+    "optimize": (6 * HOUR, optimize),
+    "incremental_vacuum": (DAY, incremental_vacuum),
+}
+
+
+# In-process scheduler thread. Last-run state lives in maintenance_jobs, so
+# intervals survive restarts and a job claimed by one process is skipped by
+# others. That table is always in the SQLite pool; the jobs get the storage.
+class MaintenanceScheduler:
+    def __init__(self, pool, storage, jobs=JOBS):
+        self.pool = pool
+        self.storage = storage
+        self.jobs = jobs
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="maintenance-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def wake(self):
+        self._wake.set()
+
+    def _run(self):
+        # Let the app finish starting before the first pass
+        self._wake.wait(STARTUP_DELAY)
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                self.run_due()
+            except sqlite3.Error:
+                # Database busy or unavailable; state is re-read on the next pass
+                pass
+            self._wake.wait(POLL_INTERVAL)
+
+    def run_due(self, names=None):
+        ran = []
+        for name in self.jobs:
+            if self._stop.is_set():
+                break
+            if names is not None and name not in names:
+                continue
+            claim = self._claim(name)
+            if claim is not None:
+                self._execute(name, *claim)
+                ran.append(name)
+        return ran
+
+    def _claim(self, name):
+        interval = self.jobs[name][0]
+        now = datetime.now()
+        with self.pool.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT started_at, finished_at, requested_at, request FROM maintenance_jobs WHERE name = ?",
+                    (name,)).fetchone()
+                started_at, finished_at, requested_at, request = row or (None, None, None, None)
+                running = (started_at is not None and (finished_at is None or finished_at < started_at)
+                           and started_at > (now - timedelta(seconds=LEASE_TIMEOUT)).isoformat(" "))
+                due = requested_at is not None or (interval is not None and (
+                    finished_at is None or finished_at <= (now - timedelta(seconds=interval)).isoformat(" ")))
+                if running or not due:
+                    conn.rollback()
+                    return None
+                conn.execute('''
+                    INSERT INTO maintenance_jobs (name, started_at, status) VALUES (?, ?, 'running')
+                    ON CONFLICT (name) DO UPDATE SET started_at = excluded.started_at, status = 'running'
+                ''', (name, now.isoformat(" ")))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        return requested_at, json.loads(request) if request else {}
+
+    def _execute(self, name, requested_at, request):
+        started = time.perf_counter()
+        result, error = None, None
+        try:
+            result = self.jobs[name][1](self.storage, self._stop, **request)
+            status = "interrupted" if self._stop.is_set() else "ok"
+        except Exception as e:
+            status, error = "failed", f"{type(e).__name__}: {e}"
+        with self.pool.connection() as conn:
+            conn.execute('''
+                UPDATE maintenance_jobs SET finished_at = ?, status = ?, duration_ms = ?, result = ?, error = ?
+                WHERE name = ?
+            ''', (_now(), status, round((time.perf_counter() - started) * 1000, 1),
+                  json.dumps(result) if result is not None else None, error, name))
+            # An interrupted request is retried; one made while the job ran is kept
+            if status != "interrupted":
+                conn.execute(
+                    "UPDATE maintenance_jobs SET requested_at = NULL, request = NULL WHERE name = ? AND requested_at IS ?",
+                    (name, requested_at))
+            conn.commit()
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+# One scheduler per process, started lazily by the app
+def start_scheduler():
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                scheduler = MaintenanceScheduler(get_pool(), get_storage())
+                scheduler.start()
+                _scheduler = scheduler
+    return _scheduler
+
+
+# Ask for a job to run on the next scheduler pass; the caller never waits for it
+def request_job(name, **request):
+    if name not in JOBS:
+        raise KeyError(f"Unknown maintenance job: {name}")
+    with get_pool().connection() as conn:
+        conn.execute('''
+            INSERT INTO maintenance_jobs (name, requested_at, request) VALUES (?, ?, ?)
+            ON CONFLICT (name) DO UPDATE SET requested_at = excluded.requested_at, request = excluded.request
+        ''', (name, _now(), json.dumps(request)))
+        conn.commit()
+    if _scheduler is not None:
+        _scheduler.wake()
+
+
+def job_states(conn):
+    rows = {row[0]: row for row in conn.execute('''
+        SELECT name, status, started_at, finished_at, duration_ms, result, error, requested_at
+        FROM maintenance_jobs
+    ''')}
+    states = []
+    for name, (interval, _) in JOBS.items():
+        _, status, started_at, finished_at, duration_ms, result, error, requested_at = rows.get(name, (None,) * 8)
+        states.append({
+            "job": name,
+            "every": f"{interval // HOUR} h" if interval else "on request",
+            "status": status or "never run",
+            "requested": requested_at is not None,
+            "last_started": started_at,
+            "last_finished": finished_at,
+            "duration_ms": duration_ms,
+            "result": result or error
+        })
+    return states
+
+
+# One-off switch of an existing database to incremental auto-vacuum. This is a
+# full VACUUM that blocks writers, so run it with the app stopped.
+def enable_incremental_vacuum(conn):
+    conn.executescript("PRAGMA auto_vacuum=INCREMENTAL; VACUUM;")
+    return conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run and inspect EnLift maintenance jobs")
+    parser.add_argument("--run", nargs="+", metavar="JOB",
+                        choices=[name for name, (interval, _) in JOBS.items() if interval is not None],
+                        help="run these jobs now, in the foreground")
+    parser.add_argument("--enable-incremental-vacuum", action="store_true",
+                        help="convert the database to auto_vacuum=INCREMENTAL (full VACUUM)")
+    args = parser.parse_args()
+
+    pool = get_pool()
+    if args.enable_incremental_vacuum:
+        with pool.connection() as conn:
+            print("auto_vacuum=INCREMENTAL" if enable_incremental_vacuum(conn) else "VACUUM did not change auto_vacuum")
+    if args.run:
+        for name in args.run:
+            request_job(name)
+        print(f"Ran {MaintenanceScheduler(pool, get_storage()).run_due(args.run)}")
+    with pool.connection() as conn:
+        for state in job_states(conn):
+            print(f"{state['job']:<20} {state['status']:<12} {state['last_finished'] or '-':<28} {state['result'] or ''}")
@@ -0,0 +1,212 @@
+import os
+import smtplib
+import threading
+from datetime import datetime, timedelta
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+from pathlib import Path
+
+from storage import get_storage
+
+# Email configuration
+EMAIL_CONFIG = {
+    'transport': os.environ.get("ENLIFT_EMAIL_TRANSPORT", "file"),
+    'smtp_server': os.environ.get("ENLIFT_SMTP_SERVER", "smtp.gmail.com"),
+    'smtp_port': int(os.environ.get("ENLIFT_SMTP_PORT", "587")),
+    'use_tls': os.environ.get("ENLIFT_SMTP_TLS", "1") == "1",
+    'sender_email': 'admissions@enlift-institute.com',
+    'sender_password': os.environ.get("ENLIFT_SMTP_PASSWORD", "")
+}
+
+BATCH_SIZE = 20
+POLL_INTERVAL = 5
+IDLE_DISCONNECT = 60
+MAX_ATTEMPTS = 5
+RETRY_BASE_DELAY = 30
+# Seconds a claimed batch stays reserved for its worker; longer than a batch
+# of SMTP timeouts, after which a dead worker's messages are sent again
+SEND_LEASE = 15 * 60
+
+
+def welcome_email(student_name, course):
+    subject = 'Welcome to EnLift-Institute!'
+    body = f"""
+        Dear {student_name},
+
+        Welcome to EnLift-Institute! 🎉
+
+        Thank you for registering for our {course} course.
+
+        Your registration has been received and is currently being processed.
+
+        Here's what happens next:
+        1. Our team will contact you within 24 hours
+        2. You'll receive course access details
+        3. Schedule your orientation session
+
+        If you have any questions, please contact us at:
+        📧 admissions@enlift-institute.com
+        📞 +91 9876543210
+
+        Best regards,
+        EnLift-Institute Team
+        """
+    return subject, body
+
+
+# Queue a message through storage.outbox; the caller owns the transaction
+def enqueue_welcome_email(storage, conn, student_email, student_name, course):
+    subject, body = welcome_email(student_name, course)
+    return storage.outbox.enqueue(conn, student_email, subject, body)
+
+
+# Transports
+class FileTransport:
+    # Demo delivery: write each message to the emails/ directory
+    def __init__(self, directory="emails"):
+        self.directory = Path(directory)
+
+    def send(self, sender, recipient, subject, body):
+        self.directory.mkdir(exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        with open(self.directory / f"{recipient}_{stamp}.txt", 'w') as f:
+            f.write(f"To: {recipient}\nSubject: {subject}\n\n{body}")
+
+    def close(self):
+        pass
+
+
+class SMTPTransport:
+    # Keeps one SMTP session open and reuses it for every message
+    def __init__(self, config):
+        self.config = config
+        self._smtp = None
+
+    def _connect(self):
+        smtp = smtplib.SMTP(self.config['smtp_server'], self.config['smtp_port'], timeout=30)
+        if self.config.get('use_tls', True):
+            smtp.starttls()
+        if self.config.get('sender_password'):
+            smtp.login(self.config['sender_email'], self.config['sender_password'])
+        self._smtp = smtp
+
+    def send(self, sender, recipient, subject, body):
+        msg = MIMEMultipart()
+        msg['From'] = sender
+        msg['To'] = recipient
+        msg['Subject'] = subject
+        msg.attach(MIMEText(body, 'plain'))
+
+        if self._smtp is None:
+            self._connect()
+        try:
+            self._smtp.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            # Server dropped the idle session; reconnect once and retry
+            self._connect()
+            self._smtp.send_message(msg)
+
+    def close(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._smtp = None
+
+
+def make_transport(config=EMAIL_CONFIG):
+    if config['transport'] == "smtp":
+        return SMTPTransport(config)
+    return FileTransport()
+
+
+# Background worker draining the outbox
+class OutboxWorker:
+    def __init__(self, storage, transport, sender=EMAIL_CONFIG['sender_email']):
+        self.storage = storage
+        self.transport = transport
+        self.sender = sender
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="outbox-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def wake(self):
+        self._wake.set()
+
+    def _run(self):
+        idle_since = None
+        while not self._stop.is_set():
+            sent = self.drain()
+            if sent:
+                idle_since = None
+            elif idle_since is None:
+                idle_since = datetime.now()
+            elif (datetime.now() - idle_since).total_seconds() > IDLE_DISCONNECT:
+                self.transport.close()
+            self._wake.wait(POLL_INTERVAL)
+            self._wake.clear()
+        self.transport.close()
+
+    # Send every due message, batch by batch, over the same session. Each
+    # batch is claimed first, so workers in other processes never send the
+    # same message.
+    def drain(self):
+        processed = 0
+        while not self._stop.is_set():
+            with self.storage.transaction() as conn:
+                rows = self.storage.outbox.claim(conn, BATCH_SIZE, datetime.now() + timedelta(seconds=SEND_LEASE))
+            if not rows:
+                break
+            for message_id, recipient, subject, body, attempts in rows:
+                self._deliver(message_id, recipient, subject, body, attempts)
+                processed += 1
+        return processed
+
+    # Commit per message so the write lock is never held across an SMTP round-trip
+    def _deliver(self, message_id, recipient, subject, body, attempts):
+        attempts += 1
+        try:
+            self.transport.send(self.sender, recipient, subject, body)
+        except Exception as e:
+            self.transport.close()
+            with self.storage.transaction() as conn:
+                if attempts >= MAX_ATTEMPTS:
+                    self.storage.outbox.mark_failed(conn, message_id, attempts, str(e))
+                else:
+                    retry_at = datetime.now() + timedelta(seconds=RETRY_BASE_DELAY * 2 ** (attempts - 1))
+                    self.storage.outbox.mark_retry(conn, message_id, attempts, str(e), retry_at)
+        else:
+            with self.storage.transaction() as conn:
+                self.storage.outbox.mark_sent(conn, message_id, attempts)
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+# One worker per process, started lazily by the app
+def start_worker():
+    global _worker
+    if _worker is None:
+        with _worker_lock:
+            if _worker is None:
+                worker = OutboxWorker(get_storage(), make_transport())
+                worker.start()
+                _worker = worker
+    return _worker
+
+
+def notify_worker():
+    if _worker is not None:
+        _worker.wake()
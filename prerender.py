@@ -0,0 +1,295 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import textwrap
+from html import escape
+from pathlib import Path
+from urllib.parse import urlencode
+
+import content
+from assets import STATIC_DIR, STYLESHEET_PATH, minify_css
+from catalog import get_catalog
+
+SITE_DIR = os.environ.get("ENLIFT_SITE_DIR", "site")
+APP_URL = os.environ.get("ENLIFT_APP_URL", "http://localhost:8501/")
+SITE_STYLESHEET_PATH = STATIC_DIR / "site.css"
+ICONS = ["icon-192.png", "icon-512.png"]
+
+# Cache-first service worker. The cache name carries a hash of every built
+# file, so a rebuild with any change installs a fresh cache and drops the old.
+SERVICE_WORKER = """const CACHE = "enlift-__VERSION__";
+const PRECACHE = __PRECACHE__;
+
+self.addEventListener("install", event => {
+    event.waitUntil(caches.open(CACHE).then(cache => cache.addAll(PRECACHE)).then(() => self.skipWaiting()));
+});
+
+self.addEventListener("activate", event => {
+    event.waitUntil(caches.keys()
+        .then(keys => Promise.all(keys.filter(key => key.startsWith("enlift-") && key !== CACHE)
+            .map(key => caches.delete(key))))
+        .then(() => self.clients.claim()));
+});
+
+// Only the snapshot files are served from the cache; forms, the admin area and
+// the Streamlit websocket always go to the network.
+self.addEventListener("fetch", event => {
+    const url = new URL(event.request.url);
+    const path = url.pathname === "/" ? "/index.html" : url.pathname;
+    if (event.request.method !== "GET" || url.origin !== location.origin || !PRECACHE.includes(path)) {
+        return;
+    }
+    event.respondWith(caches.open(CACHE)
+        .then(cache => cache.match(path, {ignoreSearch: true}))
+        .then(hit => hit || fetch(event.request)));
+});
+"""
+
+REGISTER_SCRIPT = """<script>
+if ("serviceWorker" in navigator) {
+    window.addEventListener("load", () => navigator.serviceWorker.register("/sw.js"));
+}
+</script>"""
+
+# Snapshot files, or Streamlit pages reached through a deep link
+NAV = [
+    ("index.html", "🏠 Home"),
+    ("courses.html", "📚 Courses"),
+    ("Admission", "🎯 Admission"),
+    ("about.html", "👥 About Us"),
+    ("contact.html", "📞 Contact Us"),
+    ("Admin Login", "🔐 Admin Login")
+]
+
+
+def app_link(page, **params):
+    return APP_URL + "?" + urlencode(dict(page=page, **params))
+
+
+# Just enough markdown for the content strings: headings, paragraphs,
+# hard line breaks, **bold** and *italic*
+def markdown_html(text):
+    blocks = []
+    for block in re.split(r"\n\s*\n", textwrap.dedent(text).strip()):
+        lines = block.split("\n")
+        heading = re.match(r"(#{1,6}) (.*)", lines[0])
+        if heading:
+            level = len(heading.group(1))
+            blocks.append(f"<h{level}>{_inline(heading.group(2))}</h{level}>")
+            lines = lines[1:]
+        if lines:
+            body = "".join(
+                _inline(line.rstrip()) + ("<br>\n" if line.endswith("  ") else "\n") for line in lines)
+            blocks.append(f"<p>{body.strip()}</p>")
+    return "\n".join(blocks)
+
+
+def _inline(text):
+    text = re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", text)
+    return re.sub(r"\*(.+?)\*", r"<em>\1</em>", text)
+
+
+def columns(cells, count):
+    inner = "".join(f"<div>{cell}</div>" for cell in cells)
+    return f'<div class="columns" style="--cols: {count}">{inner}</div>'
+
+
+def button(label, href, primary=False):
+    return f'<a class="button{" primary" if primary else ""}" href="{escape(href)}">{label}</a>'
+
+
+def home_body():
+    return "\n".join([
+        content.hero_html(),
+        '<div class="button-row">'
+        + button("📚 View Courses", "/courses.html", primary=True)
+        + button("🎯 Admission Process", app_link("Admission"))
+        + button("📞 Contact Institute", "/contact.html")
+        + "</div>",
+        "<hr>",
+        columns([content.stat_html(num, text) for num, text in content.TRUST_STATS], 3),
+        "<hr>",
+        "<h2>✨ Why Students Choose EnLift</h2>",
+        columns([content.feature_html(*feature) for feature in content.FEATURES], 3),
+        "<hr>",
+        "<h2>🎓 Programs Offered</h2>",
+        columns([content.program_html(program) for program in content.PROGRAMS], 2),
+        "<hr>",
+        "<h2>📈 How Learning Happens</h2>",
+        "".join(content.step_html(*step) for step in content.LEARNING_STEPS),
+        "<hr>",
+        content.cta_html(),
+        '<div class="button-row">'
+        + button("🎯 Apply for Admission", app_link("Admission"), primary=True)
+        + button("📚 Explore Courses", "/courses.html")
+        + "</div>"
+    ])
+
+
+def _course_row(heading, lines, course):
+    return (
+        '<div class="course-row"><div>'
+        + f"<h3>{heading}</h3>"
+        + "".join(f"<p>{_inline(line)}</p>" for line in lines)
+        + f'</div><div><h3>{course["fee"]}</h3>'
+        + button("Enroll Now", app_link("Admission", course=course["id"]))
+        + "</div></div>"
+    )
+
+
+def courses_body():
+    catalog = get_catalog()
+    parts = [
+        "<h1>📚 Our Courses</h1>",
+        markdown_html(content.COURSES_INTRO),
+        "<h2>🎒 School Programs (Classes VIII – XII)</h2>",
+        markdown_html(content.SCHOOL_INTRO)
+    ]
+    for board in catalog.boards:
+        parts.append(f"<h3>{board}</h3>")
+        for course in catalog.by_board[board]:
+            parts.append(_course_row(course["name"], [
+                f"**Applicable Class:** {course['grade']}",
+                f"📝 {course['description']}"
+            ], course))
+
+    parts.append("<h2>🎓 College Programs</h2>")
+    for program in catalog.programs:
+        parts.append(f"<h3>{program['name']}</h3>")
+        for course in catalog.by_program[program["name"]]:
+            parts.append(_course_row(f"{program['name']} – {course['name']}", [
+                f"**{course['title']}**",
+                f"📚 {course['description']}"
+            ], course))
+    return "\n".join(parts)
+
+
+def about_body():
+    values = "".join(
+        f"<p><strong>{icon} {title}</strong><br><small>{desc}</small></p>"
+        for icon, title, desc in content.VALUES)
+    return "\n".join([
+        "<h1>👥 About EnLift-Institute</h1>",
+        markdown_html(content.MISSION),
+        columns([
+            "<h3>📜 Our Story</h3>" + markdown_html(content.STORY),
+            "<h3>🎯 Our Values</h3>" + values
+        ], 2)
+    ])
+
+
+def contact_body():
+    return "\n".join([
+        "<h1>📞 Contact Us</h1>",
+        columns([
+            "<h3>📍 Our Address</h3>" + markdown_html(content.ADDRESS)
+            + "<h3>📱 Contact Information</h3>" + markdown_html(content.CONTACT_INFO)
+            + "<h3>🕒 Office Hours</h3>" + markdown_html(content.OFFICE_HOURS),
+            "<h3>✉️ Send us a Message</h3>"
+            + "<p>Questions about courses, fees or admissions? Write to us and we'll respond within 24 hours.</p>"
+            + button("✉️ Open the contact form", app_link("Contact Us"), primary=True)
+        ], 2)
+    ])
+
+
+PAGES = [
+    ("index.html", "Home", home_body),
+    ("courses.html", "Courses", courses_body),
+    ("about.html", "About Us", about_body),
+    ("contact.html", "Contact Us", contact_body)
+]
+
+
+def footer_html():
+    quick_links = "".join(
+        f'<p><a href="{href}">{label}</a></p>'
+        for href, label in [("/index.html", "Home"), ("/courses.html", "Courses"),
+                            (app_link("Admission"), "Admissions")])
+    return "<hr>" + columns([
+        f"<h3>{content.SITE_NAME}</h3>" + markdown_html(content.FOOTER_ABOUT),
+        "<p><strong>Quick Links</strong></p>" + quick_links,
+        "<p><strong>Resources</strong></p>" + "".join(f"<p>{item}</p>" for item in content.FOOTER_RESOURCES),
+        "<p><strong>Legal</strong></p>" + "".join(f"<p>{item}</p>" for item in content.FOOTER_LEGAL)
+    ], 4) + f"<hr><p>{content.COPYRIGHT}</p>"
+
+
+def render_page(filename, title, body, css_version):
+    nav = "".join(
+        f'<a href="{escape("/" + target if target.endswith(".html") else app_link(target))}"'
+        + (' class="active"' if target == filename else "") + f">{label}</a>"
+        for target, label in NAV)
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title} | EnLift-Institute | Computer Science Coaching</title>
+<meta name="theme-color" content="#4F46E5">
+<link rel="manifest" href="/manifest.json">
+<link rel="icon" type="image/png" href="/icon-192.png">
+<link rel="stylesheet" href="/enlift.min.css?v={css_version}">
+</head>
+<body>
+<nav class="site-nav"><span class="brand">🚀 EnLift-Institute</span>{nav}</nav>
+<main>
+{body}
+</main>
+<footer class="site-footer">{footer_html()}</footer>
+{REGISTER_SCRIPT}
+</body>
+</html>
+"""
+
+
+def _version(files):
+    digest = hashlib.sha256()
+    for name in sorted(files):
+        digest.update(name.encode())
+        digest.update(files[name])
+    return digest.hexdigest()[:12]
+
+
+# Render the marketing pages, stylesheet, manifest, icons and service worker
+def build(output=SITE_DIR):
+    files = {}
+    css = minify_css(STYLESHEET_PATH.read_text(encoding="utf-8")
+                     + SITE_STYLESHEET_PATH.read_text(encoding="utf-8")).encode("utf-8")
+    files["enlift.min.css"] = css
+    css_version = hashlib.sha256(css).hexdigest()[:12]
+
+    for filename, title, body in PAGES:
+        files[filename] = render_page(filename, title, body(), css_version).encode("utf-8")
+
+    manifest = json.loads((STATIC_DIR / "manifest.json").read_text(encoding="utf-8"))
+    for icon in manifest["icons"]:
+        icon["src"] = "/" + Path(icon["src"]).name
+    files["manifest.json"] = json.dumps(manifest, indent=2, ensure_ascii=False).encode("utf-8")
+    for icon in ICONS:
+        files[icon] = (STATIC_DIR / icon).read_bytes()
+
+    version = _version(files)
+    precache = ["/" + name for name in sorted(files)]
+    files["sw.js"] = (SERVICE_WORKER.replace("__VERSION__", version)
+                      .replace("__PRECACHE__", json.dumps(precache))).encode("utf-8")
+
+    output = Path(output)
+    if output.exists():
+        shutil.rmtree(output)
+    output.mkdir(parents=True)
+    for name, data in files.items():
+        (output / name).write_bytes(data)
+    return version, sorted(files)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-render the EnLift marketing pages as a static PWA")
+    parser.add_argument("--output", default=SITE_DIR)
+    parser.add_argument("--app-url", default=APP_URL, help="Streamlit app URL for forms and deep links")
+    args = parser.parse_args()
+
+    APP_URL = args.app_url
+    version, names = build(args.output)
+    print(f"Built {len(names)} files into {args.output} (cache version {version})")
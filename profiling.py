@@ -0,0 +1,185 @@
+import functools
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+PROFILING_ENABLED = os.environ.get("ENLIFT_PROFILING", "1") == "1"
+PROFILE_LOG = os.environ.get("ENLIFT_PROFILE_LOG")
+HISTORY_SIZE = 500
+
+_local = threading.local()
+_history = deque(maxlen=HISTORY_SIZE)
+_log_lock = threading.Lock()
+
+
+# Everything measured during one script (or fragment) rerun
+class RunProfile:
+    def __init__(self, name):
+        self.name = name
+        self.started_at = datetime.now()
+        self.started = time.perf_counter()
+        self.duration = None
+        self.sections = []
+        self.sql_statements = 0
+        self.rows_fetched = 0
+        self.frames = []
+        self._depth = 0
+
+    def as_dict(self):
+        return {
+            "run": self.name,
+            "started_at": self.started_at.isoformat(timespec="milliseconds"),
+            "duration_ms": round(self.duration * 1000, 2) if self.duration is not None else None,
+            "sql_statements": self.sql_statements,
+            "rows_fetched": self.rows_fetched,
+            "sections": self.sections,
+            "frames": self.frames,
+        }
+
+
+def current_run():
+    return getattr(_local, "run", None)
+
+
+def start_run(name):
+    if not PROFILING_ENABLED:
+        return None
+    _local.run = RunProfile(name)
+    return _local.run
+
+
+def name_run(name):
+    run = current_run()
+    if run is not None:
+        run.name = name
+
+
+def finish_run():
+    run = current_run()
+    if run is None:
+        return None
+    _local.run = None
+    run.duration = time.perf_counter() - run.started
+    record = run.as_dict()
+    _history.append(record)
+    if PROFILE_LOG:
+        with _log_lock, open(PROFILE_LOG, "a") as f:
+            f.write(json.dumps(record) + "\n")
+    return record
+
+
+# Time a named part of the current run; a no-op outside a run
+@contextmanager
+def section(name):
+    run = current_run()
+    if run is None:
+        yield
+        return
+    started = time.perf_counter()
+    run._depth += 1
+    try:
+        yield
+    finally:
+        run._depth -= 1
+        run.sections.append({
+            "name": name,
+            "depth": run._depth,
+            "ms": round((time.perf_counter() - started) * 1000, 2)
+        })
+
+
+# Fragments rerun on their own, so they open a run when none is active
+def profiled(name):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if current_run() is not None:
+                with section(name):
+                    return func(*args, **kwargs)
+            start_run(f"fragment:{name}")
+            try:
+                return func(*args, **kwargs)
+            finally:
+                finish_run()
+        return wrapper
+    return decorator
+
+
+def record_frame(name, df):
+    run = current_run()
+    if run is not None:
+        run.frames.append({
+            "name": name,
+            "rows": len(df),
+            "columns": len(df.columns),
+            "bytes": int(df.memory_usage(deep=True).sum())
+        })
+
+
+def history():
+    return list(_history)
+
+
+def clear_history():
+    _history.clear()
+
+
+# SQL accounting: statements executed and rows fetched within the current run
+def _count_rows(count):
+    run = current_run()
+    if run is not None:
+        run.rows_fetched += count
+
+
+def _count_statement(statement):
+    run = current_run()
+    if run is not None:
+        run.sql_statements += 1
+
+
+class ProfiledCursor(sqlite3.Cursor):
+    def fetchone(self):
+        row = super().fetchone()
+        if row is not None:
+            _count_rows(1)
+        return row
+
+    def fetchmany(self, size=None):
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        _count_rows(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = super().fetchall()
+        _count_rows(len(rows))
+        return rows
+
+    def __next__(self):
+        row = super().__next__()
+        _count_rows(1)
+        return row
+
+
+# Connection factory for the pool; execute() is routed through ProfiledCursor
+class ProfiledConnection(sqlite3.Connection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.set_trace_callback(_count_statement)
+
+    def cursor(self, factory=ProfiledCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, parameters):
+        return self.cursor().executemany(sql, parameters)
+
+
+def connection_factory():
+    return ProfiledConnection if PROFILING_ENABLED else sqlite3.Connection
@@ -0,0 +1,130 @@
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from database import STATS_REBUILD
+
+STUDENT_COLUMNS = ["id", "name", "email", "phone", "course", "board", "year", "age",
+                   "registration_date", "status", "row_version"]
+
+# Columns the admin can change from the dashboard grid
+EDITABLE_COLUMNS = ["phone", "board", "year", "age", "status"]
+
+
+# Query results as a DataFrame through plain cursor calls, so the same code
+# reads SQLite and PostgreSQL connections (storage.py)
+def read_frame(conn, sql, params=()):
+    cursor = conn.execute(sql, params)
+    return pd.DataFrame.from_records(cursor.fetchall(), columns=[column[0] for column in cursor.description])
+
+
+def day_bounds(day):
+    start = datetime(day.year, day.month, day.day)
+    return start.isoformat(" "), (start + timedelta(days=1)).isoformat(" ")
+
+
+# Turn the dashboard filters into a WHERE clause the indexes can use
+def build_where(courses=None, statuses=None, date=None):
+    clauses, params = [], []
+
+    if courses:
+        clauses.append(f"course IN ({', '.join('?' * len(courses))})")
+        params.extend(courses)
+
+    if statuses:
+        clauses.append(f"status IN ({', '.join('?' * len(statuses))})")
+        params.extend(statuses)
+
+    if date:
+        # Range on the raw column instead of date(registration_date) = ?
+        start, end = day_bounds(date)
+        clauses.append("registration_date >= ? AND registration_date < ?")
+        params.extend([start, end])
+
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    return where, params
+
+
+# Metric tiles and charts are served from student_stats, which triggers on
+# students keep current, so none of them scan the students table
+def _stat_counts(conn, dimension, since=None):
+    sql = "SELECT key, count FROM student_stats WHERE dimension = ? AND count > 0"
+    params = [dimension]
+    if since is not None:
+        sql += " AND key >= ?"
+        params.append(since)
+    rows = conn.execute(sql + " ORDER BY key", params).fetchall()
+    return pd.Series({key: count for key, count in rows}, dtype="int64")
+
+
+def registration_metrics(conn):
+    courses = _stat_counts(conn, "course")
+    statuses = _stat_counts(conn, "status")
+    today = datetime.now().date().isoformat()
+    days = _stat_counts(conn, "day", since=today)
+    return {
+        "total": int(courses.sum()),
+        "today": int(days.get(today, 0)),
+        "active_courses": len(courses),
+        "pending": int(statuses.get("pending", 0))
+    }
+
+
+def stat_keys(conn, dimension):
+    return list(_stat_counts(conn, dimension).index)
+
+
+def course_counts(conn):
+    return _stat_counts(conn, "course").sort_values(ascending=False)
+
+
+def status_counts(conn):
+    return _stat_counts(conn, "status").sort_values(ascending=False)
+
+
+# Numeric order whether the keys are stored as numbers (SQLite) or text (PostgreSQL)
+def age_counts(conn):
+    return _stat_counts(conn, "age").sort_index(key=lambda keys: pd.to_numeric(keys, errors="coerce"))
+
+
+def daily_counts(conn, days=7):
+    since = (datetime.now().date() - timedelta(days=days)).isoformat()
+    return _stat_counts(conn, "day", since=since)
+
+
+def rebuild_stats(conn):
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for statement in STATS_REBUILD:
+            conn.execute(statement)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def _sql_value(value):
+    if pd.isna(value):
+        return None
+    # numpy scalars are not understood by sqlite3
+    return value.item() if hasattr(value, "item") else value
+
+
+# Compare the grid as loaded with the grid as edited and keep only changed rows
+def diff_student_edits(original, edited, columns=EDITABLE_COLUMNS):
+    before = original.set_index("id")
+    after = edited.set_index("id").reindex(before.index)
+
+    unchanged = (before[columns] == after[columns]) | (before[columns].isna() & after[columns].isna())
+    changed_rows = unchanged.index[~unchanged.all(axis=1)]
+
+    changes = []
+    for row_id in changed_rows:
+        changes.append({
+            "id": int(row_id),
+            "email": before.at[row_id, "email"],
+            "row_version": int(before.at[row_id, "row_version"]),
+            "changed": [column for column in columns if not unchanged.at[row_id, column]],
+            "values": {column: _sql_value(after.at[row_id, column]) for column in columns}
+        })
+    return changes
@@ -0,0 +1,109 @@
+import argparse
+import re
+import time
+
+import pandas as pd
+
+from queries import read_frame
+
+SEARCH_LIMIT = 50
+# Ranking has to score every match, so queries matching more rows than this
+# (one- or two-letter prefixes) list the newest matches instead
+RANK_LIMIT = 2000
+
+STUDENT_RESULT_COLUMNS = ["id", "name", "email", "phone", "course", "status", "registration_date"]
+CONTACT_RESULT_COLUMNS = ["id", "name", "email", "phone", "department", "excerpt", "created_at", "handled"]
+
+
+# Words of the search box; "@", "." and "-" in emails and phone numbers
+# separate words, as they do in both indexes
+def search_terms(text):
+    return re.findall(r"[^\W_]+", text.lower())
+
+
+# Each word becomes a quoted prefix term, so no input can break the FTS5
+# query syntax
+def fts_query(text):
+    return " ".join(f'"{term}"*' for term in search_terms(text))
+
+
+# The same prefix terms for PostgreSQL's to_tsquery, all of which must match
+def tsquery(text):
+    return " & ".join(f"{term}:*" for term in search_terms(text))
+
+
+# Counting stops at RANK_LIMIT + 1, which needs no scoring
+def _too_broad(conn, source, match, query):
+    return conn.execute(
+        f"SELECT COUNT(*) FROM (SELECT 1 FROM {source} WHERE {match} LIMIT ?) AS matches",
+        (query, RANK_LIMIT + 1)).fetchone()[0] > RANK_LIMIT
+
+
+# Results carry attrs["ranked"]: False when the newest matches were listed
+# instead. The query is the one parameter of source and match together.
+def _search(conn, query, select, source, match, rank, newest, columns, limit, count_source=None):
+    if not query:
+        results = pd.DataFrame(columns=columns)
+        results.attrs["ranked"] = True
+        return results
+    ranked = not _too_broad(conn, count_source or source, match, query)
+    results = read_frame(conn, f"SELECT {select} FROM {source} WHERE {match} "
+                               f"ORDER BY {rank if ranked else newest} LIMIT ?", [query, limit])
+    results.attrs["ranked"] = ranked
+    return results
+
+
+# SQLite: FTS5 indexes kept current by triggers (database.py migrations 6 and 7).
+# Name matches weigh more than email and phone.
+class Fts5Search:
+    def students(self, conn, text, limit=SEARCH_LIMIT):
+        return _search(conn, fts_query(text), ", ".join("s." + column for column in STUDENT_RESULT_COLUMNS),
+                       "students_fts JOIN students s ON s.id = students_fts.rowid", "students_fts MATCH ?",
+                       "bm25(students_fts, 10.0, 5.0, 5.0)", "students_fts.rowid DESC",
+                       STUDENT_RESULT_COLUMNS, limit, count_source="students_fts")
+
+    def contacts(self, conn, text, limit=SEARCH_LIMIT):
+        return _search(conn, fts_query(text), '''
+                c.id, c.name, c.email, c.phone, c.department,
+                snippet(contacts_fts, 4, '**', '**', ' … ', 16) AS excerpt,
+                c.created_at, c.handled
+            ''', "contacts_fts JOIN contacts c ON c.id = contacts_fts.rowid", "contacts_fts MATCH ?",
+            "bm25(contacts_fts, 5.0, 3.0, 3.0, 1.0, 2.0)", "contacts_fts.rowid DESC",
+            CONTACT_RESULT_COLUMNS, limit, count_source="contacts_fts")
+
+
+# PostgreSQL: GIN-indexed tsvector columns (storage.POSTGRES_SCHEMA), weighted
+# like the FTS5 ranking: name A, email and phone B, message C, department D
+class PostgresSearch:
+    def students(self, conn, text, limit=SEARCH_LIMIT):
+        return _search(conn, tsquery(text), ", ".join("s." + column for column in STUDENT_RESULT_COLUMNS),
+                       "students s, to_tsquery('simple', ?) AS q", "s.search @@ q",
+                       "ts_rank(s.search, q) DESC", "s.id DESC", STUDENT_RESULT_COLUMNS, limit)
+
+    def contacts(self, conn, text, limit=SEARCH_LIMIT):
+        return _search(conn, tsquery(text), '''
+                c.id, c.name, c.email, c.phone, c.department,
+                ts_headline('simple', c.message, q, 'StartSel=**, StopSel=**, MaxWords=16, MinWords=8')
+                    AS excerpt,
+                c.created_at, c.handled
+            ''', "contacts c, to_tsquery('simple', ?) AS q", "c.search @@ q",
+            "ts_rank(c.search, q) DESC", "c.id DESC", CONTACT_RESULT_COLUMNS, limit)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Search EnLift students and contact messages")
+    parser.add_argument("query")
+    parser.add_argument("--limit", type=int, default=SEARCH_LIMIT)
+    args = parser.parse_args()
+
+    from storage import get_storage
+
+    storage = get_storage()
+    with storage.connection() as conn:
+        started = time.perf_counter()
+        students = storage.search.students(conn, args.query, args.limit)
+        contacts = storage.search.contacts(conn, args.query, args.limit)
+        elapsed = (time.perf_counter() - started) * 1000
+    print(students.to_string(index=False) if len(students) else "No students found")
+    print(contacts.to_string(index=False) if len(contacts) else "No contact messages found")
+    print(f"{len(students) + len(contacts)} results in {elapsed:.1f} ms")
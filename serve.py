@@ -0,0 +1,124 @@
+import argparse
+import gzip
+import hashlib
+import mimetypes
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import prerender
+
+COMPRESSIBLE = {".html", ".css", ".js", ".json"}
+
+
+def cache_control(name):
+    # The service worker and pages revalidate (ETag); the stylesheet is
+    # requested with a content hash (?v=) and never changes under a URL
+    if name == "sw.js" or name.endswith(".html"):
+        return "no-cache"
+    if name == "enlift.min.css":
+        return "public, max-age=31536000, immutable"
+    return "public, max-age=86400"
+
+
+# The pre-rendered site held in memory, gzipped once at startup
+class SiteFiles:
+    def __init__(self, directory):
+        self.files = {}
+        for path in sorted(Path(directory).iterdir()):
+            if not path.is_file():
+                continue
+            body = path.read_bytes()
+            self.files["/" + path.name] = {
+                "body": body,
+                "gzip": gzip.compress(body, 9) if path.suffix in COMPRESSIBLE else None,
+                "etag": '"' + hashlib.sha1(body).hexdigest()[:16] + '"',
+                "type": mimetypes.guess_type(path.name)[0] or "application/octet-stream",
+                "cache": cache_control(path.name),
+            }
+        if "/index.html" not in self.files:
+            raise FileNotFoundError(f"{directory} has no index.html; run prerender.py first")
+
+    def get(self, path):
+        return self.files.get("/index.html" if path == "/" else path)
+
+
+class SiteHandler(BaseHTTPRequestHandler):
+    site = None
+    server_version = "EnLiftStatic"
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; avoid Nagle + delayed-ACK stalls on keep-alive
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._serve(send_body=True)
+
+    def do_HEAD(self):
+        self._serve(send_body=False)
+
+    def _serve(self, send_body):
+        entry = self.site.get(urlsplit(self.path).path)
+        if entry is None:
+            self.send_error(404)
+            return
+
+        if self.headers.get("If-None-Match") == entry["etag"]:
+            self.send_response(304)
+            self.send_header("ETag", entry["etag"])
+            self.send_header("Cache-Control", entry["cache"])
+            self.end_headers()
+            return
+
+        body = entry["body"]
+        self.send_response(200)
+        if entry["gzip"] is not None:
+            self.send_header("Vary", "Accept-Encoding")
+            if "gzip" in self.headers.get("Accept-Encoding", ""):
+                body = entry["gzip"]
+                self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Type", entry["type"] + ("; charset=utf-8" if entry["gzip"] is not None else ""))
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", entry["etag"])
+        self.send_header("Cache-Control", entry["cache"])
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def make_server(directory=prerender.SITE_DIR, host="0.0.0.0", port=8000, verbose=False):
+    handler = type("Handler", (SiteHandler,), {"site": SiteFiles(directory)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.verbose = verbose
+    return server
+
+
+# Marketing pages are served from here; the Streamlit app (see --app-url)
+# only handles admission, the contact form and the admin area
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the pre-rendered EnLift pages without Streamlit")
+    parser.add_argument("--site", default=prerender.SITE_DIR)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--build", action="store_true", help="run prerender.py before serving")
+    parser.add_argument("--app-url", default=prerender.APP_URL, help="Streamlit app URL used by --build")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    if args.build:
+        prerender.APP_URL = args.app_url
+        version, names = prerender.build(args.site)
+        print(f"Built {len(names)} files into {args.site} (cache version {version})")
+
+    server = make_server(args.site, args.host, args.port, args.verbose)
+    print(f"Serving {args.site} on http://{args.host}:{args.port} (Streamlit app: {args.app_url})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,110 @@
+import argparse
+import socketserver
+import threading
+
+
+# Minimal local SMTP server that keeps every received message in memory.
+# Point SMTPTransport at it (use_tls off) to exercise the outbox without
+# talking to a real mail server.
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def _reply(self, line):
+        self.wfile.write((line + "\r\n").encode())
+
+    def handle(self):
+        stub = self.server.stub
+        self._reply("220 enlift-smtp-stub ready")
+        sender, recipients = None, []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                break
+            command = line.decode(errors="replace").strip()
+            verb = command[:4].upper()
+
+            if verb in ("HELO", "EHLO"):
+                self._reply("250 enlift-smtp-stub")
+            elif verb == "MAIL":
+                sender, recipients = command.split(":", 1)[1].strip(), []
+                self._reply("250 OK")
+            elif verb == "RCPT":
+                recipients.append(command.split(":", 1)[1].strip())
+                self._reply("250 OK")
+            elif verb == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                while True:
+                    chunk = self.rfile.readline()
+                    if not chunk or chunk.rstrip(b"\r\n") == b".":
+                        break
+                    data.append(chunk.decode(errors="replace"))
+                stub.record(sender, recipients, "".join(data))
+                self._reply("250 OK queued")
+            elif verb == "RSET":
+                sender, recipients = None, []
+                self._reply("250 OK")
+            elif verb == "NOOP":
+                self._reply("250 OK")
+            elif verb == "QUIT":
+                self._reply("221 Bye")
+                break
+            else:
+                self._reply("502 Command not implemented")
+
+
+class SMTPStub:
+    def __init__(self, host="127.0.0.1", port=0, verbose=False):
+        self.messages = []
+        self.sessions = 0
+        self.verbose = verbose
+        self._lock = threading.Lock()
+
+        stub = self
+
+        class Server(socketserver.ThreadingTCPServer):
+            daemon_threads = True
+            allow_reuse_address = True
+
+            def process_request(self, request, client_address):
+                with stub._lock:
+                    stub.sessions += 1
+                super().process_request(request, client_address)
+
+        self._server = Server((host, port), _SMTPHandler)
+        self._server.stub = self
+        self.host, self.port = self._server.server_address
+        self._thread = None
+
+    def record(self, sender, recipients, data):
+        with self._lock:
+            self.messages.append({"from": sender, "to": recipients, "data": data})
+        if self.verbose:
+            print(f"--- message from {sender} to {', '.join(recipients)}\n{data}")
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local SMTP stub for the EnLift outbox")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1025)
+    args = parser.parse_args()
+
+    stub = SMTPStub(args.host, args.port, verbose=True)
+    print(f"SMTP stub listening on {stub.host}:{stub.port}")
+    try:
+        stub._server.serve_forever()
+    except KeyboardInterrupt:
+        stub.stop()
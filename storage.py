@@ -0,0 +1,561 @@
+import argparse
+import json
+import os
+import re
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+
+from contacts import contact_row, count_contacts, fetch_contacts_page
+from database import get_pool
+from queries import EDITABLE_COLUMNS, rebuild_stats
+from search import Fts5Search, PostgresSearch
+
+# Where students, contact messages, admission requests and the outbox are
+# stored, with the statistics, change log and search index built on them.
+# Unset keeps them in SQLite (ENLIFT_DB_PATH, database.py); a postgresql://
+# URL moves them to PostgreSQL, which takes writes from many processes and
+# machines at once. Maintenance job state stays in the local SQLite file.
+DATABASE_URL = os.environ.get("ENLIFT_DATABASE_URL")
+POSTGRES_POOL_MIN = 1
+POSTGRES_POOL_MAX = int(os.environ.get("ENLIFT_POSTGRES_POOL_SIZE", "10"))
+# Serialises schema creation when several processes start together
+POSTGRES_SCHEMA_LOCK = 0x656E6C6966
+# Taken by every transaction that writes students, before its first row lock
+STUDENT_WRITE_LOCK = 0x656E6C6967
+
+
+def _now():
+    return datetime.now().isoformat(" ")
+
+
+# Columns added after a table first shipped; ALTER TABLE only runs (and
+# locks the table) when the column is missing
+def _add_column(table, column, definition):
+    return f'''
+    DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM information_schema.columns
+                       WHERE table_schema = current_schema() AND table_name = '{table}'
+                         AND column_name = '{column}') THEN
+            ALTER TABLE {table} ADD COLUMN {column} {definition};
+        END IF;
+    END
+    $$
+    '''
+
+
+# Same columns as the SQLite migrations. Timestamps stay sortable ISO text so
+# filters, day bounds and paging are shared by both backends.
+POSTGRES_SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS students (
+        id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+        name TEXT NOT NULL,
+        email TEXT NOT NULL UNIQUE,
+        phone TEXT,
+        course TEXT,
+        board TEXT,
+        year INTEGER,
+        age INTEGER,
+        registration_date TEXT,
+        status TEXT DEFAULT 'pending',
+        row_version INTEGER NOT NULL DEFAULT 0
+    )
+    ''',
+    "CREATE INDEX IF NOT EXISTS idx_students_registration_date ON students (registration_date)",
+    "CREATE INDEX IF NOT EXISTS idx_students_course_date ON students (course, registration_date)",
+    "CREATE INDEX IF NOT EXISTS idx_students_status_date ON students (status, registration_date)",
+    '''
+    CREATE TABLE IF NOT EXISTS contacts (
+        id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+        name TEXT NOT NULL,
+        email TEXT NOT NULL,
+        phone TEXT,
+        department TEXT,
+        message TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        handled INTEGER NOT NULL DEFAULT 0,
+        handled_at TEXT,
+        source_path TEXT UNIQUE
+    )
+    ''',
+    "CREATE INDEX IF NOT EXISTS idx_contacts_created ON contacts (created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_contacts_department_handled_created "
+    "ON contacts (department, handled, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_contacts_handled_created ON contacts (handled, created_at)",
+    '''
+    CREATE TABLE IF NOT EXISTS outbox (
+        id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+        recipient TEXT NOT NULL,
+        subject TEXT NOT NULL,
+        body TEXT NOT NULL,
+        status TEXT DEFAULT 'queued',
+        attempts INTEGER DEFAULT 0,
+        last_error TEXT,
+        created_at TEXT,
+        next_attempt_at TEXT,
+        sent_at TEXT
+    )
+    ''',
+    "CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (status, next_attempt_at)",
+    '''
+    CREATE TABLE IF NOT EXISTS admission_requests (
+        receipt TEXT PRIMARY KEY,
+        email TEXT NOT NULL,
+        payload TEXT NOT NULL,
+        status TEXT NOT NULL DEFAULT 'queued',
+        error TEXT,
+        created_at TEXT NOT NULL,
+        finished_at TEXT
+    )
+    ''',
+    "CREATE INDEX IF NOT EXISTS idx_admission_requests_status ON admission_requests (status, created_at)",
+    # Statistics for the metric tiles and charts (SQLite migration 5); age
+    # keys are text here
+    '''
+    CREATE TABLE IF NOT EXISTS student_stats (
+        dimension TEXT NOT NULL,
+        key TEXT NOT NULL,
+        count BIGINT NOT NULL DEFAULT 0,
+        PRIMARY KEY (dimension, key)
+    )
+    ''',
+    # Clear generation for the known-emails caches (SQLite migration 11)
+    '''
+    CREATE TABLE IF NOT EXISTS student_clears (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        generation INTEGER NOT NULL
+    )
+    ''',
+    "INSERT INTO student_clears (id, generation) VALUES (1, 0) ON CONFLICT (id) DO NOTHING",
+    # Change log for the dashboard cache (SQLite migration 9)
+    '''
+    CREATE TABLE IF NOT EXISTS student_changes (
+        id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+        student_id BIGINT NOT NULL
+    )
+    ''',
+    # Student writers take turns from their first write until commit, as
+    # they do on SQLite. Change ids are then handed out in commit order, so
+    # a cache at version N never misses a smaller id committed later; taking
+    # the lock before any row lock keeps writers from deadlocking on it.
+    f'''
+    CREATE OR REPLACE FUNCTION students_write_lock() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        PERFORM pg_advisory_xact_lock({STUDENT_WRITE_LOCK});
+        RETURN NULL;
+    END
+    $$
+    ''',
+    '''
+    CREATE OR REPLACE FUNCTION students_changed() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        INSERT INTO student_changes (student_id) VALUES (CASE WHEN TG_OP = 'DELETE' THEN OLD.id ELSE NEW.id END);
+        IF TG_OP = 'UPDATE' AND (OLD.course, OLD.status, OLD.age, OLD.registration_date)
+                IS NOT DISTINCT FROM (NEW.course, NEW.status, NEW.age, NEW.registration_date) THEN
+            RETURN NULL;
+        END IF;
+        IF TG_OP <> 'INSERT' THEN
+            UPDATE student_stats SET count = count - 1
+            WHERE (dimension, key) IN (
+                ('course', COALESCE(OLD.course, '')),
+                ('status', COALESCE(OLD.status, '')),
+                ('age', COALESCE(OLD.age::text, '')),
+                ('day', COALESCE(substr(OLD.registration_date, 1, 10), '')));
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            INSERT INTO student_stats (dimension, key, count) VALUES
+                ('course', COALESCE(NEW.course, ''), 1),
+                ('status', COALESCE(NEW.status, ''), 1),
+                ('age', COALESCE(NEW.age::text, ''), 1),
+                ('day', COALESCE(substr(NEW.registration_date, 1, 10), ''), 1)
+            ON CONFLICT (dimension, key) DO UPDATE SET count = student_stats.count + 1;
+        END IF;
+        RETURN NULL;
+    END
+    $$
+    ''',
+    '''
+    DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgrelid = 'students'::regclass
+                                                  AND tgname = 'students_write_lock') THEN
+            CREATE TRIGGER students_write_lock BEFORE INSERT OR UPDATE OR DELETE ON students
+                FOR EACH STATEMENT EXECUTE FUNCTION students_write_lock();
+        END IF;
+        IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgrelid = 'students'::regclass
+                                                  AND tgname = 'students_changed') THEN
+            CREATE TRIGGER students_changed AFTER INSERT OR UPDATE OR DELETE ON students
+                FOR EACH ROW EXECUTE FUNCTION students_changed();
+        END IF;
+    END
+    $$
+    ''',
+    # Full-text search (SQLite migrations 6 and 7). Punctuation splits words
+    # as the FTS5 tokenizer does, so "gmail" finds an @gmail.com address.
+    _add_column("students", "search", '''
+        tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', regexp_replace(name, '[[:punct:]]+', ' ', 'g')), 'A') ||
+            setweight(to_tsvector('simple', regexp_replace(email || ' ' || COALESCE(phone, ''),
+                                                           '[[:punct:]]+', ' ', 'g')), 'B')
+        ) STORED
+    '''),
+    "CREATE INDEX IF NOT EXISTS idx_students_search ON students USING GIN (search)",
+    _add_column("contacts", "search", '''
+        tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', regexp_replace(name, '[[:punct:]]+', ' ', 'g')), 'A') ||
+            setweight(to_tsvector('simple', regexp_replace(email || ' ' || COALESCE(phone, ''),
+                                                           '[[:punct:]]+', ' ', 'g')), 'B') ||
+            setweight(to_tsvector('simple', regexp_replace(message, '[[:punct:]]+', ' ', 'g')), 'C') ||
+            setweight(to_tsvector('simple', COALESCE(department, '')), 'D')
+        ) STORED
+    '''),
+    "CREATE INDEX IF NOT EXISTS idx_contacts_search ON contacts USING GIN (search)",
+]
+
+# Recompute student_stats from scratch (database.STATS_REBUILD for PostgreSQL)
+POSTGRES_STATS_REBUILD = [
+    f"SELECT pg_advisory_xact_lock({STUDENT_WRITE_LOCK})",
+    "DELETE FROM student_stats",
+    '''
+    INSERT INTO student_stats (dimension, key, count)
+    SELECT 'course', COALESCE(course, ''), COUNT(*) FROM students GROUP BY 2
+    UNION ALL
+    SELECT 'status', COALESCE(status, ''), COUNT(*) FROM students GROUP BY 2
+    UNION ALL
+    SELECT 'age', COALESCE(age::text, ''), COUNT(*) FROM students GROUP BY 2
+    UNION ALL
+    SELECT 'day', COALESCE(substr(registration_date, 1, 10), ''), COUNT(*) FROM students GROUP BY 2
+    ''',
+]
+
+
+class EditConflict(Exception):
+    def __init__(self, ids):
+        super().__init__(f"changed by someone else: {', '.join(map(str, ids))}")
+        self.ids = ids
+
+
+# Repositories hold the SQL for one table each. Every method takes a
+# connection from Storage.connection() or Storage.transaction(), so one
+# transaction can span several repositories; none of them commits.
+class StudentRepository:
+    # New id, or None when the email is already registered
+    def add(self, conn, student):
+        row = conn.execute('''
+            INSERT INTO students (name, email, phone, course, board, year, age, registration_date)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (email) DO NOTHING
+            RETURNING id
+        ''', (student["name"], student["email"], student["phone"], student["course"],
+              student["board"], student["year"], student["age"], student["registration_date"])).fetchone()
+        return row[0] if row else None
+
+    def exists(self, conn, email):
+        return conn.execute("SELECT 1 FROM students WHERE email = ?", (email,)).fetchone() is not None
+
+    # Bumped by every clear of the table; a process that remembers emails as
+    # registered compares it to tell whether they may have been deleted since
+    def clear_generation(self, conn):
+        return conn.execute("SELECT generation FROM student_clears WHERE id = 1").fetchone()[0]
+
+    def mark_cleared(self, conn):
+        conn.execute("UPDATE student_clears SET generation = generation + 1 WHERE id = 1")
+
+    # Only the edited columns of each row are written, and only while its
+    # row_version is the one the admin loaded; otherwise EditConflict rolls
+    # the whole transaction back. One statement per row, since each row's
+    # rowcount is the conflict check.
+    def save_edits(self, conn, changes):
+        conflicts = []
+        for change in changes:
+            columns = [column for column in change["changed"] if column in EDITABLE_COLUMNS]
+            assignments = "".join(f"{column} = ?, " for column in columns)
+            cursor = conn.execute(f'''
+                UPDATE students SET {assignments}row_version = row_version + 1
+                WHERE id = ? AND row_version = ?
+            ''', [change["values"][column] for column in columns] + [change["id"], change["row_version"]])
+            if cursor.rowcount == 0:
+                conflicts.append(change["id"])
+        if conflicts:
+            raise EditConflict(conflicts)
+        return len(changes)
+
+
+class ContactRepository:
+    def add(self, conn, contact):
+        return conn.execute('''
+            INSERT INTO contacts (name, email, phone, department, message, created_at, source_path)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            RETURNING id
+        ''', contact_row(contact)).fetchone()[0]
+
+    def count(self, conn, departments=None, handled=None):
+        return count_contacts(conn, departments, handled)
+
+    def page(self, conn, departments=None, handled=None, page=1, page_size=25):
+        return fetch_contacts_page(conn, departments, handled, page, page_size)
+
+    def set_handled(self, conn, ids, handled=True):
+        if not ids:
+            return 0
+        handled_at = _now() if handled else None
+        cursor = conn.executemany("UPDATE contacts SET handled = ?, handled_at = ? WHERE id = ?",
+                                  [(int(handled), handled_at, int(i)) for i in ids])
+        return cursor.rowcount
+
+
+class OutboxRepository:
+    # Row-lock clause for the claim: PostgreSQL skips rows another worker is
+    # claiming; SQLite needs none under BEGIN IMMEDIATE
+    def __init__(self, claim_lock=""):
+        self.claim_lock = claim_lock
+
+    def enqueue(self, conn, recipient, subject, body):
+        now = _now()
+        return conn.execute('''
+            INSERT INTO outbox (recipient, subject, body, status, created_at, next_attempt_at)
+            VALUES (?, ?, ?, 'queued', ?, ?)
+            RETURNING id
+        ''', (recipient, subject, body, now, now)).fetchone()[0]
+
+    # Due messages, leased to the caller until lease_until: they are marked
+    # sending, so no other worker picks them up. next_attempt_at holds the
+    # lease end, and a lease that ran out (the worker died) is due again.
+    def claim(self, conn, limit, lease_until):
+        rows = conn.execute(f'''
+            UPDATE outbox SET status = 'sending', next_attempt_at = ?
+            WHERE id IN (
+                SELECT id FROM outbox
+                WHERE status IN ('queued', 'sending') AND next_attempt_at <= ?
+                ORDER BY next_attempt_at
+                LIMIT ? {self.claim_lock}
+            )
+            RETURNING id, recipient, subject, body, attempts
+        ''', (lease_until.isoformat(" "), _now(), limit)).fetchall()
+        return sorted(rows)
+
+    def mark_sent(self, conn, message_id, attempts):
+        conn.execute("UPDATE outbox SET status = 'sent', attempts = ?, last_error = NULL, sent_at = ? WHERE id = ?",
+                     (attempts, _now(), message_id))
+
+    def mark_retry(self, conn, message_id, attempts, error, retry_at):
+        conn.execute('''
+            UPDATE outbox SET status = 'queued', attempts = ?, last_error = ?, next_attempt_at = ? WHERE id = ?
+        ''', (attempts, error, retry_at.isoformat(" "), message_id))
+
+    def mark_failed(self, conn, message_id, attempts, error):
+        conn.execute("UPDATE outbox SET status = 'failed', attempts = ?, last_error = ? WHERE id = ?",
+                     (attempts, error, message_id))
+
+
+# Submitted applications and where they stand, looked up by receipt
+class AdmissionRequestRepository:
+    def add(self, conn, receipt, student):
+        conn.execute('''
+            INSERT INTO admission_requests (receipt, email, payload, status, created_at)
+            VALUES (?, ?, ?, 'queued', ?)
+        ''', (receipt, student["email"], json.dumps(student), _now()))
+
+    def get(self, conn, receipt):
+        row = conn.execute("SELECT status, email, error FROM admission_requests WHERE receipt = ?",
+                           (receipt,)).fetchone()
+        return {"receipt": receipt, "status": row[0], "email": row[1], "error": row[2]} if row else None
+
+    # (receipt, student) of every request still waiting, oldest first
+    def queued(self, conn):
+        rows = conn.execute('''
+            SELECT receipt, payload FROM admission_requests WHERE status = 'queued' ORDER BY created_at
+        ''').fetchall()
+        return [(receipt, json.loads(payload)) for receipt, payload in rows]
+
+    # Only one writer settles a request; False if another already has
+    def claim(self, conn, receipt):
+        return conn.execute('''
+            UPDATE admission_requests SET status = 'processing' WHERE receipt = ? AND status = 'queued'
+        ''', (receipt,)).rowcount == 1
+
+    def finish(self, conn, receipt, status, error=None):
+        conn.execute("UPDATE admission_requests SET status = ?, error = ?, finished_at = ? WHERE receipt = ?",
+                     (status, error, _now(), receipt))
+
+
+# A backend: connection(), transaction() and snapshot() hand out connections;
+# data_version() is the newest student_changes id, the version of the students
+# table that student_cache holds
+class Storage:
+    name = None
+
+    def __init__(self):
+        self.students = StudentRepository()
+        self.contacts = ContactRepository()
+        self.outbox = OutboxRepository()
+        self.admissions = AdmissionRequestRepository()
+
+
+# The existing SQLite database and its connection pool (database.py)
+class SqliteStorage(Storage):
+    name = "sqlite"
+
+    def __init__(self, pool):
+        super().__init__()
+        self.pool = pool
+        self.search = Fts5Search()
+
+    def connection(self):
+        return self.pool.connection()
+
+    # One read transaction, so every query sees the same data
+    @contextmanager
+    def snapshot(self):
+        with self.pool.connection() as conn:
+            conn.execute("BEGIN")
+            try:
+                yield conn
+            finally:
+                conn.rollback()
+
+    # Bumped by the student_changes triggers on every insert, update and delete
+    def data_version(self, conn):
+        row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'student_changes'").fetchone()
+        return row[0] if row else 0
+
+    def rebuild_stats(self):
+        with self.pool.connection() as conn:
+            rebuild_stats(conn)
+
+    # Takes the write lock up front, so the transaction never has to upgrade
+    @contextmanager
+    def transaction(self):
+        with self.pool.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+
+    def close(self):
+        self.pool.close()
+
+
+# qmark (?) SQL to psycopg's format style; % is escaped everywhere, ? only
+# outside string literals
+@lru_cache(maxsize=256)
+def _pyformat(sql):
+    parts = re.split(r"('(?:[^']|'')*')", sql.replace("%", "%%"))
+    parts[::2] = [part.replace("?", "%s") for part in parts[::2]]
+    return "".join(parts)
+
+
+# A psycopg connection with the sqlite3 calls the repositories use
+class PostgresConnection:
+    def __init__(self, conn):
+        self.raw = conn
+
+    def execute(self, sql, params=()):
+        return self.raw.execute(_pyformat(sql), params)
+
+    def executemany(self, sql, rows):
+        cursor = self.raw.cursor()
+        cursor.executemany(_pyformat(sql), rows)
+        return cursor
+
+    def commit(self):
+        self.raw.commit()
+
+    def rollback(self):
+        self.raw.rollback()
+
+
+# PostgreSQL through a psycopg connection pool (optional dependency:
+# pip install "psycopg[binary,pool]"). Row locks instead of one database
+# write lock, so writers from any number of processes proceed in parallel.
+class PostgresStorage(Storage):
+    name = "postgresql"
+
+    def __init__(self, url, min_size=POSTGRES_POOL_MIN, max_size=POSTGRES_POOL_MAX):
+        super().__init__()
+        try:
+            from psycopg_pool import ConnectionPool
+        except ImportError as e:
+            raise RuntimeError('PostgreSQL storage needs psycopg: pip install "psycopg[binary,pool]"') from e
+        self.pool = ConnectionPool(url, min_size=min_size, max_size=max_size, open=True)
+        self.search = PostgresSearch()
+        self.outbox = OutboxRepository(claim_lock="FOR UPDATE SKIP LOCKED")
+        with self.transaction() as conn:
+            conn.execute("SELECT pg_advisory_xact_lock(?)", (POSTGRES_SCHEMA_LOCK,))
+            for statement in POSTGRES_SCHEMA:
+                conn.execute(statement)
+            # Statistics of students stored before the stats table existed
+            if conn.execute("SELECT NOT EXISTS (SELECT 1 FROM student_stats)").fetchone()[0]:
+                for statement in POSTGRES_STATS_REBUILD:
+                    conn.execute(statement)
+
+    # The pool commits when the block exits cleanly and rolls back on an
+    # exception; every statement already runs inside a transaction
+    @contextmanager
+    def connection(self):
+        with self.pool.connection() as conn:
+            yield PostgresConnection(conn)
+
+    transaction = connection
+
+    @contextmanager
+    def snapshot(self):
+        with self.pool.connection() as conn:
+            conn.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY")
+            try:
+                yield PostgresConnection(conn)
+            finally:
+                conn.rollback()
+
+    # Ids are handed out in commit order (students_write_lock), so the newest
+    # visible one is the version
+    def data_version(self, conn):
+        return conn.execute("SELECT COALESCE(MAX(id), 0) FROM student_changes").fetchone()[0]
+
+    def rebuild_stats(self):
+        with self.transaction() as conn:
+            for statement in POSTGRES_STATS_REBUILD:
+                conn.execute(statement)
+
+    def close(self):
+        self.pool.close()
+
+
+def open_storage(url=DATABASE_URL):
+    if url and url.startswith(("postgres://", "postgresql://")):
+        return PostgresStorage(url)
+    if url:
+        raise ValueError(f"unsupported ENLIFT_DATABASE_URL {url!r}; use a postgresql:// URL or leave it unset")
+    return SqliteStorage(get_pool())
+
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def get_storage():
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                _storage = open_storage()
+    return _storage
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the EnLift storage backend")
+    parser.add_argument("--url", default=DATABASE_URL, help="database URL (default: $ENLIFT_DATABASE_URL or SQLite)")
+    args = parser.parse_args()
+
+    storage = open_storage(args.url)
+    with storage.connection() as conn:
+        print(f"{storage.name}: {conn.execute('SELECT COUNT(*) FROM students').fetchone()[0]} students, "
+              f"{storage.contacts.count(conn)} messages, "
+              f"{conn.execute('SELECT COUNT(*) FROM outbox').fetchone()[0]} queued or sent emails")
+    storage.close()
@@ -0,0 +1,200 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from queries import STUDENT_COLUMNS, day_bounds, read_frame
+
+# Above this many changed students one full reload is cheaper than a delta
+DELTA_LIMIT = 5000
+ID_CHUNK = 500
+SORT_COLUMNS = ["registration_date", "id"]
+
+
+# Compact in-memory types: categories for the low-cardinality text columns,
+# registration_date parsed once, and the smallest integer types that fit
+CATEGORY_COLUMNS = ["course", "board", "status"]
+NULLABLE_INT_COLUMNS = {"year": "Int16", "age": "Int16"}
+INT_COLUMNS = {"row_version": "int32"}
+
+
+def compact_students(frame):
+    frame = frame.astype({**{column: "category" for column in CATEGORY_COLUMNS},
+                          **NULLABLE_INT_COLUMNS, **INT_COLUMNS, "id": "int64"})
+    frame["registration_date"] = pd.to_datetime(frame["registration_date"], format="ISO8601", errors="coerce")
+    return frame
+
+
+# Plain object/float types for the editable grid, as the edit diff expects
+def plain_students(frame):
+    return frame.astype({**{column: object for column in CATEGORY_COLUMNS},
+                         **{column: "float64" for column in NULLABLE_INT_COLUMNS}})
+
+
+# The students table with default pandas types, newest first
+def read_students(conn):
+    return read_frame(conn, f'''
+        SELECT {', '.join(STUDENT_COLUMNS)} FROM students
+        ORDER BY registration_date DESC, id DESC
+    ''')
+
+
+def _load_all(conn):
+    return compact_students(read_students(conn))
+
+
+def _load_ids(conn, ids):
+    chunks = [read_frame(
+        conn, f"SELECT {', '.join(STUDENT_COLUMNS)} FROM students WHERE id IN ({', '.join('?' * len(chunk))})",
+        chunk) for chunk in (ids[i:i + ID_CHUNK] for i in range(0, len(ids), ID_CHUNK))]
+    return compact_students(pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=STUDENT_COLUMNS))
+
+
+def _sort_key(row):
+    return row["registration_date"], int(row["id"])
+
+
+# New rows first, then the kept rows of the old column with edited values patched in
+def _merge_array(base, new, values, kept, slots):
+    # Empty parts (e.g. no new rows) must not widen the dtype
+    dtype = np.result_type(*[part.dtype for part in (base, new, values) if len(part)] or [base.dtype])
+    merged = np.empty(len(new) + len(kept), dtype=dtype)
+    merged[:len(new)] = new
+    merged[len(new):] = base[kept]
+    merged[slots] = values
+    return merged
+
+
+def _codes(part, dtype):
+    return pd.Categorical(part.astype(object), dtype=dtype).codes
+
+
+def _merge_column(base, new, values, kept, slots):
+    if isinstance(base.dtype, pd.CategoricalDtype):
+        # Unseen values are appended to the categories, so existing codes stay valid
+        seen = pd.Index(pd.concat([new, values]).astype(object).dropna().unique())
+        dtype = pd.CategoricalDtype(base.cat.categories.append(seen.difference(base.cat.categories)))
+        # Encoded by value: astype() keeps the old codes of a categorical whose
+        # categories are the same set in another order
+        codes = _merge_array(base.cat.codes.to_numpy(), _codes(new, dtype), _codes(values, dtype), kept, slots)
+        return pd.Categorical.from_codes(codes, dtype=dtype)
+    if isinstance(base.dtype, pd.api.extensions.ExtensionDtype):
+        # Nullable integers travel as float with NaN for NULL
+        merged = _merge_array(*(part.to_numpy("float64", na_value=np.nan) for part in (base, new, values)),
+                              kept, slots)
+        return pd.array(merged, dtype=base.dtype)
+    return _merge_array(base.to_numpy(), new.to_numpy(), values.to_numpy(), kept, slots)
+
+
+# Fold changed rows into a new frame. Edited rows keep their place
+# (registration_date is not editable), deleted ones are dropped and new
+# registrations, normally the newest, go on top; only an out-of-order
+# arrival costs a full sort. The published frame is never modified.
+def merge_changes(frame, ids, rows):
+    frame_ids = pd.Index(frame["id"])
+    positions = frame_ids.get_indexer(rows["id"])
+    in_place = positions >= 0
+    in_place[in_place] = (frame["registration_date"].to_numpy()[positions[in_place]]
+                          == rows["registration_date"].to_numpy()[in_place])
+    added = rows[~in_place].sort_values(SORT_COLUMNS, ascending=False)
+    patched = rows[in_place]
+
+    keep = np.ones(len(frame), dtype=bool)
+    touched = frame_ids.get_indexer(ids)
+    keep[touched[touched >= 0]] = False
+    keep[positions[in_place]] = True
+    kept = np.flatnonzero(keep)
+    # Where each patched row lands in the merged frame
+    slots = len(added) + np.searchsorted(kept, positions[in_place])
+
+    merged = pd.DataFrame({
+        column: _merge_column(frame[column], added[column], patched[column], kept, slots)
+        for column in frame.columns
+    }, columns=frame.columns, copy=False)
+
+    if len(added) and len(kept) and _sort_key(added.iloc[-1]) < _sort_key(merged.iloc[len(added)]):
+        merged = merged.sort_values(SORT_COLUMNS, ascending=False, ignore_index=True)
+    return merged
+
+
+# Process-wide copy of the students table for the admin dashboard, shared by
+# every admin session. Frames are never modified once published, so pages
+# handed out earlier stay valid while a newer version replaces them. The
+# version is the newest student_changes id (Storage.data_version).
+class StudentCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.version = None
+        self.frame = None
+        # Read by the Diagnostics page
+        self.stats = {"hits": 0, "deltas": 0, "reloads": 0, "delta_rows": 0}
+
+    def get(self, storage):
+        with storage.connection() as conn:
+            current = storage.data_version(conn)
+        if self.frame is not None and current == self.version:
+            self.stats["hits"] += 1
+            return self.frame
+        # One read snapshot, so the version matches the rows read
+        with self._lock, storage.snapshot() as conn:
+            version = storage.data_version(conn)
+            if self.frame is None or not self._apply_delta(conn, version):
+                self.frame = _load_all(conn)
+                self.stats["reloads"] += 1
+            self.version = version
+            return self.frame
+
+    def _apply_delta(self, conn, version):
+        if version == self.version:
+            return True
+        oldest = conn.execute("SELECT MIN(id) FROM student_changes").fetchone()[0]
+        if self.version is None or oldest is None or oldest > self.version + 1:
+            # The change log has been trimmed past our version
+            return False
+        ids = [row[0] for row in conn.execute('''
+            SELECT DISTINCT student_id FROM student_changes WHERE id > ? AND id <= ? LIMIT ?
+        ''', (self.version, version, DELTA_LIMIT + 1))]
+        if len(ids) > DELTA_LIMIT:
+            return False
+        self.frame = merge_changes(self.frame, ids, _load_ids(conn, ids))
+        self.stats["deltas"] += 1
+        self.stats["delta_rows"] += len(ids)
+        return True
+
+    def clear(self):
+        with self._lock:
+            self.version = None
+            self.frame = None
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_student_cache():
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = StudentCache()
+    return _cache
+
+
+# Dashboard filters applied to the cached frame; same semantics as queries.build_where
+def filter_students(frame, courses=None, statuses=None, date=None):
+    if not (courses or statuses or date):
+        return frame
+    mask = pd.Series(True, index=frame.index)
+    if courses:
+        mask &= frame["course"].isin(courses)
+    if statuses:
+        mask &= frame["status"].isin(statuses)
+    if date:
+        start, end = day_bounds(date)
+        mask &= (frame["registration_date"] >= pd.Timestamp(start)) & (frame["registration_date"] < pd.Timestamp(end))
+    return frame[mask]
+
+
+def students_page(frame, page=1, page_size=50):
+    offset = (max(page, 1) - 1) * page_size
+    return plain_students(frame.iloc[offset:offset + page_size].reset_index(drop=True))
@@ -0,0 +1,193 @@
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from catalog import get_catalog
+from contacts import DEPARTMENTS, insert_contacts
+
+FIRST_NAMES = [
+    "Aarav", "Aditi", "Ananya", "Arjun", "Arunava", "Ayan", "Debjani", "Diya", "Ishaan", "Kabir",
+    "Kavya", "Meera", "Neha", "Nikhil", "Priya", "Rahul", "Riya", "Rohan", "Sanjana", "Shreya",
+    "Soham", "Sneha", "Tanmay", "Tanvi", "Vivaan"
+]
+LAST_NAMES = [
+    "Banerjee", "Bose", "Chakraborty", "Chatterjee", "Das", "Dutta", "Ghosh", "Gupta", "Iyer",
+    "Kumar", "Mukherjee", "Nair", "Patel", "Roy", "Saha", "Sen", "Sharma", "Singh", "Verma"
+]
+CONTACT_MESSAGES = [
+    "What are the class timings for the {course} batch?",
+    "Is there a demo class available before joining {course}?",
+    "Please share the fee structure and payment options for {course}.",
+    "I could not log in to the learning portal after registering.",
+    "Do you offer weekend batches for {course}?",
+    "Are study materials included in the monthly fee?",
+]
+DEFAULT_STATUS_WEIGHTS = {"pending": 50, "approved": 35, "rejected": 5, "completed": 10}
+
+
+def parse_weights(text):
+    weights = {}
+    for part in text.split(","):
+        key, value = part.split("=")
+        weights[key.strip()] = float(value)
+    return weights
+
+
+# Course popularity follows a Zipf-like curve; skew=0 means uniform
+def course_weights(courses, skew):
+    return [1 / (rank + 1) ** skew for rank in range(len(courses))]
+
+
+def _person(rng, i):
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    return f"{first} {last}", f"{first.lower()}.{last.lower()}{i}@example.com", f"9{rng.randint(100000000, 999999999)}"
+
+
+def _timestamp(rng, now, days):
+    # Registrations cluster towards recent days, like an admission season
+    return now - timedelta(days=days * rng.random() ** 2, seconds=rng.randint(0, 86399))
+
+
+# Rows matching the students table, with board/year consistent with the course
+def generate_students(count, days=180, skew=1.0, status_weights=None, seed=None, start=0):
+    rng = random.Random(seed)
+    catalog = get_catalog()
+    courses = catalog.courses
+    weights = course_weights(courses, skew)
+    statuses = status_weights or DEFAULT_STATUS_WEIGHTS
+    status_names, status_values = list(statuses), list(statuses.values())
+    form_names = {program["name"]: program["form_name"] for program in catalog.programs}
+    now = datetime.now()
+
+    for i in range(start, start + count):
+        course = rng.choices(courses, weights)[0]
+        if course["level"] == "school":
+            board, year = course["board"], rng.choice(course["grades"])
+            age = year + rng.randint(5, 7)
+        else:
+            board, year = form_names[course["program"]], course["year"]
+            age = year + rng.randint(17, 20)
+        name, email, phone = _person(rng, i)
+        yield (name, email, phone, course["label"], board, year, age,
+               _timestamp(rng, now, days).isoformat(" "),
+               rng.choices(status_names, status_values)[0])
+
+
+def generate_contacts(count, days=180, seed=None):
+    rng = random.Random(seed)
+    labels = [course["label"] for course in get_catalog().courses]
+    now = datetime.now()
+    for i in range(count):
+        name, email, phone = _person(rng, i)
+        yield {
+            "name": name,
+            "email": email,
+            "phone": phone if rng.random() < 0.7 else "",
+            "department": rng.choice(DEPARTMENTS),
+            "message": rng.choice(CONTACT_MESSAGES).format(course=rng.choice(labels)),
+            "timestamp": _timestamp(rng, now, days).isoformat()
+        }
+
+
+# Bulk insert in one transaction with large executemany batches
+def insert_students(conn, rows, batch_size=50000):
+    inserted = 0
+    batch = []
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                inserted += _insert_batch(conn, batch)
+        inserted += _insert_batch(conn, batch)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return inserted
+
+
+# Rows actually inserted: colliding emails are ignored and not counted
+def _insert_batch(conn, batch):
+    cursor = conn.executemany('''
+        INSERT OR IGNORE INTO students (name, email, phone, course, board, year, age, registration_date, status)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', batch)
+    batch.clear()
+    return cursor.rowcount
+
+
+# Contact messages as the old per-message JSON files, for testing contacts.import_contact_files
+def write_contact_files(contacts, directory="contacts"):
+    directory = Path(directory)
+    directory.mkdir(exist_ok=True)
+    written = 0
+    for contact in contacts:
+        stamp = datetime.fromisoformat(contact["timestamp"]).strftime("%Y%m%d_%H%M%S")
+        path = directory / f"{contact['email'].replace('@', '_')}_{stamp}.json"
+        with open(path, "w") as f:
+            json.dump(contact, f, indent=2)
+        written += 1
+    return written
+
+
+# Welcome emails for the generated students: outbox rows, optionally also files
+def insert_emails(conn, count, seed=None, directory=None):
+    from outbox import welcome_email
+
+    rng = random.Random(seed)
+    rows = conn.execute(
+        "SELECT email, name, course, registration_date FROM students ORDER BY random() LIMIT ?", (count,))
+    batch = []
+    for email, name, course, registered in rows.fetchall():
+        subject, body = welcome_email(name, course)
+        status = "sent" if rng.random() < 0.95 else "failed"
+        batch.append((email, subject, body, status, 1, registered, registered,
+                      registered if status == "sent" else None))
+        if directory:
+            Path(directory).mkdir(exist_ok=True)
+            stamp = datetime.fromisoformat(registered).strftime("%Y%m%d_%H%M%S")
+            with open(Path(directory) / f"{email}_{stamp}.txt", "w") as f:
+                f.write(f"To: {email}\nSubject: {subject}\n\n{body}")
+    conn.executemany('''
+        INSERT INTO outbox (recipient, subject, body, status, attempts, created_at, next_attempt_at, sent_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', batch)
+    conn.commit()
+    return len(batch)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic EnLift registrations, contacts and emails")
+    parser.add_argument("--students", type=int, default=10000)
+    parser.add_argument("--contacts", type=int, default=0, help="contact messages to insert")
+    parser.add_argument("--contact-files", action="store_true", help="write contacts/ JSON files instead")
+    parser.add_argument("--emails", type=int, default=0, help="outbox rows to create for seeded students")
+    parser.add_argument("--email-files", action="store_true", help="also write emails/ text files")
+    parser.add_argument("--days", type=int, default=180, help="spread registration dates over this many days")
+    parser.add_argument("--course-skew", type=float, default=1.0, help="0 = uniform course popularity")
+    parser.add_argument("--status-weights", type=parse_weights, default=None,
+                        help="e.g. pending=50,approved=35,rejected=5,completed=10")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    from database import DB_PATH, get_connection
+
+    with get_connection() as conn:
+        started = time.perf_counter()
+        start = conn.execute("SELECT COALESCE(MAX(id), 0) FROM students").fetchone()[0]
+        inserted = insert_students(conn, generate_students(
+            args.students, args.days, args.course_skew, args.status_weights, args.seed, start))
+        print(f"Inserted {inserted} students into {DB_PATH} in {time.perf_counter() - started:.2f}s")
+
+        if args.emails:
+            print(f"Queued {insert_emails(conn, args.emails, args.seed, 'emails' if args.email_files else None)} emails")
+
+        if args.contacts and not args.contact_files:
+            print(f"Inserted {insert_contacts(conn, generate_contacts(args.contacts, args.days, args.seed))} contacts")
+
+    if args.contacts and args.contact_files:
+        print(f"Wrote {write_contact_files(generate_contacts(args.contacts, args.days, args.seed))} contact files")
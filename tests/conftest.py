@@ -0,0 +1,12 @@
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Modules read their settings at import, so point them at a scratch SQLite
+# database before any of them is imported; tests never touch the real one
+os.environ["ENLIFT_DB_PATH"] = os.path.join(tempfile.mkdtemp(prefix="enlift-tests-"), "enlift_students.db")
+os.environ.pop("ENLIFT_DATABASE_URL", None)
+os.environ.pop("ENLIFT_WRITER_SOCKET", None)
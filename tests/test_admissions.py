@@ -0,0 +1,102 @@
+import time
+
+import pytest
+
+import admissions
+from admissions import AdmissionService, client_address
+from database import ConnectionPool, init_database
+from storage import SqliteStorage
+
+
+def test_peer_address_without_proxy_header():
+    assert client_address({}, "203.0.113.5", header=None) == "203.0.113.5"
+
+
+def test_no_shared_bucket_for_local_or_unknown_peers():
+    assert client_address({}, None, header=None) is None
+    assert client_address({}, "127.0.0.1", header=None) is None
+    assert client_address({}, "::1", header=None) is None
+
+
+def test_trusted_header_uses_the_entry_our_proxy_added():
+    headers = {"X-Forwarded-For": "10.0.0.1, 198.51.100.7"}
+    assert client_address(headers, "127.0.0.1", header="X-Forwarded-For") == "198.51.100.7"
+    assert client_address({}, "127.0.0.1", header="X-Forwarded-For") is None
+
+
+class FlakyJournal:
+    def __init__(self, failures):
+        self.failures = failures
+        self.records = []
+
+    def append(self, record):
+        if self.failures:
+            self.failures -= 1
+            raise OSError("No space left on device")
+        self.records.append(record)
+
+    def sync(self):
+        pass
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def admission_status_of(service, receipt):
+    with service.storage.connection() as conn:
+        return service.storage.admissions.get(conn, receipt)["status"]
+
+
+def test_failed_journal_writes_are_logged_and_retried(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(admissions, "JOURNAL_RETRY_INTERVAL", 0.05)
+    monkeypatch.setattr(admissions, "notify_worker", lambda: None)
+    pool = ConnectionPool(str(tmp_path / "admissions.db"))
+    with pool.connection() as conn:
+        init_database(conn)
+    journal = FlakyJournal(failures=2)
+    service = AdmissionService(SqliteStorage(pool), journal)
+
+    receipt = service.submit({"name": "Asha", "email": "asha@example.com", "phone": "9876543210",
+                              "course": "Python", "board": "CBSE", "year": 11, "age": 16}, "session")
+    wait_for(lambda: journal.records)
+
+    assert admission_status_of(service, receipt) == "registered"
+    assert [record["student"]["email"] for record in journal.records] == ["asha@example.com"]
+    assert service.stats["journal_errors"] == 2
+    assert service.stats["journal_pending"] == 0
+    assert "waiting for retry" in caplog.text
+
+
+def test_one_bad_request_does_not_fail_its_group(tmp_path, monkeypatch):
+    monkeypatch.setattr(admissions, "notify_worker", lambda: None)
+    pool = ConnectionPool(str(tmp_path / "admissions.db"))
+    with pool.connection() as conn:
+        init_database(conn)
+    storage = SqliteStorage(pool)
+    # Queued before submit() checked the fields; settled as one group on start
+    with storage.transaction() as conn:
+        for i in range(3):
+            student = {"name": f"Asha {i}", "email": f"asha{i}@example.com", "phone": "9876543210",
+                       "course": "Python", "board": "CBSE", "year": 11, "age": 16}
+            if i == 1:
+                del student["name"]
+            storage.admissions.add(conn, f"r{i}", student)
+    service = AdmissionService(storage, FlakyJournal(failures=0))
+
+    wait_for(lambda: service.stats["failed"] + service.stats["registered"] == 3)
+    assert [admission_status_of(service, f"r{i}") for i in range(3)] == ["registered", "failed", "registered"]
+
+
+def test_submit_rejects_applications_with_missing_fields(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "admissions.db"))
+    with pool.connection() as conn:
+        init_database(conn)
+    service = AdmissionService(SqliteStorage(pool), FlakyJournal(failures=0))
+    with pytest.raises(ValueError, match="name, age"):
+        service.submit({"email": "asha@example.com", "phone": "1", "course": "Python", "board": "CBSE",
+                        "year": 11}, "session")
+    assert service.stats["submitted"] == 0
@@ -0,0 +1,45 @@
+import csv
+import gzip
+import io
+
+import pyarrow.parquet as pq
+import pytest
+from streamlit.runtime.download_data_util import convert_data_to_bytes_and_infer_mime
+
+from database import get_connection
+from export import EXPORT_COLUMNS, deferred_export
+
+
+@pytest.fixture(scope="module", autouse=True)
+def students():
+    with get_connection() as conn:
+        conn.executemany('''
+            INSERT OR IGNORE INTO students (name, email, phone, course, board, year, age, registration_date)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [(f"Export {i}", f"export{i}@example.com", "9876543210", "Python", "CBSE", 11, 16,
+               f"2026-01-0{i} 10:00:00") for i in range(1, 4)])
+        conn.commit()
+
+
+# What st.download_button does with the callable's result when clicked
+def download(fmt):
+    data, _ = convert_data_to_bytes_and_infer_mime(deferred_export(fmt)(), TypeError("unsupported type"))
+    return data
+
+
+def test_csv_download():
+    rows = list(csv.reader(io.StringIO(download("CSV").decode())))
+    assert rows[0] == EXPORT_COLUMNS
+    assert {row[2] for row in rows[1:]} >= {"export1@example.com", "export2@example.com", "export3@example.com"}
+
+
+def test_gzip_download():
+    rows = list(csv.reader(io.StringIO(gzip.decompress(download("CSV (gzip)")).decode())))
+    assert rows[0] == EXPORT_COLUMNS
+    assert len(rows) >= 4
+
+
+def test_parquet_download():
+    table = pq.read_table(io.BytesIO(download("Parquet")))
+    assert table.column_names == EXPORT_COLUMNS
+    assert table.num_rows >= 3
@@ -0,0 +1,44 @@
+import threading
+
+import maintenance
+from database import ConnectionPool, init_database
+from storage import SqliteStorage
+
+
+def test_clear_students_bumps_the_clear_generation_after_the_last_batch(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "maintenance.db"))
+    with pool.connection() as conn:
+        init_database(conn)
+        conn.executemany("INSERT INTO students (name, email) VALUES (?, ?)",
+                         [(f"Student {i}", f"s{i}@example.com") for i in range(maintenance.DELETE_BATCH + 10)])
+        conn.commit()
+        up_to_id = conn.execute("SELECT MAX(id) FROM students").fetchone()[0]
+
+    storage = SqliteStorage(pool)
+    left = []
+    mark_cleared = storage.students.mark_cleared
+
+    def record_and_mark(conn):
+        # Every row is already gone when the known emails are invalidated
+        left.append(conn.execute("SELECT COUNT(*) FROM students").fetchone()[0])
+        mark_cleared(conn)
+
+    storage.students.mark_cleared = record_and_mark
+    result = maintenance.clear_students(storage, threading.Event(), up_to_id)
+
+    assert result == {"students": maintenance.DELETE_BATCH + 10}
+    assert left == [0]
+    with pool.connection() as conn:
+        assert storage.students.clear_generation(conn) == 1
+
+
+def test_interrupted_clear_keeps_the_clear_generation(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "maintenance.db"))
+    with pool.connection() as conn:
+        init_database(conn)
+    storage = SqliteStorage(pool)
+    stop = threading.Event()
+    stop.set()
+    maintenance.clear_students(storage, stop, 0)
+    with pool.connection() as conn:
+        assert storage.students.clear_generation(conn) == 0
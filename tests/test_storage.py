@@ -0,0 +1,240 @@
+import csv
+import io
+import json
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+import maintenance
+from admissions import AdmissionService
+from contacts import import_contact_files
+from database import ConnectionPool, init_database
+from export import export_students
+from journal import Journal, clear_record, registration_record, replay, update_record
+from outbox import OutboxWorker
+from queries import age_counts, diff_student_edits, registration_metrics, stat_keys, status_counts
+from storage import EditConflict, PostgresStorage, SqliteStorage
+from student_cache import StudentCache, students_page
+
+
+# One throwaway PostgreSQL server for the session (pip install pgserver);
+# the PostgreSQL cases are skipped without it
+@pytest.fixture(scope="session")
+def postgres_url(tmp_path_factory):
+    pgserver = pytest.importorskip("pgserver")
+    pytest.importorskip("psycopg_pool")
+    server = pgserver.get_server(tmp_path_factory.mktemp("pgdata"), cleanup_mode="stop")
+    yield server.get_uri()
+    server.cleanup()
+
+
+# Every test runs against both backends, each time on an empty database
+@pytest.fixture(params=["sqlite", "postgresql"])
+def storage(request, tmp_path):
+    if request.param == "sqlite":
+        pool = ConnectionPool(str(tmp_path / "storage.db"))
+        with pool.connection() as conn:
+            init_database(conn)
+        storage = SqliteStorage(pool)
+    else:
+        import psycopg
+        from psycopg.conninfo import make_conninfo
+
+        url = request.getfixturevalue("postgres_url")
+        name = f"enlift_{uuid.uuid4().hex[:12]}"
+        with psycopg.connect(url, autocommit=True) as conn:
+            conn.execute(f"CREATE DATABASE {name}")
+        storage = PostgresStorage(make_conninfo(url, dbname=name))
+    yield storage
+    storage.close()
+
+
+# A second handle on the same database, as another app process would open
+def reopen(storage):
+    if storage.name == "sqlite":
+        return SqliteStorage(ConnectionPool(storage.pool.path))
+    return PostgresStorage(storage.pool.conninfo)
+
+
+def add_students(storage, count, start=0, **values):
+    ids = []
+    with storage.transaction() as conn:
+        for i in range(start, start + count):
+            ids.append(storage.students.add(conn, {
+                "name": f"Asha Rao {i}", "email": f"asha{i}@gmail.com", "phone": f"98765-{i:05d}",
+                "course": values.get("course", "Python"), "board": "CBSE", "year": 11,
+                "age": values.get("age", 16), "registration_date": datetime.now().isoformat(" ")}))
+    return ids
+
+
+def count(storage, table):
+    with storage.connection() as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_new_registrations_reach_every_dashboard_read(storage):
+    cache = StudentCache()
+    add_students(storage, 3, age=9)
+    assert len(cache.get(storage)) == 3
+    add_students(storage, 1, start=3, course="Java", age=17)
+
+    with storage.connection() as conn:
+        metrics = registration_metrics(conn)
+        assert metrics == {"total": 4, "today": 4, "active_courses": 2, "pending": 4}
+        assert stat_keys(conn, "course") == ["Java", "Python"]
+        assert [int(age) for age in age_counts(conn).index] == [9, 17]
+        found = storage.search.students(conn, "gmail asha3")
+        assert list(found["email"]) == ["asha3@gmail.com"]
+        assert found.attrs["ranked"]
+        rows = list(csv.reader(io.StringIO(export_students(conn, "CSV", courses=["Java"]).read().decode())))
+        assert [row[2] for row in rows[1:]] == ["asha3@gmail.com"]
+
+    # The new registration arrives as a delta, not a reload
+    frame = cache.get(storage)
+    assert len(frame) == 4 and frame["email"].iloc[0] == "asha3@gmail.com"
+    assert cache.stats["deltas"] == 1 and cache.stats["reloads"] == 1
+
+
+def test_dashboard_edits_update_the_rows_the_grid_was_read_from(storage):
+    add_students(storage, 3)
+    cache = StudentCache()
+    page = students_page(cache.get(storage))
+    edited = page.copy()
+    edited.loc[edited["email"] == "asha1@gmail.com", ["phone", "status"]] = ["11111", "approved"]
+    changes = diff_student_edits(page, edited)
+
+    with storage.transaction() as conn:
+        assert storage.students.save_edits(conn, changes) == 1
+
+    frame = cache.get(storage).set_index("email")
+    assert (frame.at["asha1@gmail.com", "phone"], frame.at["asha1@gmail.com", "status"]) == ("11111", "approved")
+    assert frame.at["asha1@gmail.com", "row_version"] == 1
+    assert (frame.at["asha0@gmail.com", "phone"], frame.at["asha0@gmail.com", "status"]) == ("98765-00000", "pending")
+    with storage.connection() as conn:
+        assert status_counts(conn).to_dict() == {"pending": 2, "approved": 1}
+
+    # Two rows saved with different statuses: the delta rows hold the
+    # categories in another order than the cached frame
+    page = students_page(cache.get(storage))
+    edited = page.copy()
+    edited.loc[edited["email"] == "asha0@gmail.com", "status"] = "approved"
+    edited.loc[edited["email"] == "asha2@gmail.com", "phone"] = "22222"
+    with storage.transaction() as conn:
+        assert storage.students.save_edits(conn, diff_student_edits(page, edited)) == 2
+    frame = cache.get(storage).set_index("email")
+    assert frame["status"].to_dict() == {"asha0@gmail.com": "approved", "asha1@gmail.com": "approved",
+                                         "asha2@gmail.com": "pending"}
+    assert cache.get(storage).astype(object).equals(StudentCache().get(storage).astype(object))
+
+    # The same edit again is based on a row version that is gone
+    with pytest.raises(EditConflict) as conflict:
+        with storage.transaction() as conn:
+            storage.students.save_edits(conn, changes)
+    assert conflict.value.ids == [changes[0]["id"]]
+
+
+def test_maintenance_jobs_run_on_the_storage(storage, tmp_path, monkeypatch):
+    ids = add_students(storage, maintenance.DELETE_BATCH + 5)
+    cache = StudentCache()
+    assert len(cache.get(storage)) == maintenance.DELETE_BATCH + 5
+
+    assert maintenance.clear_students(storage, threading.Event(), max(ids)) == {
+        "students": maintenance.DELETE_BATCH + 5}
+    with storage.connection() as conn:
+        assert registration_metrics(conn)["total"] == 0
+    assert len(cache.get(storage)) == 0
+
+    add_students(storage, 2, start=1000)
+    with storage.connection() as conn:
+        conn.execute("DELETE FROM student_stats")
+    assert maintenance.refresh_stats(storage, threading.Event())["stat_rows"] > 0
+    with storage.connection() as conn:
+        assert registration_metrics(conn)["total"] == 2
+
+    result = maintenance.prune_retention(storage, threading.Event())
+    assert set(result) == {"outbox_sent", "outbox_failed", "contacts_handled", "student_changes",
+                           "admission_requests"}
+
+    # Legacy message files are imported into the storage, once
+    contacts_dir = tmp_path / "contacts"
+    contacts_dir.mkdir()
+    (contacts_dir / "ravi.json").write_text(json.dumps({
+        "name": "Ravi", "email": "ravi@example.com", "department": "Admissions",
+        "message": "Is the Python batch full?", "timestamp": "2026-01-01T09:00:00"}))
+    assert import_contact_files(storage, contacts_dir) == 1
+    assert import_contact_files(storage, contacts_dir) == 0
+    with storage.connection() as conn:
+        found = storage.search.contacts(conn, "pyth")
+    assert list(found["email"]) == ["ravi@example.com"]
+    assert "**Python**" in found["excerpt"].iloc[0]
+
+
+def test_journal_replay_rebuilds_the_storage(storage, tmp_path):
+    journal = Journal(tmp_path / "journal")
+    student = {"name": "Asha", "email": "asha@example.com", "phone": "1", "course": "Python", "board": "CBSE",
+               "year": 11, "age": 16, "registration_date": "2026-01-01T10:00:00"}
+    journal.append(registration_record({**student, "email": "old@example.com"}))
+    journal.append(clear_record())
+    journal.append(registration_record(student))
+    journal.append(update_record("asha@example.com", {"status": "approved"}))
+    journal.close()
+    add_students(storage, 2)
+
+    assert replay(storage, tmp_path / "journal") == {"register": 2, "update": 1, "clear": 1}
+    with storage.connection() as conn:
+        assert conn.execute("SELECT email, status, registration_date FROM students").fetchall() == [
+            ("asha@example.com", "approved", "2026-01-01 10:00:00")]
+    assert count(storage, "student_changes") > 0
+
+
+class RecordingTransport:
+    def __init__(self, sent):
+        self.sent = sent
+
+    def send(self, sender, recipient, subject, body):
+        time.sleep(0.001)
+        self.sent.append(recipient)
+
+    def close(self):
+        pass
+
+
+def test_outbox_workers_in_two_processes_send_each_message_once(storage):
+    with storage.transaction() as conn:
+        for i in range(60):
+            storage.outbox.enqueue(conn, f"s{i}@example.com", "Welcome", "Hello")
+        # A worker still sending, and one that died holding a lease
+        leased, = storage.outbox.claim(conn, 1, datetime.now() + timedelta(minutes=5))
+        expired, = storage.outbox.claim(conn, 1, datetime.now() - timedelta(seconds=1))
+
+    other = reopen(storage)
+    sent = []
+    workers = [OutboxWorker(backend, RecordingTransport(sent)) for backend in (storage, other)]
+    threads = [threading.Thread(target=worker.drain) for worker in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    other.close()
+
+    assert sorted(sent) == sorted(f"s{i}@example.com" for i in range(60) if i != leased[0] - 1)
+    assert expired[1] in sent
+    with storage.connection() as conn:
+        assert conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status ORDER BY status").fetchall() == [
+            ("sending", 1), ("sent", 59)]
+
+
+def test_a_clear_in_one_process_frees_the_emails_every_process_remembers(storage, tmp_path):
+    ids = add_students(storage, 2)
+    other = reopen(storage)
+    service = AdmissionService(other, Journal(tmp_path / "journal"))
+    assert service.is_registered("asha0@gmail.com")
+    assert "asha0@gmail.com" in service.known
+
+    # The scheduler in another process clears the table
+    maintenance.clear_students(storage, threading.Event(), max(ids))
+    assert not service.is_registered("asha0@gmail.com")
+    other.close()
@@ -0,0 +1,212 @@
+import argparse
+import json
+import os
+import signal
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+
+from admissions import DuplicateRegistration, RateLimited, get_admission_service
+from journal import clear_record, get_journal, update_record
+from maintenance import request_job, start_scheduler
+from outbox import start_worker
+from storage import EditConflict, get_storage
+
+# Unix socket of the shared writer service. When set, app processes send every
+# write there and only read the database themselves; when unset each process
+# writes directly (single-process deployment).
+WRITER_SOCKET = os.environ.get("ENLIFT_WRITER_SOCKET")
+DEFAULT_SOCKET = "enlift-writer.sock"
+# Every operation is one short transaction, at worst behind SQLite's busy timeout
+CALL_TIMEOUT = 10
+MAX_REQUEST_BYTES = 1024 * 1024
+
+
+class WriterError(Exception):
+    pass
+
+
+# Writes outside the admission group commit take turns on one lock, so they
+# never wait on each other inside SQLite's busy handler
+_write_lock = threading.Lock()
+
+
+# Returns the receipt; the student is registered in the background
+def register(student, session_key, address=None):
+    return get_admission_service().submit(student, session_key, address)
+
+
+def add_contact(contact):
+    storage = get_storage()
+    with _write_lock, storage.transaction() as conn:
+        return storage.contacts.add(conn, contact)
+
+
+def mark_handled(done, undone):
+    storage = get_storage()
+    with _write_lock, storage.transaction() as conn:
+        return (storage.contacts.set_handled(conn, done, True)
+                + storage.contacts.set_handled(conn, undone, False))
+
+
+# Dashboard edits, all or nothing: returns (saved, conflicting ids). Journaled
+# here so the journal keeps a single writer.
+def save_edits(changes):
+    storage = get_storage()
+    if not changes:
+        return 0, []
+    try:
+        with _write_lock, storage.transaction() as conn:
+            saved = storage.students.save_edits(conn, changes)
+    except EditConflict as e:
+        return 0, e.ids
+    journal = get_journal()
+    for change in changes:
+        journal.append(update_record(
+            change["email"], {column: change["values"][column] for column in change["changed"]}))
+    return saved, []
+
+
+# Deleted in small batches by the maintenance scheduler, which then bumps the
+# clear generation so every admission service drops its known emails
+def clear_students():
+    storage = get_storage()
+    with _write_lock, storage.connection() as conn:
+        up_to_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM students").fetchone()[0]
+    with _write_lock:
+        request_job("clear_students", up_to_id=up_to_id)
+    get_journal().append(clear_record())
+    return up_to_id
+
+
+def run_job(name):
+    with _write_lock:
+        request_job(name)
+
+
+OPERATIONS = {
+    "register": register,
+    "add_contact": add_contact,
+    "mark_handled": mark_handled,
+    "save_edits": save_edits,
+    "clear_students": clear_students,
+    "run_job": run_job,
+}
+
+
+# Run a write operation: through the writer service when there is one,
+# otherwise in this process. Raises what the operation raises.
+def write(operation, **args):
+    if WRITER_SOCKET is None:
+        return OPERATIONS[operation](**args)
+    return call(WRITER_SOCKET, operation, **args)
+
+
+# One connection per call; a local socket connects in microseconds and a
+# restarted service never leaves a stale connection behind
+def call(path, operation, **args):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        # Blocking connect: with a timeout set, a full accept backlog fails
+        # at once with EAGAIN instead of waiting for the service
+        sock.connect(path)
+        sock.settimeout(CALL_TIMEOUT)
+        sock.sendall(json.dumps({"op": operation, "args": args}).encode() + b"\n")
+        with sock.makefile("rb") as f:
+            line = f.readline()
+    if not line:
+        raise WriterError("writer service closed the connection")
+    reply = json.loads(line)
+    error = reply.get("error")
+    if error is None:
+        return reply["result"]
+    if error == "duplicate":
+        raise DuplicateRegistration(reply["message"])
+    if error == "rate_limited":
+        raise RateLimited(reply["retry_after"])
+    raise WriterError(reply["message"])
+
+
+# One JSON request line in, one JSON reply line out
+class WriteHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline(MAX_REQUEST_BYTES))
+            operation = OPERATIONS.get(request["op"])
+            if operation is None:
+                raise ValueError(f"unknown operation {request['op']!r}")
+            reply = {"result": operation(**request.get("args", {}))}
+        except DuplicateRegistration as e:
+            reply = {"error": "duplicate", "message": str(e)}
+        except RateLimited as e:
+            reply = {"error": "rate_limited", "retry_after": e.retry_after}
+        except Exception as e:
+            reply = {"error": "failed", "message": str(e)}
+        self.wfile.write(json.dumps(reply).encode() + b"\n")
+
+
+class WriterServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+    # Every app process may connect at once during a burst of submissions
+    request_queue_size = 128
+
+
+def _remove_stale_socket(path):
+    if not os.path.exists(path):
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except OSError:
+            os.unlink(path)
+            return
+    raise SystemExit(f"a writer service is already listening on {path}")
+
+
+# The single process that writes the database. Registrations keep their group
+# commit (admissions.py); the outbox worker and the maintenance scheduler run
+# here too, so emails are sent once and the journal has one writer.
+def serve(path):
+    _remove_stale_socket(path)
+    server = WriterServer(path, WriteHandler)
+    os.chmod(path, 0o660)
+    get_admission_service()
+    start_worker()
+    start_scheduler()
+    return server
+
+
+def start_apps(count, port, path):
+    env = {**os.environ, "ENLIFT_WRITER_SOCKET": os.path.abspath(path)}
+    return [subprocess.Popen([sys.executable, "-m", "streamlit", "run", "app.py",
+                              "--server.port", str(port + i), "--server.headless", "true"], env=env)
+            for i in range(count)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Shared database writer for multi-process EnLift deployments")
+    parser.add_argument("--socket", default=WRITER_SOCKET or DEFAULT_SOCKET,
+                        help=f"Unix socket to listen on (default: $ENLIFT_WRITER_SOCKET or {DEFAULT_SOCKET})")
+    parser.add_argument("--app-workers", type=int, default=0, metavar="N",
+                        help="also start N Streamlit app processes using this writer")
+    parser.add_argument("--port", type=int, default=8501, help="port of the first app process")
+    args = parser.parse_args()
+
+    server = serve(args.socket)
+    # Stop on SIGTERM as on Ctrl-C: app processes first, then the socket
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    apps = start_apps(args.app_workers, args.port, args.socket)
+    print(f"Writer service on {args.socket}" + (f", app processes on ports {args.port}-{args.port + len(apps) - 1}"
+                                                if apps else ""))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for app in apps:
+            app.terminate()
+        for app in apps:
+            app.wait()
+        server.server_close()
+        os.unlink(args.socket)